@@ -0,0 +1,120 @@
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from handtracking.synthetic import SyntheticHandTracker, circle_path, polygon_path
+from handtracking.recording import ReplayHandTracker
+from games.game_loop import run_game, frame_time_stats
+from games.BalloonPop import BalloonPopGame, MultiPlayerBalloonPopGame
+from games.CatchDroplets import CatchDropletsGame
+from games.ConnectDots import ConnectDotsGame, generate_shape as connect_dots_shape
+from games.ShapeDrawing import ShapeDrawingGame, generate_shape as shape_drawing_shape
+from games.ColorMatch import SequenceColorMatchGame
+from utils.frame_source import FrameSource, synthetic_frames
+from utils.game_clock import FixedStepClock, ManualTime, SIM_STEP
+from utils.scoring import ScoreTracker
+from utils.settings import WINDOW_WIDTH, WINDOW_HEIGHT
+
+CENTER = (WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2)
+
+
+#one simulation step per rendered frame whatever the machine speed, so runs stay comparable
+def frame_locked_clock():
+    return FixedStepClock(time_fn=ManualTime(auto_step=SIM_STEP))
+
+
+#game factory and fingertip path per game, chosen so the per-frame work is exercised
+GAMES = {
+    "BalloonPop": (lambda score, stress: BalloonPopGame(score, level_duration=10 ** 6, stress=stress, seed=0,
+                                                        clock=frame_locked_clock()),
+                   lambda: circle_path(CENTER, 120, period=90)),
+    "BalloonPop2P": (lambda score, stress: MultiPlayerBalloonPopGame(
+                         [ScoreTracker("Player1"), ScoreTracker("Player2")], team_score=score,
+                         level_duration=10 ** 6, stress=stress, seed=0, clock=frame_locked_clock()),
+                     lambda: [circle_path((WINDOW_WIDTH // 4, CENTER[1]), 120, period=90),
+                              circle_path((3 * WINDOW_WIDTH // 4, CENTER[1]), 120, period=110)]),
+    "CatchDroplets": (lambda score, stress: CatchDropletsGame(score, level_time=10 ** 6, stress=stress, seed=0,
+                                                              clock=frame_locked_clock()),
+                      lambda: circle_path(CENTER, 400, period=200)),
+    "ConnectDots": (lambda score, stress: ConnectDotsGame(score),
+                    lambda: polygon_path(connect_dots_shape(3))),
+    "ShapeDrawing": (lambda score, stress: ShapeDrawingGame(score),
+                     lambda: polygon_path(shape_drawing_shape(1))),
+    "ColorMatch": (lambda score, stress: SequenceColorMatchGame(score),
+                   lambda: circle_path(CENTER, 450, period=150)),
+}
+
+
+def bench_game(name, frames=600, video=None, seed=0, stress=1, replay=None):
+    random.seed(seed)
+    make_game, make_path = GAMES[name]
+    source = video if video else (lambda: synthetic_frames(WINDOW_WIDTH, WINDOW_HEIGHT))
+    cap = FrameSource(source, drop_policy="block", buffer_size=4)
+    if replay:
+        tracker = ReplayHandTracker(replay, loop=True)
+    else:
+        tracker = SyntheticHandTracker(make_path(), seed=seed)
+    game = make_game(ScoreTracker("Benchmark"), stress)
+
+    frame_times = []
+    run_game(game, cap, tracker, display=False, max_frames=frames, frame_times=frame_times)
+    cap.release()
+    return frame_time_stats(frame_times)
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"\nvs {baseline_path} ({baseline.get('commit')})")
+    for name, stats in results["games"].items():
+        old = baseline["games"].get(name)
+        if not old or not old.get("p50_ms"):
+            continue
+        change = (stats["p50_ms"] - old["p50_ms"]) / old["p50_ms"] * 100
+        print(f"  {name:<14} p50 {old['p50_ms']:.3f} -> {stats['p50_ms']:.3f} ms ({change:+.1f}%)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless per-frame benchmark of every game")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--games", nargs="*", default=list(GAMES))
+    parser.add_argument("--video", help="drive the games from a recorded video instead of synthetic frames")
+    parser.add_argument("--stress", type=int, default=1,
+                        help="balloons/droplets spawned per spawn tick in BalloonPop and CatchDroplets")
+    parser.add_argument("--replay", help="recorded session directory to drive the hand instead of a synthetic path")
+    parser.add_argument("--output", default=os.path.join("benchmarks", "results", "games.json"))
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    results = {"commit": git_commit(), "timestamp": time.time(), "frames": args.frames,
+               "stress": args.stress, "games": {}}
+    for name in args.games:
+        stats = bench_game(name, args.frames, args.video, stress=args.stress, replay=args.replay)
+        results["games"][name] = stats
+        print(f"{name:<14} {stats['fps']:>8.1f} fps  p50 {stats['p50_ms']:.3f}  "
+              f"p95 {stats['p95_ms']:.3f}  p99 {stats['p99_ms']:.3f} ms")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=4)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import GAME_MAP, HOLD_DURATION, draw_menu
+from games.ShapeDrawing import draw_accuracy_meter
+from utils.hud_layer import HudLayer, _render, _blit, _draw_live
+from utils.ui_helper import draw_text
+from utils.settings import WINDOW_WIDTH, WINDOW_HEIGHT, WHITE, GREEN, BLUE, ORANGE, FONT
+
+
+#the per-frame putText/rectangle menu, kept here as the reference
+def legacy_draw_menu(img, selected_fingers=None, hold_progress=0):
+    h, w, _ = img.shape
+    box_height = 80
+    start_y = 150
+
+    cv2.putText(img, "Hand Therapy Game Menu", (50, 60), FONT, 1, WHITE, 2)
+    cv2.putText(img, "Raise 1–5 fingers to choose a game", (50, 100), FONT, 0.7, (200, 200, 200), 1)
+    for i, (finger_count, game_name) in enumerate(GAME_MAP.items()):
+        y = start_y + i * (box_height + 20)
+        if selected_fingers == finger_count:
+            cv2.rectangle(img, (50, y - 10), (w - 50, y + box_height), (0, 255, 0), 3)
+        else:
+            cv2.rectangle(img, (50, y - 10), (w - 50, y + box_height), (100, 100, 100), 1)
+        cv2.putText(img, f"{finger_count} Finger(s): {game_name}", (70, y + 50), FONT, 0.8, WHITE, 2)
+
+    if selected_fingers in GAME_MAP and hold_progress > 0:
+        progress_width = int((w - 100) * min(hold_progress / HOLD_DURATION, 1))
+        cv2.rectangle(img, (50, h - 50), (50 + progress_width, h - 20), GREEN, -1)
+        cv2.rectangle(img, (50, h - 50), (w - 50, h - 20), WHITE, 2)
+        cv2.putText(img, f"Holding... {int(hold_progress)}s", (60, h - 60), FONT, 0.7, WHITE, 2)
+
+
+def legacy_game_hud(img, score, level, jitter, accuracy):
+    x, y, w, h = 30, 120, 300, 25
+    cv2.rectangle(img, (x, y), (x + w, y + h), (80, 80, 80), -1)
+    color = (0, 255, 0) if accuracy > 80 else (0, 255, 255) if accuracy > 50 else (0, 0, 255)
+    cv2.rectangle(img, (x, y), (x + int(accuracy / 100 * w), y + h), color, -1)
+    cv2.rectangle(img, (x, y), (x + w, y + h), WHITE, 2)
+    draw_text(img, f"Accuracy: {accuracy:.1f}%", (x + 10, y - 10), WHITE, 0.6, 2)
+    draw_text(img, f"Level {level}/4", (30, 50), GREEN)
+    draw_text(img, f"Score: {score}", (30, 100), BLUE)
+    draw_text(img, f"Jitter: {jitter:.2f}px", (30, 190), ORANGE)
+
+
+def cached_game_hud(img, score, level, jitter, accuracy, hud):
+    draw_accuracy_meter(hud, accuracy)
+    hud.text("level", f"Level {level}/4", (30, 50), GREEN)
+    hud.text("score", f"Score: {score}", (30, 100), BLUE)
+    hud.text("jitter", f"Jitter: {jitter:.2f}px", (30, 190), ORANGE)
+    hud.composite(img)
+
+
+#hand moving over the menu without holding, then holding each finger count for two seconds
+def menu_idle_states(frames):
+    for i in range(frames):
+        yield 1 + (i // 90) % 5, 0
+
+
+def menu_hold_states(frames):
+    for i in range(frames):
+        yield 1 + (i // 60) % 5, (i % 60) / 30
+
+
+#between strokes: score and level change rarely, accuracy and jitter hold still
+def hud_idle_states(frames):
+    for i in range(frames):
+        yield 10 * (i // 300), 1 + i // 300, 2.5, 40.0
+
+
+#while drawing: accuracy and jitter change every frame
+def hud_drawing_states(frames):
+    for i in range(frames):
+        yield 10 * (i // 30), 1 + i // 300, 2 + (i % 7) * 0.13, 40 + (i % 50) * 0.7
+
+
+def time_frames(draw, states, frame):
+    times = []
+    for state in states:
+        img = frame.copy()
+        start = time.perf_counter()
+        draw(img, *state)
+        times.append(time.perf_counter() - start)
+    times = np.asarray(times) * 1000
+    return float(np.percentile(times, 50)), float(np.percentile(times, 95))
+
+
+#each element blended onto the frame on its own, in order, as the reference for the flattened layer
+def reference_composite(img, hud):
+    for element in hud.elements.values():
+        if element.live:
+            _draw_live(img, element.args)
+            continue
+        sprite = _render(element.args)
+        h, w = img.shape[:2]
+        x0, y0, x1, y1 = max(sprite.x0, 0), max(sprite.y0, 0), min(sprite.x1, w), min(sprite.y1, h)
+        if x0 < x1 and y0 < y1:
+            _blit(img, sprite, x0, y0, x1, y1)
+    return img
+
+
+#translucent panels under and over antialiased text must blend every pixel once
+def check_overlapping_soft(tolerance=2):
+    frame = np.random.default_rng(1).integers(0, 255, (WINDOW_HEIGHT, WINDOW_WIDTH, 3), dtype=np.uint8)
+    hud = HudLayer()
+    hud.rect("panel", (20, 20), (420, 160), (0, 0, 255), -1, opacity=0.5)
+    hud.text("title", "Overlapping HUD", (40, 80), WHITE, 1.2, 3)
+    hud.text("shadow", "Overlapping HUD", (44, 84), (40, 40, 40), 1.2, 3)
+    hud.rect("cover", (300, 60), (500, 200), (255, 0, 0), -1, opacity=0.4)
+    hud.rect("frame", (10, 10), (430, 170), GREEN, 2)
+    hud.text("hard", "hard edges", (60, 140), ORANGE, 0.8, 2, antialias=False)
+    hud.text("live", "drawn live", (60, 300), WHITE, 1.0, 2)
+    error = int(np.abs(hud.composite(frame.copy()).astype(int) - reference_composite(frame.copy(), hud)).max())
+    #the text under the blue panel must have gone back into the layer to be blended in order
+    layered = not hud.elements["title"].live and not hud.elements["shadow"].live and hud.elements["live"].live
+    print(f"overlapping soft elements: max error {error} (tolerance {tolerance}), "
+          f"covered text layered {layered}")
+    if error > tolerance or not layered:
+        raise SystemExit("the HUD layer blends overlapping soft elements differently from drawing them in order")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Menu and HUD render time, per-frame drawing vs cached layers")
+    parser.add_argument("--frames", type=int, default=900)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 255, (WINDOW_HEIGHT, WINDOW_WIDTH, 3), dtype=np.uint8)
+    cases = [
+        ("menu idle", legacy_draw_menu, draw_menu, menu_idle_states),
+        ("menu hold", legacy_draw_menu, draw_menu, menu_hold_states),
+        ("hud idle", legacy_game_hud, cached_game_hud, hud_idle_states),
+        ("hud drawing", legacy_game_hud, cached_game_hud, hud_drawing_states),
+    ]
+    for name, before, after, states in cases:
+        hud = HudLayer()
+        b50, b95 = time_frames(before, states(args.frames), frame)
+        a50, a95 = time_frames(lambda img, *state: after(img, *state, hud=hud), states(args.frames), frame)
+        print(f"{name:<12} before p50 {b50:.3f} p95 {b95:.3f} ms | after p50 {a50:.3f} p95 {a95:.3f} ms"
+              f" | x{b50 / a50:.1f} at p50")
+    check_overlapping_soft()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from handtracking.HandTracking import HandTracker, NUM_LANDMARKS
+from handtracking.recording import SessionReader
+from utils.geometry import resample_arc_length
+from utils.settings import WINDOW_WIDTH, WINDOW_HEIGHT
+
+#name -> HandTracker keyword arguments
+CONFIGS = {
+    "full_frame": {"inference_width": None, "use_roi": False},
+    "width_640": {"inference_width": 640, "use_roi": False},
+    "roi": {"inference_width": None, "use_roi": True},
+    "roi_width_320": {"inference_width": 320, "use_roi": True},
+}
+
+
+def load_frames(video, limit):
+    cap = cv2.VideoCapture(video)
+    frames = []
+    while len(frames) < limit:
+        success, frame = cap.read()
+        if not success:
+            break
+        frames.append(cv2.flip(frame, 1))
+    cap.release()
+    return frames
+
+
+#CPU time per frame spent in find_hands + find_landmarks, how often a hand was found and the first
+#hand's landmarks in pixels (None when there was none)
+def bench_config(frames, tracker=None, **kwargs):
+    tracker = tracker or HandTracker(max_hands=1, **kwargs)
+    cpu_times, detected, landmarks = [], 0, []
+    for frame in frames:
+        img = frame.copy()
+        start = time.process_time()
+        tracker.find_hands(img, draw=False)
+        tracker.find_landmarks(img)
+        cpu_times.append(time.process_time() - start)
+        if tracker.num_hands:
+            detected += 1
+            h, w = img.shape[:2]
+            landmarks.append(tracker.normalized_landmarks()[0, :, :2] * (w, h))
+        else:
+            landmarks.append(None)
+    ms = np.array(cpu_times) * 1000
+    return {"cpu_ms_mean": ms.mean(), "cpu_ms_p95": np.percentile(ms, 95),
+            "detected": detected / max(len(frames), 1)}, landmarks
+
+
+#mean and p95 over frames where both found a hand of the mean distance between matching landmarks
+def landmark_error(landmarks, reference):
+    errors = [np.hypot(*(a - b).T).mean() for a, b in zip(landmarks, reference) if a is not None and b is not None]
+    if not errors:
+        return float("nan"), float("nan")
+    return float(np.mean(errors)), float(np.percentile(errors, 95))
+
+
+class _Landmark:
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x, y, z):
+        self.x, self.y, self.z = x, y, z
+
+
+class _Hand:
+    def __init__(self, points):
+        self.landmark = [_Landmark(*p) for p in points.tolist()]
+
+
+class _Results:
+    def __init__(self, hands):
+        self.multi_hand_landmarks = hands or None
+        self.multi_handedness = None
+
+
+#stands in for mediapipe's Hands where it cannot run: it knows the true landmarks of the current frame
+#and sees only the crop find_hands passes it. landmarks inside the crop come back normalized to it,
+#snapped to the crop's input pixel grid with `noise` input pixels of error, a hand mostly outside the
+#crop is missed. this exercises cropping, remapping and ROI following end to end. the real model is
+#not: neither its error on tighter crops nor the separate static-image instance crops go through
+class OracleHands:
+    def __init__(self, noise=1.0, min_visible=0.8, seed=0):
+        self.noise = noise
+        self.min_visible = min_visible
+        self.rng = np.random.default_rng(seed)
+        self.truth = np.empty((0, NUM_LANDMARKS, 3))  #normalized to the full frame
+        self.region = None
+
+    #the stand-in keeps no tracking state
+    def reset(self):
+        pass
+
+    def process(self, img_rgb):
+        (x0, y0, x1, y1), (w, h) = self.region
+        ch, cw = img_rgb.shape[:2]
+        hands = []
+        for hand in self.truth:
+            px, py = hand[:, 0] * w, hand[:, 1] * h
+            inside = (px >= x0) & (px < x1) & (py >= y0) & (py < y1)
+            if inside.mean() < self.min_visible:
+                continue
+            gx = np.rint((px - x0) / (x1 - x0) * cw + self.rng.normal(0, self.noise, NUM_LANDMARKS)) / cw
+            gy = np.rint((py - y0) / (y1 - y0) * ch + self.rng.normal(0, self.noise, NUM_LANDMARKS)) / ch
+            hands.append(_Hand(np.column_stack([gx, gy, hand[:, 2]])))
+        return _Results(hands)
+
+
+#HandTracker with the stand-in model and without smoothing or prediction, only the search region logic
+class OracleTracker(HandTracker):
+    def __init__(self, hands, max_hands=1, inference_width=None, use_roi=False, roi_padding=0.35, roi_refresh=30):
+        self._init_landmark_buffers(max_hands)
+        self.hands = self.crop_hands = hands
+        self.last_was_crop = False
+        self.inference_width = inference_width
+        self.use_roi = use_roi
+        self.roi_padding = roi_padding
+        self.roi_refresh = roi_refresh
+        self.roi = None
+        self.frames_since_full_search = 0
+        self.infer_every = 1
+        self.infer_interval = None
+        self.smoothing = 0
+        self.frames_since_inference = 0
+        self.last_inference = 0.0
+
+    def _search_region(self, w, h):
+        region = super()._search_region(w, h)
+        self.hands.region = (region, (w, h))
+        return region
+
+
+#21 landmarks of an open hand about `size` pixels tall, wrist at the origin
+def hand_template(size=160):
+    points = [(0.0, 0.0)]
+    for angle, length in zip((-60, -20, 0, 18, 36), (0.55, 0.75, 0.8, 0.75, 0.6)):
+        a = np.radians(angle)
+        base = np.array([np.sin(a) * 0.35, -np.cos(a) * 0.35])
+        for k in range(1, 5):
+            points.append(tuple(base + np.array([np.sin(a), -np.cos(a)]) * length * (k - 1) / 3 * 0.85))
+    return np.array(points) * size
+
+
+#(frames, hands, 21, 3) normalized landmarks of a hand sweeping a Lissajous path at `speed` px per frame
+def synthetic_truth(frames, width=WINDOW_WIDTH, height=WINDOW_HEIGHT, speed=12.0):
+    template = hand_template(min(width, height) * 0.22)
+    t = np.linspace(0, 20 * np.pi, 10000)
+    path = np.column_stack([width / 2 + width * 0.33 * np.sin(t), height * 0.6 + height * 0.2 * np.sin(1.7 * t)])
+    cx, cy = np.resize(resample_arc_length(path, spacing=speed), (frames, 2)).T  #loops when the path runs out
+    angle = 0.3 * np.sin(0.05 * np.arange(frames))
+    cos, sin = np.cos(angle)[:, None], np.sin(angle)[:, None]
+    x = cx[:, None] + cos * template[:, 0] - sin * template[:, 1]
+    y = cy[:, None] + sin * template[:, 0] + cos * template[:, 1]
+    truth = np.zeros((frames, 1, NUM_LANDMARKS, 3))
+    truth[:, 0, :, 0], truth[:, 0, :, 1] = x / width, y / height
+    return truth, (width, height)
+
+
+#(frames, hands, 21, 3) landmarks of a recorded session, frames without a hand have none
+def session_truth(directory):
+    reader = SessionReader(directory)
+    landmarks, counts = reader.column("landmarks"), reader.column("num_hands")
+    width, height = reader.meta.get("frame_size") or (WINDOW_WIDTH, WINDOW_HEIGHT)
+    return [hands[:n] for hands, n in zip(landmarks, counts)], (width, height)
+
+
+#the same blank frame every time, the stand-in model is told the truth just before each find_hands
+class _OracleFrames:
+    def __init__(self, frame, truth, oracle):
+        self.frame, self.truth, self.oracle = frame, truth, oracle
+
+    def __iter__(self):
+        for hands in self.truth:
+            self.oracle.truth = hands
+            yield self.frame
+
+    def __len__(self):
+        return len(self.truth)
+
+
+#ROI vs full-frame landmark error with the stand-in model, against the true landmarks and against
+#what the full-frame configuration returned
+def run_accuracy(truth, frame_size, noise=1.0):
+    width, height = frame_size
+    frame = np.zeros((height, width, 3), np.uint8)
+    present = [len(t) > 0 for t in truth]
+    reference_truth = [t[0, :, :2] * (width, height) if len(t) else None for t in truth]
+    print(f"{len(truth)} frames of {width}x{height}, hand in {np.mean(present) * 100:.1f}%, "
+          f"stand-in model error {noise} input px")
+    full = None
+    for name, kwargs in CONFIGS.items():
+        oracle = OracleHands(noise)
+        tracker = OracleTracker(oracle, **kwargs)
+        frames = _OracleFrames(frame, truth, oracle)
+        stats, landmarks = bench_config(frames, tracker=tracker)
+        if full is None:
+            full = landmarks
+        found = sum(1 for l, p in zip(landmarks, present) if l is not None and p) / max(sum(present), 1)
+        err, err95 = landmark_error(landmarks, reference_truth)
+        vs_full, vs_full95 = landmark_error(landmarks, full)
+        print(f"{name:<14} found {found * 100:5.1f}%  error vs truth {err:5.2f}px (p95 {err95:5.2f})  "
+              f"vs full frame {vs_full:5.2f}px (p95 {vs_full95:5.2f})  cpu {stats['cpu_ms_mean']:5.2f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CPU time per frame of the hand inference modes")
+    parser.add_argument("video", nargs="?", help="video with a visible hand, run through mediapipe")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--session", help="recorded hand tracking session, ROI accuracy on its landmarks "
+                                          "with the stand-in model instead of mediapipe")
+    parser.add_argument("--synthetic", action="store_true", help="ROI accuracy on a synthetic moving hand "
+                                                                 "with the stand-in model instead of mediapipe")
+    parser.add_argument("--speed", type=float, default=12.0, help="synthetic hand speed, px per frame")
+    parser.add_argument("--noise", type=float, default=1.0, help="stand-in model error, input px")
+    args = parser.parse_args(argv)
+
+    if args.session or args.synthetic:
+        if args.session:
+            truth, size = session_truth(args.session)
+            truth = truth[:args.frames]
+        else:
+            truth, size = synthetic_truth(args.frames, speed=args.speed)
+        run_accuracy(truth, size, args.noise)
+        return
+    if not args.video:
+        parser.error("a video, --session or --synthetic is required")
+
+    frames = load_frames(args.video, args.frames)
+    print(f"{len(frames)} frames of {frames[0].shape[1]}x{frames[0].shape[0]}")
+
+    reference = None
+    for name, kwargs in CONFIGS.items():
+        stats, landmarks = bench_config(frames, **kwargs)
+        if reference is None:
+            reference = landmarks
+        err, err95 = landmark_error(landmarks, reference)
+        print(f"{name:<14} cpu {stats['cpu_ms_mean']:6.2f} ms (p95 {stats['cpu_ms_p95']:6.2f})  "
+              f"detected {stats['detected'] * 100:5.1f}%  landmark error vs full frame {err:5.1f}px (p95 {err95:5.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from games.ConnectDots import ConnectDotsGame, generate_shape, interpolate_path
+from games.ShapeDrawing import ShapeDrawingGame
+from utils.geometry import interpolate_polygon, resample_arc_length
+from utils.scoring import ScoreTracker
+from utils.path_scoring import PathScorer
+from utils.shape_similarity import METRICS, NEAREST, make_scorer, make_live_accuracy, final_points
+
+
+#the original per-pair implementation, kept here as the reference
+def brute_force_accuracy(drawn_points, ideal_points, max_dist=50):
+    if not drawn_points:
+        return 0
+    total_score = 0
+    for dp in drawn_points:
+        min_dist = min(np.linalg.norm(np.array(dp) - np.array(ip)) for ip in ideal_points)
+        total_score += max(0, 1 - min_dist / max_dist)
+    return round((total_score / len(drawn_points)) * 100, 2)
+
+
+def noisy_stroke(ideal, n, noise=15, seed=0):
+    rng = np.random.default_rng(seed)
+    idx = np.linspace(0, len(ideal) - 1, n).astype(int)
+    pts = np.asarray(ideal)[idx] + rng.normal(0, noise, (n, 2))
+    return [tuple(p) for p in pts.astype(int)]
+
+
+def run(sizes=(1000, 10000, 50000), brute_force_limit=10000):
+    ideal = interpolate_path(generate_shape(3))
+    for n in sizes:
+        stroke = noisy_stroke(ideal, n)
+
+        start = time.perf_counter()
+        scorer = PathScorer(ideal)
+        build = time.perf_counter() - start
+        start = time.perf_counter()
+        fast = scorer.accuracy(stroke)
+        query = time.perf_counter() - start
+
+        line = f"{n:>6} pts  engine: build {build * 1000:.2f} ms, query {query * 1000:.2f} ms, acc {fast}"
+        if n <= brute_force_limit:
+            start = time.perf_counter()
+            slow = brute_force_accuracy(stroke, ideal)
+            brute = time.perf_counter() - start
+            line += f" | brute force: {brute * 1000:.0f} ms, acc {slow} | speedup x{brute / (build + query):.0f}"
+        print(line)
+
+
+#a faithful trace, the same trace drawn backwards, and back-and-forth along the first edge only,
+#scored end to end and live one point per frame by every metric
+def run_metrics(n=5000, noise=2, seed=0):
+    rng = np.random.default_rng(seed)
+    shape = generate_shape(3)
+    ideal = interpolate_path(shape)
+    trace = resample_arc_length(ideal, n=n) + rng.normal(0, noise, (n, 2))
+    a, b = np.array(shape[0]), np.array(shape[1])
+    scribble = a + (b - a) * np.abs(np.sin(np.linspace(0, 30, n)))[:, None] + rng.normal(0, noise, (n, 2))
+    strokes = {"trace": trace, "reversed": trace[::-1], "one edge": scribble}
+
+    print(f"\n{n}-point strokes")
+    for metric in METRICS:
+        scorer = make_scorer(ideal, metric)
+        line = f"{metric:>8}:"
+        for name, stroke in strokes.items():
+            stroke = [tuple(p) for p in stroke.astype(int)]
+            start = time.perf_counter()
+            acc = scorer.accuracy(stroke)
+            final = time.perf_counter() - start
+            live = make_live_accuracy(scorer)
+            frames = []
+            for point in stroke:
+                start = time.perf_counter()
+                live.add(point)
+                frames.append(time.perf_counter() - start)
+            line += (f"  {name} {acc:6.2f} (final {final * 1000:.2f} ms,"
+                     f" live p50 {np.median(frames) * 1e6:.0f} us p99 {np.percentile(frames, 99) * 1e6:.0f} us)")
+        print(line)
+
+
+#tracing exactly the lines each game shows (ConnectDots joins its dots without closing the shape,
+#ShapeDrawing closes it) must score close to 100 live and final under every metric. nearest keeps
+#the ideal paths players have always been scored against, ShapeDrawing's 20 points per edge leave
+#gaps on long edges that cap a perfect trace near 91
+def check_perfect_traces(min_accuracy=95, min_nearest=90):
+    failures = []
+    print()
+    for game_class, levels, closed in ((ConnectDotsGame, 3, False), (ShapeDrawingGame, 4, True)):
+        for metric in METRICS:
+            game = game_class(ScoreTracker("bench"), metric=metric)
+            for level in range(1, levels + 1):
+                game.current_level = level
+                game.start_level()
+                trace = interpolate_polygon(game.points, step=2, closed=closed)
+                live = game.live_accuracy.add(trace)
+                final = game.live_accuracy.reconcile(final_points(game.scorer, trace))
+                floor = min_nearest if metric == NEAREST else min_accuracy
+                ok = live >= floor and final >= floor
+                print(f"{game.name:<13} level {level} {metric:>8}: live {live:6.2f} final {final:6.2f}"
+                      f"{'' if ok else '  FAIL'}")
+                if not ok:
+                    failures.append((game.name, level, metric))
+    if failures:
+        raise SystemExit(f"perfect traces scored below {min_accuracy} ({min_nearest} nearest): {failures}")
+
+
+if __name__ == "__main__":
+    run()
+    run_metrics()
+    check_perfect_traces()
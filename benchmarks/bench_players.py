@@ -0,0 +1,88 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_inference import load_frames
+from handtracking.HandTracking import HandTracker
+from handtracking.players import PlayerAssigner
+
+
+def summarize(cpu_times, hands_found):
+    ms = np.array(cpu_times) * 1000
+    return {"cpu_ms_mean": ms.mean(), "cpu_ms_p95": np.percentile(ms, 95), "hands": np.mean(hands_found)}
+
+
+#one mediapipe pass tracking every hand, plus the hand -> player matching
+def bench_shared(frames, players):
+    tracker = HandTracker(max_hands=players)
+    assigner = PlayerAssigner(players, frame_size=frames[0].shape[1::-1])
+    cpu_times, hands_found, jumps = [], [], 0
+    last = [None] * players
+    for frame in frames:
+        img = frame.copy()
+        start = time.process_time()
+        tracker.find_hands(img, draw=False)
+        hands = tracker.find_landmarks(img)
+        assigned = assigner.assign(hands, tracker.handedness)
+        cpu_times.append(time.process_time() - start)
+        hands_found.append(len(hands))
+        #a player's hand moving more than a quarter of the frame between frames is most likely a swap
+        for i, hand in enumerate(assigned):
+            if hand is not None:
+                tip = hand[8, 1:].astype(float)
+                if last[i] is not None and np.hypot(*(tip - last[i])) > img.shape[1] / 4:
+                    jumps += 1
+                last[i] = tip
+    stats = summarize(cpu_times, hands_found)
+    stats["identity_jumps"] = jumps
+    return stats
+
+
+#what N separate processes on one camera do: every tracker runs on the whole frame
+#(strips=False), or each one only looks at its player's vertical strip (strips=True)
+def bench_separate(frames, players, strips=False):
+    trackers = [HandTracker(max_hands=1) for _ in range(players)]
+    w = frames[0].shape[1]
+    bounds = [(i * w // players, (i + 1) * w // players) if strips else (0, w) for i in range(players)]
+    cpu_times, hands_found = [], []
+    for frame in frames:
+        start = time.process_time()
+        found = 0
+        for tracker, (x0, x1) in zip(trackers, bounds):
+            img = frame[:, x0:x1].copy()
+            tracker.find_hands(img, draw=False)
+            found += len(tracker.find_landmarks(img))
+        cpu_times.append(time.process_time() - start)
+        hands_found.append(found)
+    return summarize(cpu_times, hands_found)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CPU time per frame of one shared hand tracker vs one per player")
+    parser.add_argument("video", help="recorded session with every player's hand in view")
+    parser.add_argument("--players", type=int, default=2)
+    parser.add_argument("--frames", type=int, default=300)
+    args = parser.parse_args(argv)
+
+    frames = load_frames(args.video, args.frames)
+    print(f"{len(frames)} frames of {frames[0].shape[1]}x{frames[0].shape[0]}, {args.players} players")
+
+    shared = bench_shared(frames, args.players)
+    configs = [
+        ("shared", shared),
+        ("separate_full", bench_separate(frames, args.players)),
+        ("separate_strips", bench_separate(frames, args.players, strips=True)),
+    ]
+    for name, stats in configs:
+        print(f"{name:<16} cpu {stats['cpu_ms_mean']:6.2f} ms (p95 {stats['cpu_ms_p95']:6.2f})  "
+              f"hands/frame {stats['hands']:.2f}  x{stats['cpu_ms_mean'] / shared['cpu_ms_mean']:.2f} vs shared")
+    print(f"shared tracker identity jumps: {shared['identity_jumps']}")
+
+
+if __name__ == "__main__":
+    main()
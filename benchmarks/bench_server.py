@@ -0,0 +1,49 @@
+import argparse
+import json
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from handtracking.HandTracking import HandTracker
+from handtracking.synthetic import SyntheticHandTracker, circle_path
+from games.stations import run_stations, print_report
+from utils.frame_source import synthetic_frames
+from utils.settings import WINDOW_WIDTH, WINDOW_HEIGHT
+
+
+#module level so spawned workers can unpickle it, measures transport without mediapipe
+def synthetic_tracker(max_hands=1):
+    return SyntheticHandTracker(circle_path((WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2), 120, period=90),
+                                max_hands=max_hands)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aggregate throughput and per-stream latency of the "
+                                                 "inference server as the stream count grows")
+    parser.add_argument("video", nargs="?", help="video replayed on every stream, synthetic frames if omitted")
+    parser.add_argument("--streams", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--frames", type=int, default=300, help="frames per stream")
+    parser.add_argument("--game", default="BalloonPop")
+    parser.add_argument("--synthetic-tracker", action="store_true",
+                        help="workers run SyntheticHandTracker instead of mediapipe")
+    parser.add_argument("--output", help="write the reports as JSON")
+    args = parser.parse_args(argv)
+
+    factory = synthetic_tracker if args.synthetic_tracker else HandTracker
+    source = args.video or (lambda: synthetic_frames(WINDOW_WIDTH, WINDOW_HEIGHT, count=args.frames))
+    reports = []
+    for streams in args.streams:
+        report = run_stations([source] * streams, args.game, args.workers, max_frames=args.frames,
+                              save=False, tracker_factory=factory)
+        print_report(report)
+        reports.append(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(reports, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import argparse
+import os
+import sys
+import time
+from functools import partial
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from games.BalloonPop import BALLOON_COLORS, render_balloon
+from games.CatchDroplets import DROPLET_COLORS, render_droplet, draw_bucket
+from utils.assets import get_assets
+from utils.entities import EntityPool
+from utils.settings import WINDOW_WIDTH, WINDOW_HEIGHT
+
+
+#the per-frame rectangle/line/putText bucket, kept here as the reference
+def legacy_draw_bucket(img, x, y, w, h):
+    cv2.rectangle(img, (x, y), (x + w, y + h), (0, 165, 255), -1)
+    cv2.rectangle(img, (x, y), (x + w, y + h), (0, 255, 255), 6)
+    cv2.line(img, (x, y), (x + w, y), (255, 255, 255), 10)
+    cv2.putText(img, "BUCKET", (x + 20, y + 40), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 0), 3)
+    cv2.putText(img, "BUCKET", (x + 20, y + 40), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+
+
+#what the sprites show, drawn with primitives every frame
+def primitive_balloons(entities, img):
+    n = entities.count
+    for x, y, r, c in zip(entities.x[:n].astype(int).tolist(), entities.y[:n].astype(int).tolist(),
+                          entities.radius[:n].tolist(), entities.color[:n].tolist()):
+        cv2.line(img, (x, y + r), (x + r // 4, y + 2 * r), (200, 200, 200), 1)
+        cv2.circle(img, (x, y), r, c, -1)
+        k = max(r // 6, 2)
+        cv2.fillConvexPoly(img, np.array([(x, y + r - k), (x - k, y + r + k), (x + k, y + r + k)], np.int32), c)
+        cv2.ellipse(img, (x - r // 3, y - r // 3), (max(r // 5, 1), max(r // 3, 1)), 30, 0, 360,
+                    tuple(min(v + 110, 255) for v in c), -1)
+
+
+def primitive_droplets(entities, img):
+    n = entities.count
+    for x, y, r, c in zip(entities.x[:n].astype(int).tolist(), entities.y[:n].astype(int).tolist(),
+                          entities.radius[:n].tolist(), entities.color[:n].tolist()):
+        cv2.circle(img, (x, y), r, c, -1)
+        side = int(r * 0.87)
+        cv2.fillConvexPoly(img, np.array([(x, y - 2 * r), (x - side, y - r // 2), (x + side, y - r // 2)], np.int32), c)
+        cv2.circle(img, (x - r // 3, y - r // 3), max(r // 4, 1), tuple(min(v + 110, 255) for v in c), -1)
+
+
+def pool(n, colors, radius, seed=0):
+    rng = np.random.default_rng(seed)
+    entities = EntityPool(max(n, 1))
+    entities.spawn(rng.integers(0, WINDOW_WIDTH, n), rng.integers(0, WINDOW_HEIGHT, n).astype(np.float32),
+                   0, radius, colors[rng.integers(0, len(colors), n)])
+    return entities
+
+
+def timed(draw, frames):
+    img = np.zeros((WINDOW_HEIGHT, WINDOW_WIDTH, 3), np.uint8)
+    draw(img)  #the first call builds the sprites
+    times = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        draw(img)
+        times.append(time.perf_counter() - start)
+    return np.percentile(np.asarray(times) * 1e6, 50)
+
+
+def run(counts=(5, 20, 100), frames=500):
+    assets = get_assets()
+    x, y = WINDOW_WIDTH // 2 - 75, WINDOW_HEIGHT - 90
+    legacy = timed(lambda img: legacy_draw_bucket(img, x, y, 150, 60), frames)
+    sprite = timed(lambda img: draw_bucket(img, x, y, 150, 60), frames)
+    print(f"bucket          primitives    {legacy:7.1f} us | sprite {sprite:7.1f} us")
+    for name, colors, radius, render, primitives in (
+            ("balloons", BALLOON_COLORS, 30, render_balloon, primitive_balloons),
+            ("droplets", DROPLET_COLORS, 15, render_droplet, primitive_droplets)):
+        for n in counts:
+            entities = pool(n, colors, radius)
+            circles = timed(entities.draw, frames)
+            detailed = timed(partial(primitives, entities), frames)
+            sprite = timed(partial(entities.draw_sprites, sprite=partial(assets.procedural, render)), frames)
+            print(f"{n:>4} {name:<10} plain circles {circles:7.1f} us | same look as primitives {detailed:7.1f} us"
+                  f" | sprites {sprite:7.1f} us")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-frame cost of sprite drawing against the primitives it replaced")
+    parser.add_argument("--frames", type=int, default=500)
+    args = parser.parse_args(argv)
+    run(frames=args.frames)
+
+
+if __name__ == "__main__":
+    main()
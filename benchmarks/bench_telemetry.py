@@ -0,0 +1,58 @@
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.frame_source import DROP_NEWEST, DROP_OLDEST
+from utils.telemetry import TelemetryWriter, read_telemetry
+
+
+#cost of logging one frame record from the game loop while the writer thread encodes and compresses,
+#at a paced rate and flat out (where the bounded queue overflows)
+def run(records=5000, rate=1000, hands=2, queue_size=8192, overflow=DROP_NEWEST):
+    directory = tempfile.mkdtemp(prefix="telemetry_bench_")
+    try:
+        writer = TelemetryWriter(directory, meta={"game": "bench"}, queue_size=queue_size, overflow=overflow,
+                                 max_file_records=records // 4 or 1)
+        interval = 1 / rate if rate else 0
+        times = []
+        start = time.perf_counter()
+        for i in range(records):
+            t = time.perf_counter()
+            writer.frame(i // hands, i % hands, (i % 1380, i % 820), [0, 1, 0, 0, 0], 1.25, False)
+            times.append(time.perf_counter() - t)
+            if interval:
+                time.sleep(max(0.0, start + (i + 1) * interval - time.perf_counter()))
+        stats = writer.close()
+        read = sum(1 for r in read_telemetry(directory) if r["type"] == "frame")
+        size = sum(os.path.getsize(os.path.join(directory, n)) for n in os.listdir(directory))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    times = np.asarray(times) * 1e6
+    label = f"{rate} rec/s" if rate else "flat out"
+    print(f"{label:>12}: put p50 {np.percentile(times, 50):.1f} us  p99 {np.percentile(times, 99):.1f} us  "
+          f"max {times.max():.0f} us | written {stats['written']} (read back {read}), dropped {stats['dropped']}, "
+          f"max depth {stats['max_depth']}, {stats['files']} files, {size / 1024:.0f} KiB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Telemetry writer overhead on the game loop")
+    parser.add_argument("--records", type=int, default=5000)
+    parser.add_argument("--overflow", default=DROP_NEWEST, choices=[DROP_NEWEST, DROP_OLDEST])
+    args = parser.parse_args(argv)
+    #paced runs last two seconds each
+    for rate in (120, 1000):
+        run(rate * 2, rate, overflow=args.overflow)
+    run(args.records, 0, overflow=args.overflow)
+    run(args.records * 4, 0, queue_size=256, overflow=args.overflow)
+
+
+if __name__ == "__main__":
+    main()
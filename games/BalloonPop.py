@@ -1,157 +1,208 @@
 import cv2
 import numpy as np
-import random
-import time
-import sys, os, json
+import sys, os
+from functools import partial
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from handtracking.HandTracking import HandTracker
+from handtracking.gestures import GestureEngine
+from handtracking.players import PlayerAssigner
 from utils.scoring import ScoreTracker
 from utils.ui_helper import draw_text
+from utils.entities import EntityPool
+from utils.assets import get_assets
+from utils.frame_source import FrameSource, source_from_args
+from utils.game_clock import SpawnTimer, REFERENCE_FPS
+from games.game_loop import Game, run_game
 from utils.settings import *
 
-#faster with every level
-class Balloon:
-    def __init__(self, x, y, color, radius=30, speed=5):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.radius = radius
-        self.speed = speed
-        self.popped = False
-
-    def move(self):
-        self.y -= self.speed
-
-    def draw(self, img):
-        if not self.popped:
-            cv2.circle(img, (self.x, self.y), self.radius, self.color, -1)
-
-def check_pop(balloon, finger_pos):
-    dist = np.linalg.norm(np.array([balloon.x, balloon.y]) - np.array(finger_pos))
-    return dist < balloon.radius
-
-def game_over_screen(final_score):
+BALLOON_COLORS = np.array([RED, GREEN, BLUE, YELLOW, PURPLE])
+
+#body centred on the anchor with the hit-test radius, a lighter highlight, the knot and a string
+#hard edges keep the sprite on the masked-copy path
+def render_balloon(color, radius):
+    w, h = 2 * radius + 1, 3 * radius + 1
+    bgra = np.zeros((h, w, 4), np.uint8)
+    body = tuple(color) + (255,)
+    cv2.line(bgra, (radius, 2 * radius), (radius + radius // 4, h - 1), (200, 200, 200, 255), 1)
+    cv2.circle(bgra, (radius, radius), radius, body, -1)
+    k = max(radius // 6, 2)
+    knot = np.array([(radius, 2 * radius - k), (radius - k, 2 * radius + k), (radius + k, 2 * radius + k)], np.int32)
+    cv2.fillConvexPoly(bgra, knot, body)
+    light = tuple(min(c + 110, 255) for c in color) + (255,)
+    cv2.ellipse(bgra, (radius - radius // 3, radius - radius // 3), (max(radius // 5, 1), max(radius // 3, 1)),
+                30, 0, 360, light, -1)
+    return bgra, (radius, radius)
+
+def game_over_screen(final_score, player_scores=None):
     img = np.zeros((WINDOW_HEIGHT, WINDOW_WIDTH, 3), np.uint8)
     draw_text(img, "GAME OVER", (200, 250), (0, 255, 255), 1.2, 3)
     draw_text(img, f"Final Score: {final_score}", (250, 320), (0, 255, 0), 1.0, 2)
-    draw_text(img, "Returning to Main Menu...", (220, 400), WHITE, 0.8, 2)
+    for i, score in enumerate(player_scores or []):
+        draw_text(img, f"{score.player_name}: {score.score}", (250, 370 + 40 * i),
+                  PLAYER_COLORS[i % len(PLAYER_COLORS)], 0.8, 2)
+    draw_text(img, "Returning to Main Menu...", (220, 400 + 40 * len(player_scores or [])), WHITE, 0.8, 2)
     cv2.imshow("Game Over", img)
     cv2.waitKey(2500)
     cv2.destroyAllWindows()
 
-def save_scores_to_json(score_tracker):
-    save_path = os.path.join(os.path.dirname(__file__), "utils", "scores.json")
-    os.makedirs(os.path.dirname(save_path), exist_ok=True)
-    data = score_tracker.get_summary()
-
-    if os.path.exists(save_path):
-        try:
-            with open(save_path, "r") as f:
-                all_scores = json.load(f)
-        except json.JSONDecodeError:
-            all_scores = []
-    else:
-        all_scores = []
-
-    all_scores.append(data)
-    with open(save_path, "w") as f:
-        json.dump(all_scores, f, indent=4)
-    print(f"Score saved to {save_path}")
-
-def run_balloon_pop():
-    cap = cv2.VideoCapture(0, cv2.CAP_DSHOW)
-    cap.set(3, WINDOW_WIDTH)
-    cap.set(4, WINDOW_HEIGHT)
-
-    tracker = HandTracker(max_hands=1)
-    score = ScoreTracker("Player1")
-
-    level = 1
-    max_level = 3
-    level_duration = 10  
+class BalloonPopGame(Game):
+    name = "BalloonPop"
+    title = "🎈 Balloon Pop"
+
+    #stress spawns that many balloons per spawn tick, for benchmarking the entity engine
+    def __init__(self, score, max_level=3, level_duration=10, stress=1, seed=None, clock=None):
+        super().__init__(score, clock)
+        self.level = 1
+        self.max_level = max_level
+        self.level_duration = level_duration
+        self.spawn_count = stress
+        self.rng = np.random.default_rng(seed)
+        self.balloons = EntityPool(max(64, 4 * stress))
+        self.balloon_sprite = partial(get_assets().procedural, render_balloon)
+        self.start_level()
+
+    #difficulty was tuned per frame at REFERENCE_FPS, it is kept in seconds and pixels per second
+    def start_level(self):
+        self.balloons.count = 0
+        self.level_start = self.clock.time
+        self.spawn_timer = SpawnTimer(max(20 - self.level * 5, 5) / REFERENCE_FPS, self.level_start)
+        self.speed_range = ((3 + self.level * 2) * REFERENCE_FPS, (5 + self.level * 3) * REFERENCE_FPS)
+
+    def spawn_balloons(self):
+        margin = 100 if self.spawn_count == 1 else WINDOW_WIDTH // 2
+        n = self.spawn_count
+        x = self.rng.integers(WINDOW_WIDTH//2 - margin, WINDOW_WIDTH//2 + margin, n, endpoint=True)
+        color = BALLOON_COLORS[self.rng.integers(0, len(BALLOON_COLORS), n)]
+        speed = self.rng.integers(self.speed_range[0], self.speed_range[1], n, endpoint=True)
+        self.balloons.spawn(x, WINDOW_HEIGHT + 30, speed, 30, color)
+
+    def step(self, dt):
+        for _ in range(self.spawn_timer.due(self.clock.time)):
+            self.spawn_balloons()
+        balloons = self.balloons
+        balloons.move(direction=-1, dt=dt)
+        # Remove off-screen balloons
+        n = balloons.count
+        balloons.compact(balloons.y[:n] + balloons.radius[:n] > 0)
+
+    #index fingertip of a hand pointing with at least one finger, drawn as the cursor
+    def finger_position(self, img, hand, slot=0, color=WHITE):
+        if hand is None or self.gestures.counts[slot] < 1:
+            return None
+        finger_pos = (int(hand[8, 1]), int(hand[8, 2]))
+        cv2.circle(img, finger_pos, 8, color, -1)
+        return finger_pos
+
+    #pops every balloon under the fingertip and returns how many
+    def pop_at(self, finger_pos):
+        if not finger_pos:
+            return 0
+        balloons = self.balloons
+        popped = balloons.hit_point(*finger_pos)
+        hits = int(popped.sum())
+        if hits:
+            balloons.kill(popped)
+            balloons.compact()
+        return hits
+
+    def update(self, img, hand):
+        self.simulate()
+        finger_pos = self.finger_position(img, hand)
+        self.balloons.draw_sprites(img, self.balloon_sprite)
+
+        hits = self.pop_at(finger_pos)
+        if hits:
+            self.score.add_points(10 * hits)
+        self.hud.text("score", f"Score: {self.score.score}", (30, 50), GREEN)
+        self.update_level()
+
+    def update_level(self):
+        elapsed = int(self.clock.time - self.level_start)
+        remaining = max(self.level_duration - elapsed, 0)
+        hud = self.hud
+        hud.text("level", f"Level: {self.level}", (WINDOW_WIDTH - 220, 50), BLUE)
+        hud.text("time", f"Time: {remaining}s", (WINDOW_WIDTH - 210, 90), BLUE)
+
+        if remaining <= 0:
+            print(f"Level {self.level} finished! Score: {self.score.score}")
+            self.level += 1
+            if self.level > self.max_level:
+                self.done = True
+            else:
+                self.start_level()
+
+
+#several players in front of one camera, one tracker pass finds all hands and PlayerAssigner
+#keeps each hand with its player; balloons spawn across the whole width
+class MultiPlayerBalloonPopGame(BalloonPopGame):
+    title = "🎈 Balloon Pop - Multiplayer"
+
+    #scores holds one ScoreTracker per player, self.score is the team total
+    def __init__(self, scores, team_score=None, **kwargs):
+        self.scores = scores
+        self.players = PlayerAssigner(len(scores))
+        super().__init__(team_score or ScoreTracker("Team"), **kwargs)
+        self.gestures = GestureEngine(max_hands=len(scores))
+
+    def spawn_balloons(self):
+        if self.spawn_count > 1:
+            super().spawn_balloons()
+            return
+        x = self.rng.integers(100, WINDOW_WIDTH - 100, len(self.scores), endpoint=True)
+        color = BALLOON_COLORS[self.rng.integers(0, len(BALLOON_COLORS), len(x))]
+        speed = self.rng.integers(self.speed_range[0], self.speed_range[1], len(x), endpoint=True)
+        self.balloons.spawn(x, WINDOW_HEIGHT + 30, speed, 30, color)
+
+    def select_hands(self, hands, tracker):
+        return self.players.assign(hands, tracker.handedness)
+
+    def update(self, img, hands):
+        self.simulate()
+        positions = [self.finger_position(img, hand, i, PLAYER_COLORS[i % len(PLAYER_COLORS)])
+                     for i, hand in enumerate(hands)]
+        self.balloons.draw_sprites(img, self.balloon_sprite)
+
+        for i, (score, finger_pos) in enumerate(zip(self.scores, positions)):
+            hits = self.pop_at(finger_pos)
+            if hits:
+                score.add_points(10 * hits)
+                self.score.add_points(10 * hits)
+            self.hud.text(f"score{i}", f"P{i + 1}: {score.score}", (30, 50 + 40 * i),
+                          PLAYER_COLORS[i % len(PLAYER_COLORS)])
+        self.update_level()
+
+
+def run_balloon_pop(source=0, cap=None, tracker=None, players=PLAYERS):
+    #the menu passes its camera and tracker in, standalone runs open their own
+    owns_cap = cap is None
+    if owns_cap:
+        cap = FrameSource(source, WINDOW_WIDTH, WINDOW_HEIGHT, api=cv2.CAP_DSHOW)
+    #one inference pass covers every player, but mediapipe's hand limit is fixed when it is created
+    if tracker is None or tracker.max_hands < players:
+        tracker = HandTracker(max_hands=players)
 
     print("Balloon Pop — Pop balloons with your index finger.")
     print("Press ESC to quit.")
 
-    while level <= max_level:
-        balloons = []
-        frame_count = 0
-        start_time = time.time()
-        balloon_spawn_interval = max(20 - level * 5, 5)  #level difficulty
-        speed_range = (3 + level * 2, 5 + level * 3)
-
-        while True:
-            success, frame = cap.read()
-            if not success:
-                print("❌ Camera read error")
-                break
-
-            frame = cv2.flip(frame, 1)
-            img = tracker.find_hands(frame, draw=True)
-            lm_list = tracker.find_position(img, draw=False)
-
-        
-            if frame_count % balloon_spawn_interval == 0:
-                margin = 100
-                x = random.randint(WINDOW_WIDTH//2 - margin, WINDOW_WIDTH//2 + margin)
-                color = random.choice([RED, GREEN, BLUE, YELLOW, PURPLE])
-                speed = random.randint(speed_range[0], speed_range[1])
-                balloons.append(Balloon(x, WINDOW_HEIGHT + 30, color, radius=30, speed=speed))
-
-            frame_count += 1
-
-            finger_pos = None
-            if lm_list:
-                fingers_state = tracker.fingers_up(lm_list)
-                if sum(fingers_state) >= 1:
-                    finger_pos = tuple(lm_list[8][1:3])
-                    cv2.circle(img, finger_pos, 8, WHITE, -1)
-
-            #draw balloons
-            for balloon in balloons:
-                balloon.move()
-                balloon.draw(img)
-
-                if finger_pos and not balloon.popped:
-                    if check_pop(balloon, finger_pos):
-                        balloon.popped = True
-                        score.add_points(10)
-
-            # Remove off-screen balloons
-            balloons = [b for b in balloons if b.y + b.radius > 0 and not b.popped]
-
-            
-            elapsed = int(time.time() - start_time)
-            remaining = max(level_duration - elapsed, 0)
-            draw_text(img, f"Score: {score.score}", (30, 50), GREEN)
-            draw_text(img, f"Level: {level}", (WINDOW_WIDTH - 220, 50), BLUE)
-            draw_text(img, f"Time: {remaining}s", (WINDOW_WIDTH - 210, 90), BLUE)
-
-            cv2.imshow("🎈 Balloon Pop", img)
-            key = cv2.waitKey(30) & 0xFF
-            if key in [27, ord('q')]:
-                cap.release()
-                cv2.destroyAllWindows()
-                score.save_score()
-                save_scores_to_json(score)
-                game_over_screen(score.score)
-                return score.score
-
-            if remaining <= 0:
-                break
-
-        print(f"Level {level} finished! Score: {score.score}")
-        level += 1
-
-    cap.release()
+    if players > 1:
+        scores = [ScoreTracker(f"Player{i + 1}") for i in range(players)]
+        game = MultiPlayerBalloonPopGame(scores)
+    else:
+        scores = [ScoreTracker("Player1")]
+        game = BalloonPopGame(scores[0])
+    run_game(game, cap, tracker)
+
+    if owns_cap:
+        cap.release()
     cv2.destroyAllWindows()
-    score.save_score("BalloonPop")
-    save_scores_to_json(score)
-    game_over_screen(score.score)
-    print("Final Summary:", score.get_summary())
-    return score.score
+    for score in scores:
+        score.save_score("BalloonPop")
+    game_over_screen(game.score.score, scores if players > 1 else None)
+    for score in scores:
+        print("Final Summary:", score.get_summary())
+    return game.score.score
 
 if __name__ == "__main__":
-    run_balloon_pop()
+    run_balloon_pop(source=source_from_args())
@@ -1,51 +1,41 @@
 import cv2
 import numpy as np
-import random
-import time
 import sys, os
-import json
+from functools import partial
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from handtracking.HandTracking import HandTracker
 from utils.scoring import ScoreTracker
 from utils.ui_helper import draw_text
+from utils.entities import EntityPool
+from utils.assets import get_assets
+from utils.frame_source import FrameSource, source_from_args
+from utils.game_clock import SpawnTimer, REFERENCE_FPS
+from games.game_loop import Game, run_game
 from utils.settings import *
 
 
-class Droplet:
-    def __init__(self, x, y, color, radius=15, speed=5):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.radius = radius
-        self.speed = speed
-        self.caught = False
+DROPLET_COLORS = np.array([(0, 0, 255), (0, 255, 0), (255, 0, 0), (0, 255, 255), (255, 0, 255)])
 
-    def move(self):
-        self.y += self.speed
-
-    def draw(self, img):
-        if not self.caught:
-            cv2.circle(img, (self.x, self.y), self.radius, self.color, -1)
-
-def check_catch(droplet, bucket_x, bucket_y, bucket_w, bucket_h):
-    return (bucket_x < droplet.x < bucket_x + bucket_w) and (bucket_y < droplet.y < bucket_y + bucket_h)
+#teardrop with its round part centred on the anchor, the point upwards and a lighter highlight
+def render_droplet(color, radius):
+    w, h = 2 * radius + 1, 3 * radius + 1
+    cy = h - radius - 1
+    bgra = np.zeros((h, w, 4), np.uint8)
+    body = tuple(color) + (255,)
+    cv2.circle(bgra, (radius, cy), radius, body, -1)
+    side = int(radius * 0.87)
+    point = np.array([(radius, 0), (radius - side, cy - radius // 2), (radius + side, cy - radius // 2)], np.int32)
+    cv2.fillConvexPoly(bgra, point, body)
+    light = tuple(min(c + 110, 255) for c in color) + (255,)
+    cv2.circle(bgra, (radius - radius // 3, cy - radius // 3), max(radius // 4, 1), light, -1)
+    return bgra, (radius, cy)
 
+#the bucket icon spans the catch rect's width and reaches half its height below it
 def draw_bucket(img, x, y, w, h):
-    
-    
-    x, y, w, h = int(x), int(y), int(w), int(h)
-    
-    cv2.rectangle(img, (x, y), (x + w, y + h), (0, 165, 255), -1)  
-    
-    cv2.rectangle(img, (x, y), (x + w, y + h), (0, 255, 255), 6)  
-    
-    cv2.line(img, (x, y), (x + w, y), (255, 255, 255), 10)  
-    cv2.putText(img, "BUCKET", (x + 20, y + 40), 
-                cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 0), 3)  
-    cv2.putText(img, "BUCKET", (x + 20, y + 40), 
-                cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2) 
+    sprite = get_assets().sprite(BUCKET_IMG_PATH, (int(w), int(h * 1.5)), tint=YELLOW, anchor=(0, 0))
+    sprite.blit(img, int(x), int(y))
 
 def game_over_screen(final_score):
     img = np.zeros((WINDOW_HEIGHT, WINDOW_WIDTH, 3), np.uint8)
@@ -56,129 +46,116 @@ def game_over_screen(final_score):
     cv2.waitKey(2500)
     cv2.destroyAllWindows()
 
-def save_scores_to_json(score_tracker, game_name="CatchDroplets"):
-    save_path = os.path.join(os.path.dirname(__file__), "utils", "scores.json")
-    os.makedirs(os.path.dirname(save_path), exist_ok=True)
-    data = score_tracker.get_summary()
-    data["game"] = game_name
-
-    if os.path.exists(save_path):
-        try:
-            with open(save_path, "r") as f:
-                all_scores = json.load(f)
-        except json.JSONDecodeError:
-            all_scores = []
-    else:
-        all_scores = []
-
-    all_scores.append(data)
-    with open(save_path, "w") as f:
-        json.dump(all_scores, f, indent=4)
-    print(f"💾 Score saved to {save_path}")
-
-def run_catch_droplets(level_limit=3, level_time=10):
-    cap = cv2.VideoCapture(0, cv2.CAP_DSHOW)
-    cap.set(3, WINDOW_WIDTH)
-    cap.set(4, WINDOW_HEIGHT)
-
-    tracker = HandTracker(max_hands=1)
+class CatchDropletsGame(Game):
+    name = "CatchDroplets"
+    title = "💧 Catch the Droplets"
+
+    #stress spawns that many droplets per spawn tick, for benchmarking the entity engine
+    def __init__(self, score, level_limit=3, level_time=10, stress=1, seed=None, clock=None):
+        super().__init__(score, clock)
+        self.level_limit = level_limit
+        self.level_time = level_time
+        self.bucket_w, self.bucket_h = 150, 60
+        self.frame_width, self.frame_height = WINDOW_WIDTH, WINDOW_HEIGHT
+        self.current_level = 1
+        self.spawn_count = stress
+        self.rng = np.random.default_rng(seed)
+        self.droplets = EntityPool(max(64, 4 * stress))
+        self.droplet_sprite = partial(get_assets().procedural, render_droplet)
+        #every 25 frames at REFERENCE_FPS, the first droplet comes one interval in
+        self.spawn_timer = SpawnTimer(25 / REFERENCE_FPS, 25 / REFERENCE_FPS)
+        self.level_start_time = self.clock.time
+
+    def spawn_droplets(self):
+        frame_width = self.frame_width
+        center_margin = 200 if self.spawn_count == 1 else frame_width // 2
+        n = self.spawn_count
+        x = self.rng.integers(frame_width//2 - center_margin, frame_width//2 + center_margin, n, endpoint=True)
+        color = DROPLET_COLORS[self.rng.integers(0, len(DROPLET_COLORS), n)]
+        speed = self.rng.integers(3 + self.current_level, 6 + self.current_level, n, endpoint=True) * REFERENCE_FPS
+        self.droplets.spawn(x, -10, speed, 15, color)
+
+    def step(self, dt):
+        for _ in range(self.spawn_timer.due(self.clock.time)):
+            self.spawn_droplets()
+        droplets = self.droplets
+        droplets.move(direction=1, dt=dt)
+        droplets.compact(droplets.y[:droplets.count] < self.frame_height + 20)
+
+    def update(self, img, hand):
+        bucket_w, bucket_h = self.bucket_w, self.bucket_h
+        frame_height, frame_width = img.shape[:2]
+        self.frame_width, self.frame_height = frame_width, frame_height
+
+        bucket_y = frame_height - bucket_h - 30
+        bucket_x = frame_width // 2 - bucket_w // 2
+
+        if hand is not None:
+            finger_x, finger_y = int(hand[8, 1]), int(hand[8, 2])
+            bucket_x = int(np.clip(finger_x - bucket_w // 2, 0, frame_width - bucket_w))
+            cv2.circle(img, (finger_x, finger_y), 10, (0, 255, 0), -1)
+
+        self.simulate()
+        droplets = self.droplets
+        droplets.draw_sprites(img, self.droplet_sprite)
+
+        caught = droplets.in_rect(bucket_x, bucket_y, bucket_w, bucket_h)
+        hits = int(caught.sum())
+        if hits:
+            droplets.kill(caught)
+            self.score.add_points(5 * hits)
+            for x, y in droplets.positions(caught).tolist():
+                cv2.circle(img, (x, y), 30, (0, 255, 0), 3)
+            droplets.compact()
+
+        draw_bucket(img, bucket_x, bucket_y, bucket_w, bucket_h)
+
+        hud = self.hud
+        hud.text("bucket", f"Bucket: X={bucket_x} Y={bucket_y}", (20, 120), (255, 255, 0), 0.7, 2)
+        hud.text("frame", f"Frame: {frame_width}x{frame_height}", (20, 150), (255, 255, 0), 0.7, 2)
+
+        elapsed_time = int(self.clock.time - self.level_start_time)
+        remaining = max(self.level_time - elapsed_time, 0)
+
+        hud.text("score", f"Score: {self.score.score}", (20, 40), (0, 255, 0))
+        hud.text("level", f"Level {self.current_level}/{self.level_limit}", (20, 80), (255, 0, 0))
+        hud.text("time", f"Time: {remaining}s", (frame_width - 180, 40), (0, 0, 255))
+
+        if self.clock.time - self.level_start_time >= self.level_time:
+            self.current_level += 1
+            self.level_start_time = self.clock.time
+            if self.current_level > self.level_limit:
+                self.done = True
+
+
+def run_catch_droplets(level_limit=3, level_time=10, source=0, cap=None, tracker=None):
+    #the menu passes its camera and tracker in, standalone runs open their own
+    owns_cap = cap is None
+    if owns_cap:
+        cap = FrameSource(source, WINDOW_WIDTH, WINDOW_HEIGHT, api=cv2.CAP_DSHOW)
+    if tracker is None:
+        tracker = HandTracker(max_hands=1)
     score = ScoreTracker("Player1")
 
     ret, test_frame = cap.read()
     if ret:
         actual_height, actual_width = test_frame.shape[:2]
         print(f"📐 Actual camera resolution: {actual_width}x{actual_height}")
-    else:
-        actual_height = WINDOW_HEIGHT
-        actual_width = WINDOW_WIDTH
-
-    bucket_w, bucket_h = 150, 60  
-    droplet_spawn_interval = 25
-    frame_count = 0
-
-    current_level = 1
-    droplets = []
 
     print("Catch the Droplets — Move the bucket with your index finger.")
     print("Press ESC or Q to quit.")
 
-    while current_level <= level_limit:
-        level_start_time = time.time()
-        while time.time() - level_start_time < level_time:
-            success, frame = cap.read()
-            if not success:
-                print("Camera read error")
-                break
-
-            frame = cv2.flip(frame, 1)
-            img = frame.copy()
-            
-            frame_height, frame_width = img.shape[:2]
-          
-            bucket_y = frame_height - bucket_h - 30  
-            bucket_x = frame_width // 2 - bucket_w // 2  
-            
-            img = tracker.find_hands(img, draw=True)
-            lm_list = tracker.find_position(img, draw=False)
-            frame_count += 1
-
-            if lm_list and len(lm_list) > 8:
-                finger_x = lm_list[8][1]  
-                bucket_x = int(np.clip(finger_x - bucket_w // 2, 0, frame_width - bucket_w))
-                cv2.circle(img, (finger_x, lm_list[8][2]), 10, (0, 255, 0), -1)
-
-            if frame_count % droplet_spawn_interval == 0:
-                center_margin = 200
-                x = random.randint(frame_width//2 - center_margin, frame_width//2 + center_margin)
-                color = random.choice([(0, 0, 255), (0, 255, 0), (255, 0, 0), (0, 255, 255), (255, 0, 255)])
-                speed = random.randint(3 + current_level, 6 + current_level)
-                droplets.append(Droplet(x, -10, color, radius=15, speed=speed))
-
-            for drop in droplets:
-                drop.move()
-                drop.draw(img)
-                if check_catch(drop, bucket_x, bucket_y, bucket_w, bucket_h):
-                    drop.caught = True
-                    score.add_points(5)
-                    cv2.circle(img, (drop.x, drop.y), 30, (0, 255, 0), 3)
-
-            droplets = [d for d in droplets if not d.caught and d.y < frame_height + 20]
-
-          
-            draw_bucket(img, bucket_x, bucket_y, bucket_w, bucket_h)
-            
-            cv2.putText(img, f"Bucket: X={bucket_x} Y={bucket_y}", 
-                       (20, 120),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
-            
-            cv2.putText(img, f"Frame: {frame_width}x{frame_height}", 
-                       (20, 150),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
-
-          
-            elapsed_time = int(time.time() - level_start_time)
-            remaining = max(level_time - elapsed_time, 0)
-            
-            draw_text(img, f"Score: {score.score}", (20, 40), (0, 255, 0))
-            draw_text(img, f"Level {current_level}/{level_limit}", (20, 80), (255, 0, 0))
-            draw_text(img, f"Time: {remaining}s", (frame_width - 180, 40), (0, 0, 255))
-
-            cv2.imshow("💧 Catch the Droplets", img)
-            key = cv2.waitKey(30) & 0xFF
-            if key in [27, ord('q')]:
-                current_level = level_limit + 1
-                break
-
-        current_level += 1
-
-    cap.release()
+    game = CatchDropletsGame(score, level_limit=level_limit, level_time=level_time)
+    run_game(game, cap, tracker)
+
+    if owns_cap:
+        cap.release()
     cv2.destroyAllWindows()
     score.save_score("CatchDroplets")
-    save_scores_to_json(score, game_name="CatchDroplets")
 
     game_over_screen(score.score)
     print("Final Summary:", score.get_summary())
     return score.score
 
 if __name__ == "__main__":
-    run_catch_droplets()
\ No newline at end of file
+    run_catch_droplets(source=source_from_args())
@@ -3,12 +3,13 @@ import numpy as np
 import random
 import time
 import sys, os
-import json
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from handtracking.HandTracking import HandTracker
 from utils.scoring import ScoreTracker
 from utils.ui_helper import draw_text
+from utils.frame_source import FrameSource, source_from_args
+from games.game_loop import Game, run_game
 from utils.settings import *
 
 
@@ -26,34 +27,6 @@ class ColorDot:
     def draw(self, img):
         cv2.circle(img, (self.x, self.y), self.radius, self.color, -1)
 
-def check_touch(finger_pos, dot):
-    if finger_pos is None:
-        return False
-    return np.linalg.norm(np.array(finger_pos) - np.array((dot.x, dot.y))) <= dot.radius
-
-def save_scores_to_json(score_tracker, reaction_times=None, game_name="SequenceColorMatch"):
-   
-    save_path = os.path.join(os.path.dirname(__file__), "utils", "scores.json")
-    os.makedirs(os.path.dirname(save_path), exist_ok=True)
-    data = score_tracker.get_summary()
-    data["game"] = game_name
-    if reaction_times:
-        data["avg_reaction_time"] = round(np.mean(reaction_times), 3)
-
-    if os.path.exists(save_path):
-        try:
-            with open(save_path, "r") as f:
-                all_scores = json.load(f)
-        except json.JSONDecodeError:
-            all_scores = []
-    else:
-        all_scores = []
-
-    all_scores.append(data)
-    with open(save_path, "w") as f:
-        json.dump(all_scores, f, indent=4)
-    print(f"💾 Score saved to {save_path}")
-
 def game_over_screen(final_score):
     img = np.zeros((WINDOW_HEIGHT, WINDOW_WIDTH, 3), np.uint8)
     draw_text(img, "GAME OVER", (180, 250), (0, 255, 255), 1.2, 3)
@@ -63,101 +36,116 @@ def game_over_screen(final_score):
     cv2.waitKey(2500)
     cv2.destroyAllWindows()
 
-def run_sequence_color_match(level_limit=3, sequence_length=5):
-    cap = cv2.VideoCapture(0, cv2.CAP_DSHOW)
-    cap.set(3, WINDOW_WIDTH)
-    cap.set(4, WINDOW_HEIGHT)
-
-    tracker = HandTracker(max_hands=1)
-    score = ScoreTracker("Player1")
-    reaction_times = [] 
+class SequenceColorMatchGame(Game):
+    name = "SequenceColorMatch"
+    title = "Sequence Color Match"
 
-    current_level = 1
-    print("Sequence Color Match — Touch the colors in the correct order.")
-    print("Press ESC or Q to quit.")
+    def __init__(self, score, level_limit=3, sequence_length=5):
+        super().__init__(score)
+        self.level_limit = level_limit
+        self.sequence_length = sequence_length
+        self.reaction_times = []
+        self.current_level = 1
+        self.start_level()
 
-    while current_level <= level_limit:
-    
-        sequence = random.choices(FINGER_COLORS, k=sequence_length)
-        dots = []
+    def start_level(self):
+        self.sequence = random.choices(FINGER_COLORS, k=self.sequence_length)
+        self.dots = []
 
         margin = 150
         y_pos = WINDOW_HEIGHT // 2
-        total_dots = sequence_length * 2  
+        total_dots = self.sequence_length * 2
         for i in range(total_dots):
             x = margin + i * (WINDOW_WIDTH - 2 * margin) // total_dots
             if i % 2 == 0:
-                color = sequence[i // 2]  
+                color = self.sequence[i // 2]
+            else:
+                color = random.choice([c for c in FINGER_COLORS if c != self.sequence[i // 2]])
+            self.dots.append(ColorDot(x, y_pos, color))
+        #positions and colours as arrays so a touch is one hit-test over every dot
+        self.dot_pos = np.array([(dot.x, dot.y) for dot in self.dots], np.float32)
+        self.dot_radius = np.array([dot.radius for dot in self.dots], np.float32)
+        self.dot_colors = np.array([dot.color for dot in self.dots])
+        self.dot_open = np.ones(len(self.dots), bool)
+
+        self.current_index = 0
+        self.level_start_time = time.time()
+        self.move_start_time = time.time()
+
+    def update(self, img, hand):
+        for dot in self.dots:
+            if not dot.selected:
+                dot.draw(img)
+
+        #any raised finger arms the index fingertip
+        if hand is not None and self.gestures.counts[0] > 0:
+            index_tip = (int(hand[8, 1]), int(hand[8, 2]))
+            required_color = self.sequence[self.current_index]
+            d = np.hypot(*(self.dot_pos - index_tip).T)
+            hits = self.dot_open & (d <= self.dot_radius) & (self.dot_colors == required_color).all(axis=1)
+            if hits.any():
+                i = int(np.argmax(hits))
+                self.dots[i].selected = True
+                self.dot_open[i] = False
+                self.score.add_points(10)
+                self.current_index += 1
+
+                reaction_time = time.time() - self.move_start_time
+                self.reaction_times.append(reaction_time)
+                self.log_event("reaction", round(reaction_time, 3))
+                self.move_start_time = time.time()
+
+        hud = self.hud
+        hud.text("level", f"Level {self.current_level}/{self.level_limit}", (30, 50), GREEN)
+        hud.text("score", f"Score: {self.score.score}", (30, 90), BLUE)
+        hud.text("next", "Next Dot:", (30, 130), YELLOW)
+
+        if self.current_index < self.sequence_length:
+            next_color = self.sequence[self.current_index]
+            cv2.circle(img, (150, 160), 30, next_color, -1)
+
+        if self.reaction_times:
+            hud.text("reaction", f"Last Reaction Time: {self.reaction_times[-1]:.2f}s", (30, 200), PURPLE, 0.7)
+
+        if self.current_index >= self.sequence_length:
+            print(f"Level {self.current_level} completed!")
+            self.current_level += 1
+            if self.current_level > self.level_limit:
+                self.done = True
             else:
-                color = random.choice([c for c in FINGER_COLORS if c != sequence[i // 2]]) 
-            dots.append(ColorDot(x, y_pos, color))
-
-        current_index = 0
-        level_start_time = time.time() 
-        move_start_time = time.time()   
-
-        while current_index < sequence_length:
-            success, frame = cap.read()
-            if not success:
-                break
-
-            frame = cv2.flip(frame, 1)
-            img = tracker.find_hands(frame, draw=True)
-            lm_list = tracker.find_position(img, draw=False)
-
-            for dot in dots:
-                if not dot.selected:
-                    dot.draw(img)
-
-            if lm_list:
-                fingers = tracker.fingers_up(lm_list)
-                index_tip = tuple(lm_list[8][1:3])
-                required_color = sequence[current_index]
-
-                for i, finger_state in enumerate(fingers):
-                    if finger_state == 1:
-                        for dot in dots:
-                            if not dot.selected and dot.color == required_color and check_touch(index_tip, dot):
-                                dot.selected = True
-                                score.add_points(10)
-                                current_index += 1
-
-                                reaction_time = time.time() - move_start_time
-                                reaction_times.append(reaction_time)
-                                move_start_time = time.time() 
-                                break
-                        break 
-
-            draw_text(img, f"Level {current_level}/{level_limit}", (30, 50), GREEN)
-            draw_text(img, f"Score: {score.score}", (30, 90), BLUE)
-            draw_text(img, f"Next Dot:", (30, 130), YELLOW)
-
-            if current_index < sequence_length:
-                next_color = sequence[current_index]
-                cv2.circle(img, (150, 160), 30, next_color, -1) 
-
-            if reaction_times:
-                draw_text(img, f"Last Reaction Time: {reaction_times[-1]:.2f}s", (30, 200), PURPLE, 0.7)
-
-            cv2.imshow("Sequence Color Match", img)
-            key = cv2.waitKey(30) & 0xFF
-            if key in [27, ord('q')]:
-                current_level = level_limit + 1
-                break
-
-        print(f"Level {current_level} completed!")
-        current_level += 1
-
-    cap.release()
+                self.start_level()
+
+    def avg_reaction_time(self):
+        if not self.reaction_times:
+            return None
+        return round(float(np.mean(self.reaction_times)), 3)
+
+
+def run_sequence_color_match(level_limit=3, sequence_length=5, source=0, cap=None, tracker=None):
+    #the menu passes its camera and tracker in, standalone runs open their own
+    owns_cap = cap is None
+    if owns_cap:
+        cap = FrameSource(source, WINDOW_WIDTH, WINDOW_HEIGHT, api=cv2.CAP_DSHOW)
+    if tracker is None:
+        tracker = HandTracker(max_hands=1)
+    score = ScoreTracker("Player1")
+
+    print("Sequence Color Match — Touch the colors in the correct order.")
+    print("Press ESC or Q to quit.")
+
+    game = SequenceColorMatchGame(score, level_limit=level_limit, sequence_length=sequence_length)
+    run_game(game, cap, tracker)
+
+    if owns_cap:
+        cap.release()
     cv2.destroyAllWindows()
-    score.save_score("SequenceColorMatch")
-    save_scores_to_json(score, reaction_times=reaction_times, game_name="SequenceColorMatch")
+    score.save_score("SequenceColorMatch", avg_time=game.avg_reaction_time())
     game_over_screen(score.score)
     print("Final Summary:", score.get_summary())
-    if reaction_times:
-        print("Average Reaction Time: {:.2f} sec".format(np.mean(reaction_times)))
+    if game.reaction_times:
+        print("Average Reaction Time: {:.2f} sec".format(np.mean(game.reaction_times)))
     return score.score
         
 
 if __name__ == "__main__":
-    run_sequence_color_match()
+    run_sequence_color_match(source=source_from_args())
@@ -1,19 +1,26 @@
 import cv2
 import numpy as np
 import random
-import sys, os, json
+import sys, os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from handtracking.HandTracking import HandTracker
+from handtracking.gestures import PRESS, RELEASE
 from utils.scoring import ScoreTracker
 from utils.ui_helper import draw_text
+from utils.shape_similarity import make_scorer, make_live_accuracy, final_points
+from utils.stroke_layer import StrokeLayer
+from utils.stroke_buffer import StrokeBuffer
+from utils.geometry import LevelPathCache, interpolate_polygon
+from utils.frame_source import FrameSource, source_from_args
+from games.game_loop import Game, run_game
 from utils.settings import *
 
 
-def generate_shape(level):
+def generate_shape(level, frame_size=(WINDOW_WIDTH, WINDOW_HEIGHT)):
 
-    cx, cy = WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2
+    cx, cy = frame_size[0] // 2, frame_size[1] // 2
     offset_x = 150
     offset_y = 100
 
@@ -42,72 +49,30 @@ def generate_shape(level):
 
 
 def interpolate_path(points, step=5):
-    dense_path = []
-    for i in range(len(points)):
-        start = np.array(points[i])
-        end = np.array(points[(i + 1) % len(points)])  
-        vec = end - start
-        dist = np.linalg.norm(vec)
-        num_steps = max(int(dist / step), 1)
-        for j in range(num_steps):
-            dense_path.append(tuple((start + vec * (j / num_steps)).astype(int)))
-    return dense_path
+    return interpolate_polygon(points, step)
 
 
-def calculate_accuracy(drawn_points, ideal_points, max_dist=50):
-    if not drawn_points:
-        return 0
+#the dots are joined in order without a closing edge, order-aware metrics score against this path
+def dot_path(points, step=5):
+    return interpolate_polygon(points, step, closed=False)
 
-    total_score = 0
-    for dp in drawn_points:
-        min_dist = min(np.linalg.norm(np.array(dp) - np.array(ip)) for ip in ideal_points)
-        total_score += max(0, 1 - min_dist / max_dist)
 
-    accuracy = (total_score / len(drawn_points)) * 100
-    return round(accuracy, 2)
+#levels 1-3 are fixed shapes, their ideal path and scorer are built once
+LEVEL_PATHS = LevelPathCache(generate_shape, interpolate_path, fixed_levels=3)
 
 
-def resample_points(points, step=5):
-    if not points:
-        return []
-
-    resampled = [points[0]]
-    for p in points[1:]:
-        if np.linalg.norm(np.array(p) - np.array(resampled[-1])) >= step:
-            resampled.append(p)
-    return resampled
-
-
-def draw_accuracy_meter(img, accuracy):
+def draw_accuracy_meter(hud, accuracy):
     bar_x, bar_y = 30, 120
     bar_width, bar_height = 300, 25
 
-    cv2.rectangle(img, (bar_x, bar_y), (bar_x + bar_width, bar_y + bar_height), (80, 80, 80), -1)
+    hud.rect("meter_bg", (bar_x, bar_y), (bar_x + bar_width, bar_y + bar_height), (80, 80, 80), -1)
     color = (0, 255, 0) if accuracy > 80 else (0, 255, 255) if accuracy > 50 else (0, 0, 255)
     fill_width = int((accuracy / 100) * bar_width)
-    cv2.rectangle(img, (bar_x, bar_y), (bar_x + fill_width, bar_y + bar_height), color, -1)
-    cv2.rectangle(img, (bar_x, bar_y), (bar_x + bar_width, bar_y + bar_height), WHITE, 2)
-    draw_text(img, f"Accuracy: {accuracy:.1f}%", (bar_x + 10, bar_y - 10), WHITE, 0.6, 2)
-
-
-def save_scores_to_json(score_tracker):
-    save_path = os.path.join(os.path.dirname(__file__), "utils", "scores.json")
-    os.makedirs(os.path.dirname(save_path), exist_ok=True)
-    data = score_tracker.get_summary()
-
-    if os.path.exists(save_path):
-        try:
-            with open(save_path, "r") as f:
-                all_scores = json.load(f)
-        except json.JSONDecodeError:
-            all_scores = []
-    else:
-        all_scores = []
+    hud.rect("meter_fill", (bar_x, bar_y), (bar_x + fill_width, bar_y + bar_height), color, -1)
+    hud.rect("meter_frame", (bar_x, bar_y), (bar_x + bar_width, bar_y + bar_height), WHITE, 2)
+    hud.text("meter_text", f"Accuracy: {accuracy:.1f}%", (bar_x + 10, bar_y - 10), WHITE, 0.6, 2)
+
 
-    all_scores.append(data)
-    with open(save_path, "w") as f:
-        json.dump(all_scores, f, indent=4)
-    print(f"Score saved to {save_path}")
 
 
 def game_over_screen(final_score):
@@ -120,111 +85,121 @@ def game_over_screen(final_score):
     cv2.destroyAllWindows()
 
 
-def run_connect_dots():
-    cap = cv2.VideoCapture(0, cv2.CAP_DSHOW)
-    cap.set(3, WINDOW_WIDTH)
-    cap.set(4, WINDOW_HEIGHT)
-
-    tracker = HandTracker(max_hands=1)
-    score = ScoreTracker("Player1")
-
-    level_limit = 3
-    drawn_path = []
-    current_level = 1
-    points = generate_shape(current_level)
-    accuracy = 0
-    last_pos = None
-
-    print("Connect the Dots — Raise 1 finger to draw, 2 fingers to move freely.")
-    print("Press SPACE after each shape to check accuracy or ESC to quit.")
-
-    while True:
-        success, frame = cap.read()
-        if not success:
-            break
-
-        frame = cv2.flip(frame, 1)
-        img = tracker.find_hands(frame, draw=True)
-        lm_list = tracker.find_position(img, draw=False)
-
+class ConnectDotsGame(Game):
+    name = "ConnectDots"
+    title = "Connect the Dots (Drawing)"
+
+    def __init__(self, score, level_limit=3, metric=PATH_METRIC):
+        super().__init__(score)
+        self.level_limit = level_limit
+        self.metric = metric
+        self.current_level = 1
+        self.stroke_layer = StrokeLayer(GREEN, 2)
+        self.drawn_path = StrokeBuffer()  #measured fingertip points, pen-up between strokes
+        #strokes run while the index finger alone is up, debounced so a flicker does not break them
+        self.drawing = False
+        self.gestures.subscribe(PRESS, self.start_stroke, gesture=1)
+        self.gestures.subscribe(RELEASE, self.end_stroke, gesture=1)
+        self.start_level()
+
+    def start_level(self):
+        level = LEVEL_PATHS.get(self.current_level)
+        self.points = level.points
+        self.scorer = make_scorer(dot_path(self.points), self.metric, nearest=level.scorer)
+        self.live_accuracy = make_live_accuracy(self.scorer)
+        self.stroke_layer.clear()
+        self.drawn_path.clear()
+        self.last_pos = None
+        self.accuracy = 0
+        #dot numbers only change with the level
+        self.hud.clear()
+        for i, p in enumerate(self.points):
+            self.hud.text(f"dot{i}", str(i + 1), (p[0] - 10, p[1] - 30), WHITE)
+
+    def start_stroke(self, event):
+        self.drawing = True
+        self.last_pos = None
+
+    def end_stroke(self, event):
+        self.drawing = False
+        self.last_pos = None
+        self.drawn_path.pen_up()
+
+    def update(self, img, hand):
         # Draw guide shape
+        points = self.points
         for i, p in enumerate(points):
             cv2.circle(img, p, 12, YELLOW, -1)
             if i > 0:
                 cv2.line(img, points[i - 1], points[i], (100, 100, 255), 2)
-            draw_text(img, str(i + 1), (p[0] - 10, p[1] - 30), WHITE)
-
-        drawing_enabled = False
 
-        if lm_list:
-            fingers_state = tracker.fingers_up(lm_list)
-            fingers = sum(fingers_state)
-            index_tip = tuple(lm_list[8][1:3])
+        if hand is not None:
+            index_tip = (int(hand[8, 1]), int(hand[8, 2]))
             cv2.circle(img, index_tip, 6, PURPLE, -1)
 
-            if fingers == 1:
-                drawing_enabled = True
-            else:
-                drawing_enabled = False
-                last_pos = None
+            if self.drawing:
+                if self.last_pos is not None:
+                    cv2.line(img, self.last_pos, index_tip, GREEN, 3)
+                    self.stroke_layer.add_segment(self.last_pos, index_tip, img.shape)
+                    #predicted points keep the stroke continuous but only measured ones are scored
+                    if not self.predicted:
+                        self.drawn_path.append(index_tip)
+                        self.accuracy = self.live_accuracy.add(index_tip)
+                self.last_pos = index_tip
 
-            if drawing_enabled:
-                if last_pos is not None:
-                    cv2.line(img, last_pos, index_tip, GREEN, 3)
-                    drawn_path.append(index_tip)
-                last_pos = index_tip
+        self.stroke_layer.composite(img)
 
-        if len(drawn_path) > 1:
-            for i in range(1, len(drawn_path)):
-                cv2.line(img, drawn_path[i - 1], drawn_path[i], GREEN, 2)
+        draw_accuracy_meter(self.hud, self.accuracy)
+        self.hud.text("level", f"Level {self.current_level}/{self.level_limit}", (30, 50), GREEN)
+        self.hud.text("score", f"Score: {self.score.score}", (30, 90), BLUE)
 
-        if len(drawn_path) > 0 and len(drawn_path) % 20 == 0:
-            dense_points = interpolate_path(points)
-            accuracy = calculate_accuracy(drawn_path, dense_points)
+    def handle_key(self, key):
+        if key in [ord('n'), 32]:
+            self.finish_level()
+        else:
+            super().handle_key(key)
+
+    def finish_level(self):
+        if self.drawn_path:
+            self.accuracy = self.live_accuracy.reconcile(final_points(self.scorer, self.drawn_path))
+            self.score.add_points(int(self.accuracy))
+            print(f"Level {self.current_level} accuracy: {self.accuracy}%")
+            self.log_event("level", {"level": self.current_level, "accuracy": self.accuracy})
+
+        # Move to next level
+        self.current_level += 1
+        if self.current_level > self.level_limit:
+            self.done = True
+            return
+
+        self.start_level()
+        # Show "Next Level" screen for 1 second
+        self.transition = f"Starting Level {self.current_level}..."
+
+
+def run_connect_dots(source=0, cap=None, tracker=None):
+    #the menu passes its camera and tracker in, standalone runs open their own
+    owns_cap = cap is None
+    if owns_cap:
+        cap = FrameSource(source, WINDOW_WIDTH, WINDOW_HEIGHT, api=cv2.CAP_DSHOW)
+    if tracker is None:
+        tracker = HandTracker(max_hands=1)
+    score = ScoreTracker("Player1")
 
-        draw_accuracy_meter(img, accuracy)
-        draw_text(img, f"Level {current_level}/{level_limit}", (30, 50), GREEN)
-        draw_text(img, f"Score: {score.score}", (30, 90), BLUE)
+    print("Connect the Dots — Raise 1 finger to draw, 2 fingers to move freely.")
+    print("Press SPACE after each shape to check accuracy or ESC to quit.")
 
-        cv2.imshow("Connect the Dots (Drawing)", img)
-        key = cv2.waitKey(30) & 0xFF
+    game = ConnectDotsGame(score)
+    run_game(game, cap, tracker)
 
-        if key in [ord('n'), 32]:
-            if drawn_path:
-                    resampled_path = resample_points(drawn_path, step=5)
-                    dense_points = interpolate_path(points)
-                    accuracy = calculate_accuracy(resampled_path, dense_points)
-                    score.add_points(int(accuracy))
-                    print(f"Level {current_level} accuracy: {accuracy}%")
-                
-                # Move to next level
-            current_level += 1
-            if current_level > level_limit:
-                break
-
-                # Prepare next level
-            points = generate_shape(current_level)
-            drawn_path = []
-            last_pos = None
-            accuracy = 0
-
-                # Show "Next Level" screen for 1 second
-            img[:] = 0
-            draw_text(img, f"Starting Level {current_level}...", (200, 300), GREEN, 1.0, 2)
-            cv2.imshow("✏️ Connect the Dots (Drawing)", img)
-            cv2.waitKey(1000)
-
-        elif key in [27, ord('q')]:
-            break
-
-    cap.release()
+    if owns_cap:
+        cap.release()
     cv2.destroyAllWindows()
     score.save_score("ConnectDots")
-    save_scores_to_json(score)
     game_over_screen(score.score)
     print("Final Summary:", score.get_summary())
     return score.score
 
 
 if __name__ == "__main__":
-    run_connect_dots()
+    run_connect_dots(source=source_from_args())
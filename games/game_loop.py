@@ -0,0 +1,226 @@
+import time
+
+import cv2
+import numpy as np
+
+from handtracking.gestures import GestureEngine, PRESS, RELEASE
+from handtracking.recording import SessionRecorder, session_directory
+from utils.ui_helper import draw_text
+from utils.hud_layer import HudLayer
+from utils.game_clock import FixedStepClock
+from utils.frame_pacer import FramePacer
+from utils.profiler import StageProfiler
+from utils.telemetry import TelemetryWriter, JitterMeter
+from utils.settings import GREEN, PROFILE_STAGES, PROFILE_DIR, RECORD_SESSIONS, RECORDINGS_DIR, TELEMETRY, TELEMETRY_DIR
+
+
+#per-frame game logic, kept free of camera and window code so it can run headless
+class Game:
+    name = "Game"
+    title = "Game"
+    predicted = False  #set by run_game when the hand came from the tracker's filter instead of inference
+
+    #clock drives the fixed-step simulation, inject one with a ManualTime to run faster than real time
+    def __init__(self, score, clock=None):
+        self.score = score
+        self.done = False
+        self.transition = None  #text shown full screen for a second between levels
+        self.clock = clock or FixedStepClock()
+        self.hud = HudLayer()  #labels, scores and meters, composited by run_game after update
+        self.gestures = GestureEngine()  #updated by run_game with the selected hands before update
+        self.telemetry = None  #TelemetryWriter set by run_game while telemetry is on
+
+    def update(self, img, hand):
+        raise NotImplementedError
+
+    #what update() gets from the tracker's hands, multi-player games return one hand per player
+    def select_hands(self, hands, tracker):
+        return hands[0] if len(hands) else None
+
+    #runs the simulation steps that are due, called once per rendered frame
+    def simulate(self):
+        for _ in range(self.clock.advance()):
+            self.step(self.clock.tick())
+
+    def step(self, dt):
+        pass
+
+    def handle_key(self, key):
+        if key in [27, ord('q')]:
+            self.done = True
+
+    def avg_reaction_time(self):
+        return None
+
+    #game events for the telemetry stream (reactions, pops, ...), dropped when telemetry is off
+    def log_event(self, name, value=None):
+        if self.telemetry is not None:
+            self.telemetry.event(name, value)
+
+
+#per-frame fingertip, finger states and jitter of every hand slot the game's gesture engine tracks,
+#plus its debounced press / release events
+class _GameTelemetry:
+    def __init__(self, game, writer):
+        self.writer = writer
+        self.gestures = game.gestures
+        self.jitter = [JitterMeter() for _ in range(self.gestures.max_hands)]
+        self.subscriptions = [self.gestures.subscribe(kind, self.gesture_event) for kind in (PRESS, RELEASE)]
+
+    def gesture_event(self, event):
+        self.writer.event(event.kind, {"gesture": event.gesture, "hand": event.hand,
+                                       "duration": round(event.duration, 3)})
+
+    def frame(self, frame, predicted):
+        gestures = self.gestures
+        for i, meter in enumerate(self.jitter):
+            if gestures.present[i]:
+                tip = tuple(gestures.index_tips[i].tolist())
+                self.writer.frame(frame, i, tip, gestures.fingers[i].tolist(), meter.update(tip), predicted)
+            else:
+                self.writer.frame(frame, i, None, None, meter.update(None), predicted)
+
+    def close(self):
+        for subscription in self.subscriptions:
+            self.gestures.unsubscribe(subscription)
+
+
+def show_transition(img, title, text):
+    img[:] = 0
+    draw_text(img, text, (200, 300), GREEN, 1.0, 2)
+    cv2.imshow(title, img)
+    cv2.waitKey(1000)
+
+
+#drives a game from a frame source and a hand tracker until it is done
+#telemetry is a bool or a TelemetryWriter the caller owns and closes, station is the index of a
+#concurrent station and keeps its recording and telemetry apart from the others'
+def run_game(game, cap, tracker, display=True, max_frames=None, frame_times=None, profiler=None,
+             record=RECORD_SESSIONS, pacer=None, telemetry=TELEMETRY, station=None):
+    if profiler is None:
+        profiler = StageProfiler(enabled=PROFILE_STAGES)
+    if pacer is None:
+        pacer = FramePacer()
+    old_profiler = tracker.profiler
+    tracker.profiler = profiler
+    prof = profiler
+    try:
+        owns_recorder = record and tracker.recorder is None
+        if owns_recorder:
+            tracker.recorder = SessionRecorder(session_directory(RECORDINGS_DIR, game.name, station),
+                                               max_hands=tracker.max_hands, meta={"game": game.name})
+        tracker.record_event("start")
+        last_score = game.score.score
+
+        owns_telemetry = telemetry is True
+        if owns_telemetry:
+            telemetry = TelemetryWriter(session_directory(TELEMETRY_DIR, game.name, station),
+                                        meta={"game": game.name, "player": game.score.player_name})
+        game_telemetry = None
+        if telemetry:
+            game.telemetry = telemetry
+            game_telemetry = _GameTelemetry(game, telemetry)
+            telemetry.event("start")
+
+        frames = 0
+        while not game.done:
+            t = prof.start()
+            success, frame = cap.read()
+            prof.stop("capture", t)
+            if not success:
+                print("❌ Camera read error")
+                break
+
+            start = time.perf_counter()
+            t = prof.start()
+            frame = cv2.flip(frame, 1)
+            prof.stop("flip", t)
+
+            img = tracker.find_hands(frame, draw=True)
+            if tracker.finished:
+                break
+            t = prof.start()
+            hands = tracker.find_landmarks(img)
+            prof.stop("landmarks", t)
+
+            t = prof.start()
+            selected = game.select_hands(hands, tracker)
+            game.gestures.update(selected)
+            prof.stop("gestures", t)
+
+            t = prof.start()
+            game.predicted = tracker.predicted
+            game.update(img, selected)
+            prof.stop("update", t)
+            t = prof.start()
+            game.hud.composite(img)
+            prof.stop("hud", t)
+            if game.score.score != last_score:
+                last_score = game.score.score
+                tracker.record_event("score", last_score)
+                game.log_event("score", last_score)
+            if game_telemetry is not None:
+                t = prof.start()
+                game_telemetry.frame(frames, game.predicted)
+                prof.stop("telemetry", t)
+            prof.draw_overlay(img)
+
+            if display:
+                t = prof.start()
+                cv2.imshow(game.title, img)
+                prof.stop("imshow", t)
+                t = prof.start()
+                key = pacer.wait()
+                prof.stop("pace", t)
+                if key == ord('p'):
+                    prof.toggle_overlay()
+                if key != 255:
+                    tracker.record_event("key", key)
+                game.handle_key(key)
+                if game.transition:
+                    show_transition(img, game.title, game.transition)
+                    pacer.reset()
+            if game.transition:
+                tracker.record_event("transition")
+                game.log_event("transition", game.transition)
+            game.transition = None
+
+            if frame_times is not None:
+                frame_times.append(time.perf_counter() - start)
+            prof.stop("frame", start)
+            frames += 1
+            if max_frames is not None and frames >= max_frames:
+                break
+
+        tracker.record_event("end", game.score.score)
+        if game_telemetry is not None:
+            game.log_event("end", game.score.score)
+            game_telemetry.close()
+            game.telemetry = None
+        if owns_telemetry:
+            stats = telemetry.close()
+            print(f"📈 Telemetry written to {telemetry.directory} ({stats['written']} records, {stats['dropped']} dropped)")
+        if owns_recorder:
+            tracker.recorder.close()
+            print(f"🎞️ Session recorded to {tracker.recorder.directory}")
+            tracker.recorder = None
+        if display:
+            pacer.report(game.name)
+        profiler.export(PROFILE_DIR, game.name)
+        return frames
+    finally:
+        tracker.profiler = old_profiler
+
+
+def frame_time_stats(frame_times):
+    times = np.asarray(frame_times) * 1000
+    if len(times) == 0:
+        return {"frames": 0}
+    return {
+        "frames": len(times),
+        "fps": round(1000 / times.mean(), 1),
+        "mean_ms": round(float(times.mean()), 3),
+        "p50_ms": round(float(np.percentile(times, 50)), 3),
+        "p95_ms": round(float(np.percentile(times, 95)), 3),
+        "p99_ms": round(float(np.percentile(times, 99)), 3),
+    }
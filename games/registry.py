@@ -0,0 +1,24 @@
+import importlib
+from collections import namedtuple
+
+#function runs the game with its own window, game_class is the headless Game for other loops
+GameEntry = namedtuple("GameEntry", ["name", "module", "function", "game_class"])
+
+#number of fingers raised in the menu -> game
+GAME_REGISTRY = {
+    1: GameEntry("ConnectDots", "games.ConnectDots", "run_connect_dots", "ConnectDotsGame"),
+    2: GameEntry("CatchDroplets", "games.CatchDroplets", "run_catch_droplets", "CatchDropletsGame"),
+    3: GameEntry("ShapeDrawing", "games.ShapeDrawing", "run_shape_drawing", "ShapeDrawingGame"),
+    4: GameEntry("BalloonPop", "games.BalloonPop", "run_balloon_pop", "BalloonPopGame"),
+    5: GameEntry("ColorMatch", "games.ColorMatch", "run_sequence_color_match", "SequenceColorMatchGame"),
+}
+
+
+def load_game(entry):
+    module = importlib.import_module(entry.module)
+    return getattr(module, entry.function)
+
+
+def load_game_class(entry):
+    module = importlib.import_module(entry.module)
+    return getattr(module, entry.game_class)
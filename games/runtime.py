@@ -0,0 +1,38 @@
+import time
+
+import numpy as np
+
+from games.registry import GAME_REGISTRY, load_game
+
+
+#runs games in-process on the menu's camera and hand tracker, then hands control back
+class GameRuntime:
+    def __init__(self, cap, tracker, registry=GAME_REGISTRY):
+        self.cap = cap
+        self.tracker = tracker
+        self.registry = registry
+        self.switch_times = []
+
+    def launch(self, finger_count):
+        entry = self.registry[finger_count]
+        print(f"Launching: {entry.name}")
+
+        start = time.perf_counter()
+        self.cap.mark()
+        run_game = load_game(entry)
+        result = run_game(cap=self.cap, tracker=self.tracker)
+
+        #time from the menu confirming until the game pulled its first frame
+        if self.cap.first_read_time is not None:
+            switch_time = self.cap.first_read_time - start
+            self.switch_times.append((entry.name, switch_time))
+            print(f"⏱ Menu -> {entry.name} switch: {switch_time * 1000:.0f} ms")
+        return result
+
+    def report(self):
+        if not self.switch_times:
+            return
+        times = np.array([t for _, t in self.switch_times]) * 1000
+        print(f"Game switches: {len(times)}, mean {times.mean():.0f} ms, max {times.max():.0f} ms")
+        for name, t in self.switch_times:
+            print(f"  {name}: {t * 1000:.0f} ms")
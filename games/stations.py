@@ -0,0 +1,104 @@
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from handtracking.HandTracking import HandTracker
+from handtracking.server import InferenceServer, RemoteHandTracker
+from games.game_loop import run_game, frame_time_stats
+from games.registry import GAME_REGISTRY, load_game_class
+from utils.frame_source import FrameSource, BLOCK, DROP_OLDEST, source_from_args
+from utils.score_store import ScoreStore
+from utils.scoring import ScoreTracker
+from utils.settings import WINDOW_WIDTH, WINDOW_HEIGHT
+
+GAMES_BY_NAME = {entry.name: entry for entry in GAME_REGISTRY.values()}
+
+
+def _run_station(index, source, game_class, server, max_frames, save, results):
+    #video files and generated frames are processed frame by frame, cameras keep only the newest frame
+    policy = DROP_OLDEST if isinstance(source, int) else BLOCK
+    cap = FrameSource(source, WINDOW_WIDTH, WINDOW_HEIGHT, buffer_size=2, drop_policy=policy)
+    tracker = RemoteHandTracker(server)
+    #sqlite connections stay in the thread that opened them
+    score = ScoreTracker(f"Station{index + 1}", store=ScoreStore() if save else None)
+    game = game_class(score)
+
+    frame_times = []
+    try:
+        run_game(game, cap, tracker, display=False, max_frames=max_frames, frame_times=frame_times,
+                 station=index)
+    finally:
+        cap.release()
+    if save:
+        score.save_score(game.name)
+
+    stats = frame_time_stats(frame_times)
+    stats["round_trip"] = tracker.latency_stats()
+    stats["capture_latency_ms"] = cap.stats()["last_latency_ms"]
+    stats["score"] = score.score
+    results[index] = stats
+
+
+#one headless game loop per stream, all sharing one InferenceServer
+#returns per-station frame and latency stats and the aggregate throughput
+def run_stations(sources, game="BalloonPop", workers=None, max_hands=1, max_frames=None, save=True,
+                 tracker_factory=HandTracker):
+    game_class = load_game_class(GAMES_BY_NAME[game])
+    server = InferenceServer(workers=workers, max_hands=max_hands, tracker_factory=tracker_factory)
+    results = [None] * len(sources)
+    threads = [threading.Thread(target=_run_station, args=(i, source, game_class, server, max_frames, save, results))
+               for i, source in enumerate(sources)]
+    start = time.perf_counter()
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        server.close()
+    elapsed = time.perf_counter() - start
+
+    frames = sum(r["frames"] for r in results if r)
+    return {
+        "streams": len(sources),
+        "workers": server.num_workers,
+        "frames": frames,
+        "throughput_fps": round(frames / elapsed, 1) if elapsed else 0.0,
+        "stations": results,
+    }
+
+
+def print_report(report):
+    print(f"{report['streams']} streams on {report['workers']} workers: "
+          f"{report['frames']} frames, {report['throughput_fps']} fps aggregate")
+    for i, stats in enumerate(report["stations"]):
+        if not stats or not stats["frames"]:
+            print(f"  station {i + 1}: no frames")
+            continue
+        rt = stats["round_trip"]
+        print(f"  station {i + 1}: {stats['fps']:>7.1f} fps  frame p50 {stats['p50_ms']:.2f} ms  "
+              f"inference round trip p50 {rt['p50_ms']:.2f} p95 {rt['p95_ms']:.2f} ms "
+              f"(in worker {rt['inference_p50_ms']:.2f} ms)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run one game per camera or video stream on a shared inference pool")
+    parser.add_argument("sources", nargs="+", help='camera indexes, video files or "synthetic"')
+    parser.add_argument("--game", default="BalloonPop", choices=list(GAMES_BY_NAME))
+    parser.add_argument("--workers", type=int, help="inference processes, one per CPU by default")
+    parser.add_argument("--max-hands", type=int, default=1)
+    parser.add_argument("--frames", type=int, help="stop each station after this many frames")
+    parser.add_argument("--no-save", action="store_true", help="do not store the stations' scores")
+    args = parser.parse_args(argv)
+
+    sources = [source_from_args([s]) for s in args.sources]
+    report = run_stations(sources, args.game, args.workers, args.max_hands, args.frames, save=not args.no_save)
+    print_report(report)
+
+
+if __name__ == "__main__":
+    main()
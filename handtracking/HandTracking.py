@@ -1,9 +1,40 @@
 import cv2
 import mediapipe as mp
+import numpy as np
 import math
+import time
+
+from handtracking.filters import OneEuroFilter
+from utils.profiler import DISABLED_PROFILER
+from utils.settings import INFERENCE_WIDTH, USE_ROI_INFERENCE, INFER_EVERY, INFER_INTERVAL_MS, LANDMARK_SMOOTHING
+
+NUM_LANDMARKS = 21
+TIP_IDS = np.array([4, 8, 12, 16, 20])  # Thumb, Index, Middle, Ring, Pinky
+HANDEDNESS = {"Left": 0, "Right": 1}
+
+
+#works on a single hand (21, 3) or a batch (hands, 21, 3) of (id, x, y) pixel landmarks
+def fingers_up_array(landmarks):
+    landmarks = np.asarray(landmarks)
+    tips = landmarks[..., TIP_IDS, :]
+    states = np.empty(landmarks.shape[:-2] + (5,), np.uint8)
+    #thumb compares x with the joint below it, the other fingers compare y two joints down
+    states[..., 0] = tips[..., 0, 1] < landmarks[..., TIP_IDS[0] - 1, 1]
+    states[..., 1:] = tips[..., 1:, 2] < landmarks[..., TIP_IDS[1:] - 2, 2]
+    return states
+
+
+def count_fingers_array(landmarks):
+    return fingers_up_array(landmarks).sum(axis=-1)
+
 
 class HandTracker:
-    def __init__(self, mode=False, max_hands=2, detection_confidence=0.7, tracking_confidence=0.7):
+    #inference_width downscales what mediapipe sees, use_roi crops around the last hand position
+    #infer_every / infer_interval_ms run mediapipe on every Nth frame or at most once per interval,
+    #frames in between get landmarks predicted by the motion filter and set self.predicted
+    def __init__(self, mode=False, max_hands=2, detection_confidence=0.7, tracking_confidence=0.7,
+                 inference_width=INFERENCE_WIDTH, use_roi=USE_ROI_INFERENCE, roi_padding=0.35, roi_refresh=30,
+                 infer_every=INFER_EVERY, infer_interval_ms=INFER_INTERVAL_MS, smoothing=LANDMARK_SMOOTHING):
         self.mode = mode
         self.max_hands = max_hands
         self.detection_confidence = detection_confidence
@@ -17,67 +48,253 @@ class HandTracker:
             min_tracking_confidence=self.tracking_confidence
         )
         self.mpDraw = mp.solutions.drawing_utils
+        self._init_landmark_buffers(max_hands)
+
+        self.inference_width = inference_width
+        self.use_roi = use_roi
+        self.roi_padding = roi_padding
+        self.roi_refresh = roi_refresh
+        self.roi = None  #(x0, y0, x1, y1) in pixels, None means search the full frame
+        self.frames_since_full_search = 0
+        #crops move and change size every frame while video-mode tracking keeps its state in the
+        #previous input's coordinates, so crops go through their own static-image instance
+        self.crop_hands = self.mpHands.Hands(
+            static_image_mode=True,
+            max_num_hands=self.max_hands,
+            min_detection_confidence=self.detection_confidence,
+            min_tracking_confidence=self.tracking_confidence
+        ) if use_roi else None
+        self.last_was_crop = False
+
+        self.infer_every = max(1, infer_every)
+        self.infer_interval = infer_interval_ms / 1000 if infer_interval_ms else None
+        self.smoothing = smoothing
+        #the filter is also needed without smoothing, its velocity drives the prediction
+        if smoothing or self.infer_every > 1 or self.infer_interval:
+            self.filter = OneEuroFilter()
+        self.frames_since_inference = 0
+        self.last_inference = 0.0
+
+    #shared with trackers that produce landmarks without mediapipe
+    def _init_landmark_buffers(self, max_hands):
+        self.max_hands = max_hands
         self.tipIds = [4, 8, 12, 16, 20]  # Thumb, Index, Middle, Ring, Pinky
         self.results = None
         self.last_lm_list = []  #last valid landmarks
 
+        #preallocated landmark frames, rows are reused every frame
+        self.landmarks_norm = np.zeros((max_hands, NUM_LANDMARKS, 3), np.float32)  #x, y, z in [0, 1]
+        self.landmarks_px = np.zeros((max_hands, NUM_LANDMARKS, 3), np.int32)  #id, cx, cy
+        self.landmarks_px[:, :, 0] = np.arange(NUM_LANDMARKS)
+        self.handedness = np.full(max_hands, -1, np.int8)  #0 left, 1 right, -1 unknown
+        self.num_hands = 0
+        self.profiler = DISABLED_PROFILER
+        self.recorder = None  #SessionRecorder, every frame is appended to it when set
+        self.finished = False  #only replayed input runs out
+        self._frame_pending = False
+
+        self.filter = None
+        self.predicted = False  #True when the current landmarks came from the filter, not from inference
+        self._fresh_results = False
+
    
   
    
     def find_hands(self, img, draw=True):
-        img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        self.results = self.hands.process(img_rgb)
+        prof = self.profiler
+        now = time.perf_counter()
+        self._frame_pending = True
+        if self._skip_inference(now):
+            t = prof.start()
+            self._predict(now)
+            self._pixel_landmarks(img, draw)
+            prof.stop("predict", t)
+            return img
+
+        self.predicted = False
+        self.frames_since_inference = 0
+        self.last_inference = now
+        h, w = img.shape[:2]
+        x0, y0, x1, y1 = self._search_region(w, h)
+
+        t = prof.start()
+        crop = img[y0:y1, x0:x1]
+        if self.inference_width and crop.shape[1] > self.inference_width:
+            scale = self.inference_width / crop.shape[1]
+            crop = cv2.resize(crop, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        img_rgb = cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)
+        prof.stop("cvtColor", t)
+
+        t = prof.start()
+        cropped = (x0, y0, x1, y1) != (0, 0, w, h)
+        if cropped:
+            hands = self.crop_hands
+        else:
+            hands = self.hands
+            if self.last_was_crop:
+                #what it tracked is from before the crops
+                hands.reset()
+        self.last_was_crop = cropped
+        self.results = hands.process(img_rgb)
+        prof.stop("inference", t)
 
+        if self.results.multi_hand_landmarks and cropped:
+            self._remap_landmarks(x0, y0, x1 - x0, y1 - y0, w, h)
+        if self.use_roi:
+            self._update_roi(w, h)
+        self._fresh_results = True
+
+        t = prof.start()
         if self.results.multi_hand_landmarks:
             for handLms in self.results.multi_hand_landmarks:
                 if draw:
                     self.mpDraw.draw_landmarks(img, handLms, self.mpHands.HAND_CONNECTIONS)
+        prof.stop("draw_hands", t)
         return img
 
     
    
+    #prediction needs a hand seen by the last inference, otherwise run mediapipe
+    def _skip_inference(self, now):
+        if self.filter is None or self.num_hands == 0 or self.filter.x_prev is None:
+            return False
+        if self.infer_interval:
+            return now - self.last_inference < self.infer_interval
+        self.frames_since_inference += 1
+        return self.frames_since_inference < self.infer_every
+
+    def _predict(self, now):
+        self.predicted = True
+        predicted = self.filter.predict(now)
+        norm = self.landmarks_norm[:self.num_hands]
+        norm[:] = predicted
+        #x and y stay on screen, z is depth relative to the wrist and may be negative
+        np.clip(norm[..., :2], 0.0, 1.0, out=norm[..., :2])
+
+    def _search_region(self, w, h):
+        if not self.use_roi or self.roi is None:
+            self.frames_since_full_search = 0
+            return 0, 0, w, h
+        #look at the whole frame now and then so a second hand can enter
+        self.frames_since_full_search += 1
+        if self.frames_since_full_search >= self.roi_refresh and self.num_hands < self.max_hands:
+            self.frames_since_full_search = 0
+            return 0, 0, w, h
+        return self.roi
+
+    #landmarks come back normalized to the crop, map them to the full frame in place
+    #so drawing, find_landmarks and find_position keep working unchanged
+    def _remap_landmarks(self, x0, y0, cw, ch, w, h):
+        sx, sy = cw / w, ch / h
+        ox, oy = x0 / w, y0 / h
+        for hand in self.results.multi_hand_landmarks:
+            for lm in hand.landmark:
+                lm.x = ox + lm.x * sx
+                lm.y = oy + lm.y * sy
+
+    def _update_roi(self, w, h):
+        if not self.results.multi_hand_landmarks:
+            self.roi = None
+            return
+        xs = [lm.x for hand in self.results.multi_hand_landmarks for lm in hand.landmark]
+        ys = [lm.y for hand in self.results.multi_hand_landmarks for lm in hand.landmark]
+        bx0, bx1, by0, by1 = min(xs) * w, max(xs) * w, min(ys) * h, max(ys) * h
+        #pad by a fraction of the hand size so the next frame's hand still fits
+        pad = self.roi_padding * max(bx1 - bx0, by1 - by0) + 20
+        roi = (int(max(0, bx0 - pad)), int(max(0, by0 - pad)), int(min(w, bx1 + pad)), int(min(h, by1 + pad)))
+        self.roi = roi if roi[2] - roi[0] > 32 and roi[3] - roi[1] > 32 else None
+
+    #returns a (hands, 21, 3) view of (id, cx, cy) rows, valid until the next call
+    #on predicted frames and repeated calls the landmark buffers are already filled
+    def find_landmarks(self, img, draw=False):
+        if self._fresh_results:
+            self._fresh_results = False
+            self.num_hands = 0
+            if self.results and self.results.multi_hand_landmarks:
+                hands = self.results.multi_hand_landmarks[:self.max_hands]
+                for i, hand in enumerate(hands):
+                    self.landmarks_norm[i] = [(lm.x, lm.y, lm.z) for lm in hand.landmark]
+                self.num_hands = len(hands)
+                self._read_handedness()
+            self._filter_landmarks()
+        hands = self._pixel_landmarks(img, draw)
+        self._record_frame(img)
+        return hands
+
+    def _read_handedness(self):
+        self.handedness[:] = -1
+        for i, hand in enumerate((self.results.multi_handedness or [])[:self.num_hands]):
+            self.handedness[i] = HANDEDNESS.get(hand.classification[0].label, -1)
+
+    #once per find_hands call, repeated find_landmarks calls on the same frame are not recorded again
+    def _record_frame(self, img):
+        if self.recorder is None or not self._frame_pending:
+            return
+        self._frame_pending = False
+        self.recorder.record(self.landmarks_norm, self.num_hands, self.handedness,
+                             self.predicted, img.shape[1::-1])
+
+    def record_event(self, name, value=0.0):
+        if self.recorder is not None:
+            self.recorder.event(name, value)
+
+    def _filter_landmarks(self):
+        if self.filter is None:
+            return
+        if self.num_hands == 0:
+            self.filter.reset()
+            return
+        norm = self.landmarks_norm[:self.num_hands]
+        smoothed = self.filter(norm, self.last_inference)
+        if self.smoothing:
+            norm[:] = smoothed
+
+    def _pixel_landmarks(self, img, draw=False):
+        if self.num_hands:
+            h, w = img.shape[:2]
+            norm = self.landmarks_norm[:self.num_hands]
+            px = self.landmarks_px[:self.num_hands]
+            px[..., 1] = norm[..., 0] * w
+            px[..., 2] = norm[..., 1] * h
+
+            if draw:
+                for hand in px:
+                    for _, cx, cy in hand:
+                        cv2.circle(img, (int(cx), int(cy)), 5, (0, 255, 0), cv2.FILLED)
+        return self.landmarks_px[:self.num_hands]
+
+    def normalized_landmarks(self):
+        return self.landmarks_norm[:self.num_hands]
+
+    #list of (id, cx, cy) tuples, kept for older callers
     def find_position(self, img, hand_no=0, draw=True):
-        lm_list = []
-        if self.results and self.results.multi_hand_landmarks:
-            try:
-                hand = self.results.multi_hand_landmarks[hand_no]
-                h, w, c = img.shape
-                for id, lm in enumerate(hand.landmark):
-                    cx, cy = int(lm.x * w), int(lm.y * h)
-                    lm_list.append((id, cx, cy))
-                    if draw:
-                        cv2.circle(img, (cx, cy), 5, (0, 255, 0), cv2.FILLED)
-                self.last_lm_list = lm_list
-            except IndexError:
-                pass
+        hands = self.find_landmarks(img, draw=False)
+        if hand_no >= len(hands):
+            return []
+        lm_list = list(map(tuple, hands[hand_no].tolist()))
+        if draw:
+            for _, cx, cy in lm_list:
+                cv2.circle(img, (cx, cy), 5, (0, 255, 0), cv2.FILLED)
+        self.last_lm_list = lm_list
         return lm_list
 
     
   
    
     def fingers_up(self, lm_list):
-        fingers = []
         if len(lm_list) == 0:
-            return fingers
-
-        if lm_list[self.tipIds[0]][1] < lm_list[self.tipIds[0] - 1][1]:
-            fingers.append(1)
-        else:
-            fingers.append(0)
-
-        for id in range(1, 5):
-            if lm_list[self.tipIds[id]][2] < lm_list[self.tipIds[id] - 2][2]:
-                fingers.append(1)
-            else:
-                fingers.append(0)
-
-        return fingers
+            return []
+        if isinstance(lm_list, np.ndarray):
+            return fingers_up_array(lm_list)
+        return fingers_up_array(lm_list).tolist()
 
     def how_many_fingers_up(self, lm_list=None):
         if lm_list is None:
             lm_list = self.last_lm_list
-        fingers = self.fingers_up(lm_list)
-        return sum(fingers)
+        if len(lm_list) == 0:
+            return 0
+        counts = count_fingers_array(lm_list)
+        return int(counts) if counts.ndim == 0 else counts
 
     
 
@@ -100,5 +317,5 @@ class HandTracker:
         if lm_list is None:
             lm_list = self.last_lm_list
         if len(lm_list) > 8:
-            return (lm_list[8][1], lm_list[8][2])
+            return (int(lm_list[8][1]), int(lm_list[8][2]))
         return None
@@ -1,4 +1,4 @@
-from .HandTracking import HandTracker
+from .HandTracking import HandTracker, fingers_up_array, count_fingers_array
 
 
-__all__ = ["HandTracker"]
+__all__ = ["HandTracker", "fingers_up_array", "count_fingers_array"]
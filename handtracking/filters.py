@@ -0,0 +1,52 @@
+import math
+
+import numpy as np
+
+
+def _alpha(cutoff, dt):
+    tau = 1.0 / (2 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+#One-Euro filter over whole landmark arrays (Casiez et al. 2012)
+#slow movement gets a low cutoff (less jitter), fast movement a high one (less lag)
+#the smoothed velocity doubles as a constant-velocity predictor for skipped frames
+class OneEuroFilter:
+    def __init__(self, min_cutoff=1.5, beta=10.0, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        self.x_prev = None
+        self.dx_prev = None
+        self.t_prev = None
+
+    def __call__(self, x, t):
+        x = np.asarray(x, np.float32)
+        if self.x_prev is None or self.x_prev.shape != x.shape:
+            self.x_prev = x.copy()
+            self.dx_prev = np.zeros_like(x)
+            self.t_prev = t
+            return self.x_prev
+
+        dt = max(t - self.t_prev, 1e-6)
+        dx = (x - self.x_prev) / dt
+        a_d = _alpha(self.d_cutoff, dt)
+        dx_hat = a_d * dx + (1 - a_d) * self.dx_prev
+
+        cutoff = self.min_cutoff + self.beta * np.abs(dx_hat)
+        tau = 1.0 / (2 * np.pi * cutoff)
+        a = 1.0 / (1.0 + tau / dt)
+        x_hat = a * x + (1 - a) * self.x_prev
+
+        self.x_prev = x_hat.astype(np.float32)
+        self.dx_prev = dx_hat.astype(np.float32)
+        self.t_prev = t
+        return self.x_prev
+
+    def predict(self, t):
+        if self.x_prev is None:
+            return None
+        return self.x_prev + self.dx_prev * (t - self.t_prev)
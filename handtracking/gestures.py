@@ -0,0 +1,171 @@
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from .HandTracking import fingers_up_array
+from utils.settings import GESTURE_DEBOUNCE_FRAMES
+
+PRESS = "press"
+HOLD = "hold"
+RELEASE = "release"
+PINCH = "pinch"
+
+#gesture is a finger count (0-5) or PINCH, duration is how long it has been held so far
+Event = namedtuple("Event", ["kind", "gesture", "hand", "duration", "t"])
+
+
+class Subscription:
+    __slots__ = ("kind", "callback", "gesture", "hand", "hold_time")
+
+    def __init__(self, kind, callback, gesture, hand, hold_time):
+        self.kind = kind
+        self.callback = callback
+        self.gesture = gesture
+        self.hand = hand
+        self.hold_time = hold_time
+
+    def matches(self, kind, gesture, hand):
+        return (self.kind == kind and (self.gesture is None or self.gesture == gesture)
+                and (self.hand is None or self.hand == hand))
+
+
+#a gesture becomes the stable one only after debounce_frames frames in a row, so a one-frame
+#misdetection neither ends a held gesture nor starts a new one
+class _DebouncedGesture:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.stable = None
+        self.since = 0.0
+        self.candidate = None
+        self.candidate_since = 0.0
+        self.frames = 0
+        self.held = set()  #hold subscriptions already fired for the current gesture
+
+    def feed(self, value, t, debounce):
+        if value == self.stable:
+            self.candidate = None
+            self.frames = 0
+            return False
+        if value != self.candidate or self.frames == 0:
+            self.candidate = value
+            self.candidate_since = t
+            self.frames = 0
+        self.frames += 1
+        return self.frames >= debounce
+
+
+#finger states, counts, pinch distance and hold durations computed once per frame for every hand,
+#plus debounced press / hold / release events for finger counts and pinches
+#run_game updates it with the hands the game receives, games and the menu read it or subscribe
+class GestureEngine:
+    #pinch_ratio is the thumb-index tip distance, relative to the palm length, that counts as a pinch
+    def __init__(self, max_hands=1, debounce_frames=GESTURE_DEBOUNCE_FRAMES, hold_time=1.0, pinch_ratio=0.35,
+                 time_fn=time.perf_counter):
+        self.max_hands = max_hands
+        self.debounce_frames = max(1, debounce_frames)
+        self.hold_time = hold_time
+        self.pinch_ratio = pinch_ratio
+        self.time_fn = time_fn
+
+        self.present = np.zeros(max_hands, bool)
+        self.fingers = np.zeros((max_hands, 5), np.uint8)
+        self.counts = np.zeros(max_hands, np.int64)
+        self.pinch_distance = np.full(max_hands, np.inf, np.float32)
+        self.index_tips = np.zeros((max_hands, 2), np.int32)
+        self.t = 0.0
+
+        self.finger_states = [_DebouncedGesture() for _ in range(max_hands)]
+        self.pinch_states = [_DebouncedGesture() for _ in range(max_hands)]
+        self.subscriptions = []
+
+    def reset(self):
+        self.present[:] = False
+        self.counts[:] = 0
+        for state in self.finger_states + self.pinch_states:
+            state.reset()
+
+    #kind is PRESS, HOLD or RELEASE; gesture and hand None match any. hold subscriptions fire once
+    #per held gesture after hold_time seconds (the engine default when None)
+    def subscribe(self, kind, callback, gesture=None, hand=None, hold_time=None):
+        subscription = Subscription(kind, callback, gesture, hand, hold_time)
+        self.subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        if subscription in self.subscriptions:
+            self.subscriptions.remove(subscription)
+
+    #hands is a (n, 21, 3) landmark array, a single (21, 3) hand, None, or a list with one hand
+    #or None per slot (what multi-player games get from select_hands)
+    def update(self, hands, t=None):
+        self.t = t = self.time_fn() if t is None else t
+        if hands is None:
+            hands = []
+        elif isinstance(hands, np.ndarray) and hands.ndim == 2:
+            hands = [hands]
+        slots = [i for i, hand in enumerate(hands[:self.max_hands]) if hand is not None]
+
+        self.present[:] = False
+        self.counts[:] = 0
+        self.pinch_distance[:] = np.inf
+        if slots:
+            stack = hands[:len(slots)] if isinstance(hands, np.ndarray) else np.stack([hands[i] for i in slots])
+            fingers = fingers_up_array(stack)
+            pts = stack[:, :, 1:].astype(np.float32)
+            palm = np.hypot(*(pts[:, 9] - pts[:, 0]).T)
+            self.present[slots] = True
+            self.fingers[slots] = fingers
+            self.counts[slots] = fingers.sum(axis=-1)
+            self.pinch_distance[slots] = np.hypot(*(pts[:, 4] - pts[:, 8]).T) / np.maximum(palm, 1.0)
+            self.index_tips[slots] = stack[:, 8, 1:]
+
+        for i in range(self.max_hands):
+            present = bool(self.present[i])
+            self._feed(i, self.finger_states[i], int(self.counts[i]) if present else None, t)
+            pinched = present and self.pinch_distance[i] < self.pinch_ratio
+            self._feed(i, self.pinch_states[i], PINCH if pinched else None, t)
+        return self
+
+    def _feed(self, hand, state, value, t):
+        if state.feed(value, t, self.debounce_frames):
+            if state.stable is not None:
+                self._emit(RELEASE, state.stable, hand, t - state.since, t)
+            state.stable = value
+            #the gesture started when it was first seen, not when the debounce confirmed it
+            state.since = state.candidate_since
+            state.candidate = None
+            state.frames = 0
+            state.held.clear()
+            if value is not None:
+                self._emit(PRESS, value, hand, t - state.since, t)
+
+        if state.stable is not None:
+            duration = t - state.since
+            for subscription in self.subscriptions:
+                if subscription in state.held or not subscription.matches(HOLD, state.stable, hand):
+                    continue
+                hold_time = self.hold_time if subscription.hold_time is None else subscription.hold_time
+                if duration >= hold_time:
+                    state.held.add(subscription)
+                    subscription.callback(Event(HOLD, state.stable, hand, duration, t))
+
+    def _emit(self, kind, gesture, hand, duration, t):
+        event = Event(kind, gesture, hand, duration, t)
+        for subscription in list(self.subscriptions):
+            if subscription.matches(kind, gesture, hand):
+                subscription.callback(event)
+
+    #debounced finger count of a hand, None while no hand is seen
+    def gesture(self, hand=0):
+        return self.finger_states[hand].stable
+
+    def pinching(self, hand=0):
+        return self.pinch_states[hand].stable == PINCH
+
+    #seconds the current debounced finger count has been held
+    def hold_duration(self, hand=0):
+        state = self.finger_states[hand]
+        return self.t - state.since if state.stable is not None else 0.0
@@ -0,0 +1,73 @@
+from itertools import permutations
+
+import numpy as np
+
+from utils.settings import WINDOW_WIDTH, WINDOW_HEIGHT
+
+
+#keeps hand -> player identity stable when one tracker sees several players' hands
+#every frame the detected hands are matched to players by the lowest total distance from each
+#player's last palm position; a player not seen for max_missing frames falls back to a home
+#position in their own vertical strip of the frame, so a returning hand is claimed by position
+class PlayerAssigner:
+    def __init__(self, num_players, frame_size=(WINDOW_WIDTH, WINDOW_HEIGHT), max_missing=15,
+                 handedness_penalty=0.2):
+        self.num_players = num_players
+        self.max_missing = max_missing
+        w, h = frame_size
+        #mediapipe handedness flips now and then, so a mismatch only adds a fraction of the frame width
+        self.handedness_penalty = handedness_penalty * w
+        self.home = np.array([((i + 0.5) * w / num_players, h / 2) for i in range(num_players)], np.float32)
+        self.positions = self.home.copy()
+        self.missing = np.full(num_players, max_missing)
+        self.handedness = np.full(num_players, -1, np.int8)
+        self.hand_index = np.full(num_players, -1)  #index into the last hands array, -1 when not seen
+        self._matchings = {}
+
+    def reset(self):
+        self.positions[:] = self.home
+        self.missing[:] = self.max_missing
+        self.handedness[:] = -1
+        self.hand_index[:] = -1
+
+    #every way to pair n hands with the players, as (player indices, hand indices) arrays
+    def _candidates(self, n):
+        if n not in self._matchings:
+            k = min(n, self.num_players)
+            players = np.array(list(permutations(range(self.num_players), k))).reshape(-1, k)
+            hands = np.array(list(permutations(range(n), k))).reshape(-1, k)
+            if n <= self.num_players:
+                hands = np.broadcast_to(np.arange(n), players.shape)
+            else:
+                players = np.broadcast_to(np.arange(k), hands.shape)
+            self._matchings[n] = (players, hands)
+        return self._matchings[n]
+
+    #hands is the tracker's (n, 21, 3) pixel landmark array, handedness its per-hand labels
+    #returns one (21, 3) view or None per player
+    def assign(self, hands, handedness=None):
+        n = len(hands)
+        self.hand_index[:] = -1
+        if n:
+            centers = hands[:, :, 1:].mean(axis=1, dtype=np.float32)
+            cost = np.hypot(*(self.positions[:, None] - centers[None]).transpose(2, 0, 1))
+            if handedness is not None:
+                seen = handedness[:n]
+                cost += self.handedness_penalty * ((self.handedness[:, None] >= 0) & (seen[None] >= 0)
+                                                   & (self.handedness[:, None] != seen[None]))
+            players, hand_ids = self._candidates(n)
+            best = int(np.argmin(cost[players, hand_ids].sum(axis=1)))
+            matched, matched_hands = players[best], hand_ids[best]
+            self.hand_index[matched] = matched_hands
+            self.positions[matched] = centers[matched_hands]
+            if handedness is not None:
+                labels = handedness[matched_hands]
+                self.handedness[matched] = np.where(labels >= 0, labels, self.handedness[matched])
+
+        seen = self.hand_index >= 0
+        self.missing[seen] = 0
+        self.missing[~seen] += 1
+        lost = self.missing >= self.max_missing
+        self.positions[lost] = self.home[lost]
+        self.handedness[lost] = -1
+        return [hands[i] if i >= 0 else None for i in self.hand_index]
@@ -0,0 +1,229 @@
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from .HandTracking import HandTracker, NUM_LANDMARKS
+
+#one fixed-size row per frame so chunks can be memory-mapped and sliced without parsing
+def frame_dtype(max_hands):
+    return np.dtype([
+        ("t", "<f8"),  #perf_counter seconds since the recording started
+        ("num_hands", "u1"),
+        ("predicted", "u1"),
+        ("handedness", "i1", (max_hands,)),  #0 left, 1 right, -1 unknown
+        ("landmarks", "<f4", (max_hands, NUM_LANDMARKS, 3)),  #normalized x, y, z
+    ])
+
+
+EVENT_DTYPE = np.dtype([("frame", "<u4"), ("t", "<f8"), ("code", "<u2"), ("value", "<f4")])
+
+
+#session directory layout:
+#  session.json          metadata, chunk lists and event names
+#  frames_00000.npy ...  chunk_frames rows each, written through a memmap
+#  events_00000.npy ...  game events, one file per flush, numbered independently of the frame chunks
+class SessionRecorder:
+    def __init__(self, directory, max_hands=2, chunk_frames=4096, event_flush_frames=256, meta=None):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_hands = max_hands
+        self.chunk_frames = chunk_frames
+        self.event_flush_frames = event_flush_frames  #pending events are written at least this often
+        self.dtype = frame_dtype(max_hands)
+        self.meta = {"version": 1, "max_hands": max_hands, "chunk_frames": chunk_frames,
+                     "created": time.time(), "frame_size": None, "chunks": [], "event_chunks": [],
+                     "event_names": []}
+        self.meta.update(meta or {})
+        self.start_time = time.perf_counter()
+        self.frames = 0
+        self.chunk = None
+        self.chunk_rows = 0
+        self.events = []
+        self._write_meta()
+
+    def _chunk_path(self, prefix, index):
+        return os.path.join(self.directory, f"{prefix}_{index:05d}.npy")
+
+    def _open_chunk(self):
+        index = len(self.meta["chunks"])
+        self.chunk = np.lib.format.open_memmap(self._chunk_path("frames", index), mode="w+",
+                                               dtype=self.dtype, shape=(self.chunk_frames,))
+        self.chunk_rows = 0
+        #frames stays None until the chunk is closed, readers then count rows with t > 0
+        self.meta["chunks"].append({"frames": None})
+        self._write_meta()
+
+    def _close_chunk(self):
+        if self.chunk is None:
+            return
+        self.chunk.flush()
+        self.chunk = None
+        self.meta["chunks"][-1] = {"frames": self.chunk_rows}
+        self._flush_events()
+        self._write_meta()
+
+    #pending events go to their own file, so they never need a frame chunk to exist
+    def _flush_events(self):
+        if not self.events:
+            return
+        index = len(self.meta["event_chunks"])
+        np.save(self._chunk_path("events", index), np.array(self.events, EVENT_DTYPE))
+        self.meta["event_chunks"].append(len(self.events))
+        self.events = []
+
+    #pushes recorded frames and pending events to disk without closing the open chunk
+    def flush(self):
+        if self.chunk is not None:
+            self.chunk.flush()
+        if self.events:
+            self._flush_events()
+            self._write_meta()
+
+    def _write_meta(self):
+        tmp = os.path.join(self.directory, "session.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(self.meta, f, indent=4)
+        os.replace(tmp, os.path.join(self.directory, "session.json"))
+
+    def record(self, landmarks_norm, num_hands, handedness, predicted=False, frame_size=None):
+        if self.chunk is None:
+            if frame_size and self.meta["frame_size"] is None:
+                self.meta["frame_size"] = list(frame_size)
+            self._open_chunk()
+        row = self.chunk[self.chunk_rows]
+        #t is never exactly 0 so unclosed chunks can be trimmed after a crash
+        row["t"] = max(time.perf_counter() - self.start_time, 1e-9)
+        row["num_hands"] = num_hands
+        row["predicted"] = predicted
+        row["handedness"] = handedness
+        row["landmarks"][:num_hands] = landmarks_norm[:num_hands]
+        self.chunk_rows += 1
+        self.frames += 1
+        if self.chunk_rows == self.chunk_frames:
+            self._close_chunk()
+        elif self.events and self.chunk_rows % self.event_flush_frames == 0:
+            self.flush()
+
+    def event(self, name, value=0.0):
+        names = self.meta["event_names"]
+        if name not in names:
+            names.append(name)
+        self.events.append((max(self.frames - 1, 0), time.perf_counter() - self.start_time,
+                            names.index(name), value))
+
+    def close(self):
+        self._close_chunk()
+        self._flush_events()
+        self.meta["frames"] = self.frames
+        self.meta["duration"] = round(time.perf_counter() - self.start_time, 3)
+        self._write_meta()
+
+
+#random access over a recorded session, chunks stay memory-mapped and are only paged in when touched
+class SessionReader:
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, "session.json")) as f:
+            self.meta = json.load(f)
+        self.max_hands = self.meta["max_hands"]
+        self.chunks = []
+        for index, info in enumerate(self.meta["chunks"]):
+            path = os.path.join(directory, f"frames_{index:05d}.npy")
+            if not os.path.exists(path):
+                break
+            chunk = np.load(path, mmap_mode="r")
+            n = info["frames"]
+            if n is None:
+                n = int(np.count_nonzero(chunk["t"]))
+            self.chunks.append(chunk[:n])
+        self.offsets = np.cumsum([0] + [len(c) for c in self.chunks])
+
+    def __len__(self):
+        return int(self.offsets[-1])
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        c = int(np.searchsorted(self.offsets, i, side="right")) - 1
+        return self.chunks[c][i - self.offsets[c]]
+
+    def column(self, name):
+        return np.concatenate([c[name] for c in self.chunks]) if self.chunks else np.empty(0)
+
+    def events(self):
+        arrays = []
+        for index in range(len(self.meta.get("event_chunks", []))):
+            path = os.path.join(self.directory, f"events_{index:05d}.npy")
+            if os.path.exists(path):
+                arrays.append(np.load(path))
+        return np.concatenate(arrays) if arrays else np.empty(0, EVENT_DTYPE)
+
+    def event_name(self, code):
+        return self.meta["event_names"][code]
+
+
+#plays a recording back through the HandTracker interface, one recorded frame per find_hands call
+class ReplayHandTracker(HandTracker):
+    def __init__(self, directory, loop=False):
+        self.reader = SessionReader(directory)
+        self._init_landmark_buffers(self.reader.max_hands)
+        self.loop = loop
+        self.frame_index = 0
+
+    def find_hands(self, img, draw=True):
+        self.num_hands = 0
+        if self.frame_index >= len(self.reader):
+            if not self.loop or len(self.reader) == 0:
+                self.finished = True
+                return img
+            self.frame_index = 0
+        row = self.reader[self.frame_index]
+        self.frame_index += 1
+
+        n = min(int(row["num_hands"]), self.max_hands)
+        self.landmarks_norm[:n] = row["landmarks"][:n]
+        self.handedness[:n] = row["handedness"][:n]
+        self.predicted = bool(row["predicted"])
+        self.num_hands = n
+        self._frame_pending = True
+        if draw:
+            self._pixel_landmarks(img, draw=True)
+        return img
+
+    def find_landmarks(self, img, draw=False):
+        hands = self._pixel_landmarks(img, draw)
+        self._record_frame(img)
+        return hands
+
+
+#stations started in the same second each get their own directory
+def session_directory(root, name, station=None):
+    suffix = "" if station is None else f"_station{station + 1}"
+    return os.path.join(root, f"{name}{suffix}_{time.strftime('%Y%m%d_%H%M%S')}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize a recorded hand tracking session")
+    parser.add_argument("session")
+    args = parser.parse_args(argv)
+
+    reader = SessionReader(args.session)
+    t = reader.column("t")
+    hands = reader.column("num_hands")
+    predicted = reader.column("predicted")
+    print(f"{args.session}: {len(reader)} frames in {len(reader.chunks)} chunks, game {reader.meta.get('game')}")
+    if len(t) > 1:
+        print(f"  duration {t[-1] - t[0]:.2f} s, {(len(t) - 1) / (t[-1] - t[0]):.1f} fps")
+        print(f"  hand visible {np.mean(hands > 0) * 100:.1f}%, predicted {np.mean(predicted > 0) * 100:.1f}%")
+    events = reader.events()
+    for code in np.unique(events["code"]):
+        print(f"  {reader.event_name(code):<12} {int(np.sum(events['code'] == code))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+import multiprocessing as mp
+import threading
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .HandTracking import HandTracker
+
+
+#opens a block created by the server; spawned workers share the server's resource tracker
+#(POSIX), which already tracks the block, so attaching must not register or unregister it again
+def _attach(name):
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+#fixed number of frame slots in one shared memory block, the server writes a frame into a free
+#slot and only the slot index crosses the process boundary
+class SharedFrameRing:
+    def __init__(self, shape, slots=2, name=None):
+        self.shape = tuple(shape)
+        self.slots = slots
+        size = slots * int(np.prod(self.shape))
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+            self.owner = True
+        else:
+            self.shm = _attach(name)
+            self.owner = False
+        self.name = self.shm.name
+        self.frames = np.ndarray((slots,) + self.shape, np.uint8, buffer=self.shm.buf)
+
+    def close(self):
+        self.frames = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+#one tracker per station so mediapipe's tracking state never mixes two streams
+def _worker_main(tasks, results, tracker_factory, max_hands):
+    rings = {}
+    trackers = {}
+    results.put(("ready",))
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        station, slot, seq, ring_name, shape, slots = task
+        ring = rings.get(station)
+        if ring is None:
+            ring = rings[station] = SharedFrameRing(shape, slots, name=ring_name)
+        start = time.perf_counter()
+        try:
+            tracker = trackers.get(station)
+            if tracker is None:
+                tracker = trackers[station] = tracker_factory(max_hands=max_hands)
+            img = ring.frames[slot]
+            tracker.find_hands(img, draw=False)
+            n = len(tracker.find_landmarks(img))
+            results.put((station, slot, seq, tracker.landmarks_norm[:n].copy(), tracker.handedness[:n].copy(),
+                         tracker.predicted, time.perf_counter() - start))
+        except Exception as e:
+            results.put((station, slot, seq, None, repr(e), False, time.perf_counter() - start))
+    for ring in rings.values():
+        ring.close()
+
+
+class _Station:
+    def __init__(self, index, ring, worker):
+        self.index = index
+        self.ring = ring
+        self.worker = worker
+        self.free = list(range(ring.slots))
+        self.results = {}  #seq -> result tuple, until the station's tracker collects it
+        self.next_seq = 0
+        self.cond = threading.Condition()
+
+
+#runs HandTracker inference for several camera or video streams in a pool of worker processes
+#each station is pinned to one worker, frames travel through the station's SharedFrameRing and only
+#small task tuples and landmark arrays are pickled; a collector thread routes results back by station
+class InferenceServer:
+    def __init__(self, workers=None, max_hands=1, slots=2, tracker_factory=HandTracker):
+        self.num_workers = workers or mp.cpu_count()
+        self.max_hands = max_hands
+        self.slots = slots
+        self.tracker_factory = tracker_factory
+        self.stations = []
+        self.lock = threading.Lock()
+        #spawn so workers behave the same on Windows, where the stations run, and elsewhere
+        ctx = mp.get_context("spawn")
+        self.results = ctx.Queue()
+        self.task_queues = [ctx.Queue() for _ in range(self.num_workers)]
+        self.workers = [ctx.Process(target=_worker_main, args=(q, self.results, tracker_factory, max_hands),
+                                    daemon=True)
+                        for q in self.task_queues]
+        for worker in self.workers:
+            worker.start()
+        #spawning and importing takes a while, do not let it count against the first frames
+        for _ in self.workers:
+            self.results.get(timeout=120)
+        self.collector = threading.Thread(target=self._collect, daemon=True)
+        self.collector.start()
+
+    def add_station(self, frame_shape):
+        with self.lock:
+            index = len(self.stations)
+            station = _Station(index, SharedFrameRing(frame_shape, self.slots), index % self.num_workers)
+            self.stations.append(station)
+        return index
+
+    def _collect(self):
+        while True:
+            result = self.results.get()
+            if result is None:
+                break
+            station = self.stations[result[0]]
+            with station.cond:
+                station.free.append(result[1])
+                station.results[result[2]] = result
+                station.cond.notify_all()
+
+    #copies the frame into a free slot of the station's ring and queues it, returns its sequence number
+    def submit(self, index, frame, timeout=2.0):
+        station = self.stations[index]
+        with station.cond:
+            if not station.cond.wait_for(lambda: station.free, timeout):
+                raise TimeoutError(f"station {index}: no free frame slot")
+            slot = station.free.pop()
+            seq = station.next_seq
+            station.next_seq += 1
+        np.copyto(station.ring.frames[slot], frame)
+        ring = station.ring
+        self.task_queues[station.worker].put((index, slot, seq, ring.name, ring.shape, ring.slots))
+        return seq
+
+    #(landmarks_norm, handedness, predicted, inference seconds) for a submitted frame
+    def result(self, index, seq, timeout=5.0):
+        station = self.stations[index]
+        with station.cond:
+            if not station.cond.wait_for(lambda: seq in station.results, timeout):
+                raise TimeoutError(f"station {index}: no result for frame {seq}")
+            _, _, _, landmarks, handedness, predicted, seconds = station.results.pop(seq)
+        if landmarks is None:
+            raise RuntimeError(f"station {index}: inference failed: {handedness}")
+        return landmarks, handedness, predicted, seconds
+
+    def close(self):
+        for q in self.task_queues:
+            q.put(None)
+        for worker in self.workers:
+            worker.join(timeout=5.0)
+            if worker.is_alive():
+                worker.terminate()
+        self.results.put(None)
+        self.collector.join(timeout=1.0)
+        for station in self.stations:
+            station.ring.close()
+
+
+#HandTracker interface for one station's game loop, inference happens in the server's workers
+class RemoteHandTracker(HandTracker):
+    def __init__(self, server):
+        self.server = server
+        self._init_landmark_buffers(server.max_hands)
+        self.station = None
+        self.round_trips = []  #submit -> result seconds, transport included
+        self.inference_times = []
+
+    def find_hands(self, img, draw=True):
+        if self.station is None:
+            self.station = self.server.add_station(img.shape)
+        start = time.perf_counter()
+        seq = self.server.submit(self.station, img)
+        landmarks, handedness, predicted, seconds = self.server.result(self.station, seq)
+        self.round_trips.append(time.perf_counter() - start)
+        self.inference_times.append(seconds)
+
+        n = min(len(landmarks), self.max_hands)
+        self.landmarks_norm[:n] = landmarks[:n]
+        self.handedness[:] = -1
+        self.handedness[:n] = handedness[:n]
+        self.predicted = predicted
+        self.num_hands = n
+        self._frame_pending = True
+        if draw:
+            self._pixel_landmarks(img, draw=True)
+        return img
+
+    def find_landmarks(self, img, draw=False):
+        hands = self._pixel_landmarks(img, draw)
+        self._record_frame(img)
+        return hands
+
+    def latency_stats(self):
+        if not self.round_trips:
+            return {"frames": 0}
+        rt = np.asarray(self.round_trips) * 1000
+        inference = np.asarray(self.inference_times) * 1000
+        return {
+            "frames": len(rt),
+            "p50_ms": round(float(np.percentile(rt, 50)), 3),
+            "p95_ms": round(float(np.percentile(rt, 95)), 3),
+            "inference_p50_ms": round(float(np.percentile(inference, 50)), 3),
+        }
@@ -0,0 +1,87 @@
+import time
+
+import numpy as np
+import cv2
+
+from .HandTracking import HandTracker
+from .filters import OneEuroFilter
+
+#pixel offsets from the index fingertip (landmark 8) for a hand with only the index finger raised
+HAND_TEMPLATE = np.array([
+    (20, 230),
+    (-20, 210), (-45, 180), (-55, 150), (-40, 130),
+    (0, 140), (0, 90), (0, 45), (0, 0),
+    (30, 140), (30, 110), (30, 140), (30, 160),
+    (55, 145), (55, 120), (55, 145), (55, 165),
+    (78, 155), (78, 135), (78, 155), (78, 170),
+], np.float32)
+
+
+def circle_path(center, radius, period=120):
+    def tip(i):
+        angle = 2 * np.pi * i / period
+        return center[0] + radius * np.cos(angle), center[1] + radius * np.sin(angle)
+    return tip
+
+
+#traces a closed polygon at `speed` pixels per frame
+def polygon_path(points, speed=6):
+    pts = np.asarray(points, np.float32)
+    edges = np.roll(pts, -1, axis=0) - pts
+    lengths = np.hypot(edges[:, 0], edges[:, 1])
+    cum = np.concatenate([[0], np.cumsum(lengths)])
+
+    def tip(i):
+        s = (i * speed) % cum[-1]
+        k = min(np.searchsorted(cum, s, side="right") - 1, len(pts) - 1)
+        t = (s - cum[k]) / lengths[k] if lengths[k] else 0
+        return tuple(pts[k] + edges[k] * t)
+    return tip
+
+
+#stands in for HandTracker when there is no camera or mediapipe, e.g. in benchmarks
+#tip_path may be a list of paths, one hand each, for multi-player games
+class SyntheticHandTracker(HandTracker):
+    def __init__(self, tip_path, max_hands=None, dropout=0.0, jitter=0.0, seed=0, smoothing=False):
+        self.tip_paths = list(tip_path) if isinstance(tip_path, (list, tuple)) else [tip_path]
+        self._init_landmark_buffers(max_hands or len(self.tip_paths))
+        if smoothing:
+            self.filter = OneEuroFilter()
+            self.smoothing = True
+        self.dropout = dropout
+        self.jitter = jitter
+        self.rng = np.random.default_rng(seed)
+        self.frame_index = 0
+
+    def find_hands(self, img, draw=True):
+        h, w = img.shape[:2]
+        self._frame_pending = True
+        tips = [path(self.frame_index) for path in self.tip_paths[:self.max_hands]]
+        self.frame_index += 1
+
+        self.num_hands = 0
+        if self.rng.random() < self.dropout:
+            return img
+
+        for i, (x, y) in enumerate(tips):
+            pts = HAND_TEMPLATE + (x, y)
+            if self.jitter:
+                pts = pts + self.rng.normal(0, self.jitter, pts.shape)
+            self.landmarks_norm[i, :, 0] = pts[:, 0] / w
+            self.landmarks_norm[i, :, 1] = pts[:, 1] / h
+            self.landmarks_norm[i, :, 2] = 0
+        self.num_hands = len(tips)
+        if self.filter is not None:
+            self.last_inference = time.perf_counter()
+            self._filter_landmarks()
+
+        if draw:
+            pts = self.landmarks_norm[:self.num_hands, :, :2] * (w, h)
+            for px, py in pts.reshape(-1, 2).astype(int):
+                cv2.circle(img, (int(px), int(py)), 4, (0, 255, 0), cv2.FILLED)
+        return img
+
+    def find_landmarks(self, img, draw=False):
+        hands = self._pixel_landmarks(img, draw)
+        self._record_frame(img)
+        return hands
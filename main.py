@@ -1,69 +1,71 @@
 import sys
-import os
 import cv2
-import time
-import subprocess
 from handtracking.HandTracking import HandTracker
-from utils.settings import WINDOW_WIDTH, WINDOW_HEIGHT, WHITE, GREEN, RED, FONT
-
-PYTHON_CMD = "python" if os.name == "nt" else "python3"
+from handtracking.gestures import GestureEngine, HOLD
+from games.registry import GAME_REGISTRY
+from games.runtime import GameRuntime
+from utils.frame_source import FrameSource, source_from_args
+from utils.frame_pacer import FramePacer
+from utils.hud_layer import HudLayer
+from utils.settings import WINDOW_WIDTH, WINDOW_HEIGHT, WHITE, GREEN, RED, PLAYERS
 
 #number of fingers 
-GAME_MAP = {
-    1: "games/ConnectDots.py",
-    2: "games/CatchDroplets.py",
-    3: "games/ShapeDrawing.py",
-    4: "games/BalloonPop.py",
-    5: "games/ColorMatch.py",
-}
+GAME_MAP = {count: entry.name for count, entry in GAME_REGISTRY.items()}
 
 HOLD_DURATION = 2.0  
 
-def draw_menu(img, selected_fingers=None, hold_progress=0):
+#menu text and boxes are rendered once, only the highlight and the hold bar change
+MENU_HUD = HudLayer()
+
+def draw_menu(img, selected_fingers=None, hold_progress=0, hud=MENU_HUD):
    
     h, w, _ = img.shape
     box_width = w // 3
     box_height = 80
     start_y = 150
 
-    cv2.putText(img, "Hand Therapy Game Menu", (50, 60), FONT, 1, WHITE, 2)
-    cv2.putText(img, "Raise 1–5 fingers to choose a game", (50, 100), FONT, 0.7, (200, 200, 200), 1)
+    hud.text("title", "Hand Therapy Game Menu", (50, 60), WHITE, 1, 2)
+    hud.text("hint", "Raise 1–5 fingers to choose a game", (50, 100), (200, 200, 200), 0.7, 1)
 
-    for i, (finger_count, script_path) in enumerate(GAME_MAP.items()):
+    for i, (finger_count, game_name) in enumerate(GAME_MAP.items()):
         y = start_y + i * (box_height + 20)
-        game_name = script_path.split("/")[-1].replace(".py", "")
         color = (100, 100, 100)
 
         #highlight selected game
         if selected_fingers == finger_count:
             color = (0, 255, 0)
-            cv2.rectangle(img, (50, y - 10), (w - 50, y + box_height), color, 3)
+            hud.rect(f"box{finger_count}", (50, y - 10), (w - 50, y + box_height), color, 3)
         else:
-            cv2.rectangle(img, (50, y - 10), (w - 50, y + box_height), color, 1)
+            hud.rect(f"box{finger_count}", (50, y - 10), (w - 50, y + box_height), color, 1)
 
-        cv2.putText(img, f"{finger_count} Finger(s): {game_name}", (70, y + 50), FONT, 0.8, WHITE, 2)
+        hud.text(f"label{finger_count}", f"{finger_count} Finger(s): {game_name}", (70, y + 50), WHITE, 0.8, 2)
 
     #loading bar
     if selected_fingers in GAME_MAP and hold_progress > 0:
         progress_width = int((w - 100) * min(hold_progress / HOLD_DURATION, 1))
-        cv2.rectangle(img, (50, h - 50), (50 + progress_width, h - 20), GREEN, -1)
-        cv2.rectangle(img, (50, h - 50), (w - 50, h - 20), WHITE, 2)
-        cv2.putText(img, f"Holding... {int(hold_progress)}s", (60, h - 60), FONT, 0.7, WHITE, 2)
+        hud.rect("progress", (50, h - 50), (50 + progress_width, h - 20), GREEN, -1)
+        hud.rect("progress_frame", (50, h - 50), (w - 50, h - 20), WHITE, 2)
+        hud.text("holding", f"Holding... {int(hold_progress)}s", (60, h - 60), WHITE, 0.7, 2)
+    else:
+        for key in ("progress", "progress_frame", "holding"):
+            hud.remove(key)
 
-def run_main_menu():
-    cap = cv2.VideoCapture(0)
-    cap.set(3, WINDOW_WIDTH)
-    cap.set(4, WINDOW_HEIGHT)
+    hud.composite(img)
 
-    tracker = HandTracker(max_hands=1)
-    prev_fingers = -1
-    hold_start = None
-    confirmed_game = None
+def select_game(cap, tracker, pacer=None, gestures=None):
+    pacer = pacer or FramePacer()
+    gestures = gestures or GestureEngine(hold_time=HOLD_DURATION)
+    gestures.reset()
+    confirmed = []
 
     print("🎮 Gesture-based game menu started!")
     print("👉 Raise 1–5 fingers to choose a game:")
     for k, v in GAME_MAP.items():
-        print(f"  {k} finger(s): {v.split('/')[-1].replace('.py','')}")
+        print(f"  {k} finger(s): {v}")
+
+    #holding a game's finger count for HOLD_DURATION confirms it
+    subscriptions = [gestures.subscribe(HOLD, lambda event: confirmed.append(event.gesture), gesture=count, hand=0)
+                     for count in GAME_MAP]
 
     while True:
         success, frame = cap.read()
@@ -73,42 +75,45 @@ def run_main_menu():
 
         frame = cv2.flip(frame, 1)
         img = tracker.find_hands(frame, draw=True)
-        lm_list = tracker.find_position(img, draw=False)
-
-        
-        count = tracker.how_many_fingers_up(lm_list) if lm_list else 0
+        hands = tracker.find_landmarks(img)
+        gestures.update(hands[:1])
+        if confirmed:
+            break
 
         #menu
-        hold_progress = 0
-        if count in GAME_MAP:
-            if count == prev_fingers:
-                if hold_start is None:
-                    hold_start = time.time()
-                else:
-                    hold_progress = time.time() - hold_start
-                    if hold_progress >= HOLD_DURATION:
-                        confirmed_game = GAME_MAP[count]
-                        break
-            else:
-                hold_start = time.time()
-        else:
-            hold_start = None
-
+        count = gestures.gesture(0)
+        hold_progress = gestures.hold_duration(0) if count in GAME_MAP else 0
         draw_menu(img, selected_fingers=count, hold_progress=hold_progress)
-        prev_fingers = count
 
         cv2.imshow("Hand Therapy Game Menu", img)
-        key = cv2.waitKey(1) & 0xFF
+        key = pacer.wait()
         if key == 27 or key == ord('q'):  # ESC or Q
             break
 
-    cap.release()
+    for subscription in subscriptions:
+        gestures.unsubscribe(subscription)
     cv2.destroyAllWindows()
+    return confirmed[0] if confirmed else None
+
+def run_main_menu(source=0):
+    cap = FrameSource(source, WINDOW_WIDTH, WINDOW_HEIGHT)
+    #sized for every player so multi-player games can reuse it
+    tracker = HandTracker(max_hands=max(1, PLAYERS))
+    runtime = GameRuntime(cap, tracker)
+    pacer = FramePacer()
+    gestures = GestureEngine(hold_time=HOLD_DURATION)
+
+    #games run in this process and come back to the menu when they finish
+    while True:
+        pacer.reset()
+        confirmed_game = select_game(cap, tracker, pacer, gestures)
+        if confirmed_game is None:
+            break
+        runtime.launch(confirmed_game)
 
-    if confirmed_game:
-        game_name = confirmed_game.split("/")[-1].replace(".py", "")
-        print(f"Launching: {game_name}")
-        subprocess.run([PYTHON_CMD, confirmed_game])
+    cap.release()
+    runtime.report()
+    pacer.report("Menu")
 
 if __name__ == "__main__":
-    run_main_menu()
+    run_main_menu(source=source_from_args())
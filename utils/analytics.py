@@ -0,0 +1,278 @@
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.score_store import ScoreStore, get_store
+from utils.settings import ANALYTICS_CACHE_DIR
+
+METRICS = ("score", "level", "avg_reaction_time", "time_elapsed")
+GROUP_KEYS = ("player", "game")
+PERCENTILES = (50, 90)
+
+
+#every session as one row across parallel arrays; player and game are codes into name lists
+class SessionTable:
+    def __init__(self, columns=None, players=None, games=None, source=None):
+        self.columns = columns or {
+            "id": np.empty(0, np.int64),
+            "player": np.empty(0, np.int32),
+            "game": np.empty(0, np.int32),
+            "score": np.empty(0, np.float64),
+            "level": np.empty(0, np.float64),
+            "avg_reaction_time": np.empty(0, np.float64),
+            "time_elapsed": np.empty(0, np.float64),
+            "created_at": np.empty(0, np.float64),
+        }
+        self.players = list(players or [])
+        self.games = list(games or [])
+        self.source = source  #database the rows came from
+
+    def __len__(self):
+        return len(self.columns["id"])
+
+    @property
+    def last_id(self):
+        return int(self.columns["id"][-1]) if len(self) else 0
+
+    def _codes(self, names, values):
+        index = {name: i for i, name in enumerate(names)}
+        codes = np.empty(len(values), np.int32)
+        for i, value in enumerate(values):
+            value = "" if value is None else value
+            if value not in index:
+                index[value] = len(names)
+                names.append(value)
+            codes[i] = index[value]
+        return codes
+
+    #rows as returned by ScoreStore.query, in id order
+    def append(self, rows):
+        if not rows:
+            return 0
+        new = {
+            "id": np.array([r["id"] for r in rows], np.int64),
+            "player": self._codes(self.players, [r["player"] for r in rows]),
+            "game": self._codes(self.games, [r["game"] for r in rows]),
+        }
+        #missing values become NaN so every aggregate can skip them the same way
+        for name in METRICS + ("created_at",):
+            new[name] = np.array([np.nan if r[name] is None else r[name] for r in rows], np.float64)
+        for name, values in new.items():
+            self.columns[name] = np.concatenate([self.columns[name], values])
+        return len(rows)
+
+    def save(self, path):
+        tmp = path + ".tmp.npz"
+        np.savez_compressed(tmp, players=np.array(self.players, str), games=np.array(self.games, str),
+                            source=np.array(self.source or "", str), **self.columns)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            columns = {name: data[name] for name in data.files if name not in ("players", "games", "source")}
+            return cls(columns, data["players"].tolist(), data["games"].tolist(), str(data["source"]) or None)
+
+    def mask(self, player=None, game=None):
+        keep = np.ones(len(self), bool)
+        if player is not None:
+            keep &= self.columns["player"] == (self.players.index(player) if player in self.players else -1)
+        if game is not None:
+            keep &= self.columns["game"] == (self.games.index(game) if game in self.games else -1)
+        return keep
+
+
+#group ids for the chosen key columns, plus each group's key values
+def _group(table, by, keep):
+    codes = np.zeros(int(keep.sum()), np.int64)
+    for key in by:
+        width = len(table.players if key == "player" else table.games) or 1
+        codes = codes * width + table.columns[key][keep]
+    uniques, inverse = np.unique(codes, return_inverse=True)
+    keys = []
+    for code in uniques.tolist():
+        parts = []
+        for key in reversed(by):
+            names = table.players if key == "player" else table.games
+            width = len(names) or 1
+            parts.append(names[code % width])
+            code //= width
+        keys.append(tuple(reversed(parts)))
+    return keys, inverse.reshape(-1)
+
+
+#interpolated percentiles of every group at once, values sorted by (group, value)
+def _group_percentiles(groups, values, n_groups, qs):
+    order = np.lexsort((values, groups))
+    groups, values = groups[order], values[order]
+    counts = np.bincount(groups, minlength=n_groups)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    out = {}
+    for q in qs:
+        pos = starts + (q / 100) * np.maximum(counts - 1, 0)
+        lo = np.floor(pos).astype(np.int64)
+        hi = np.minimum(np.ceil(pos).astype(np.int64), starts + np.maximum(counts - 1, 0))
+        if len(values):
+            lo_v, hi_v = values[np.minimum(lo, len(values) - 1)], values[np.minimum(hi, len(values) - 1)]
+            result = lo_v + (hi_v - lo_v) * (pos - lo)
+        else:
+            result = np.zeros(n_groups)
+        out[f"p{q}"] = np.where(counts > 0, result, np.nan)
+    return out
+
+
+def group_stats(table, metric="score", by=GROUP_KEYS, player=None, game=None, percentiles=PERCENTILES):
+    keep = table.mask(player, game) & ~np.isnan(table.columns[metric])
+    keys, groups = _group(table, by, keep)
+    values = table.columns[metric][keep]
+    n = len(keys)
+    counts = np.bincount(groups, minlength=n)
+    sums = np.bincount(groups, values, minlength=n)
+    mins = np.full(n, np.inf)
+    maxs = np.full(n, -np.inf)
+    np.minimum.at(mins, groups, values)
+    np.maximum.at(maxs, groups, values)
+    #rows are in id order, so the highest row index per group is its latest session
+    latest = np.full(n, -1)
+    np.maximum.at(latest, groups, np.arange(len(values)))
+    last = np.where(latest >= 0, values[latest] if len(values) else np.nan, np.nan)
+    stats = {"keys": keys, "count": counts, "mean": sums / np.maximum(counts, 1), "min": mins, "max": maxs,
+             "last": last}
+    stats.update(_group_percentiles(groups, values, n, percentiles))
+    return stats
+
+
+#rolling mean over the last `window` sessions of each group and a least-squares slope per session
+def trends(table, metric="score", by=GROUP_KEYS, window=5, player=None, game=None):
+    keep = table.mask(player, game) & ~np.isnan(table.columns[metric])
+    keys, groups = _group(table, by, keep)
+    values = table.columns[metric][keep]
+    n = len(keys)
+    order = np.argsort(groups, kind="stable")
+    groups, values = groups[order], values[order]
+
+    counts = np.bincount(groups, minlength=n)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    index = np.arange(len(values))
+    ordinal = index - starts[groups]  #session number within its group
+    csum = np.concatenate([[0.0], np.cumsum(values)])
+    first = np.maximum(index + 1 - window, starts[groups])
+    rolling = (csum[index + 1] - csum[first]) / (index + 1 - first)
+
+    sx = np.bincount(groups, ordinal, minlength=n)
+    sy = np.bincount(groups, values, minlength=n)
+    sxx = np.bincount(groups, ordinal * ordinal, minlength=n)
+    sxy = np.bincount(groups, ordinal * values, minlength=n)
+    denom = counts * sxx - sx * sx
+    slope = np.divide(counts * sxy - sx * sy, denom, out=np.zeros(n), where=denom > 0)
+    latest_rolling = np.full(n, np.nan)
+    seen = counts > 0
+    latest_rolling[seen] = rolling[(starts + counts - 1)[seen]]
+    #per-group aggregates only, the per-session rolling means would grow the results cache with the history
+    return {"keys": keys, "count": counts, "slope": slope, "latest_rolling": latest_rolling}
+
+
+def _jsonable(result):
+    out = {}
+    for name, value in result.items():
+        if isinstance(value, np.ndarray):
+            value = np.where(np.isfinite(value), value, None).tolist() if value.dtype.kind == "f" else value.tolist()
+        out[name] = value
+    return out
+
+
+#columnar copy of the score store kept in cache_dir; only sessions appended since the last load
+#are read from the database, and cached results stay valid until that happens
+class SessionAnalytics:
+    def __init__(self, store=None, cache_dir=ANALYTICS_CACHE_DIR):
+        self.store = store or get_store()
+        self.cache_dir = cache_dir
+        self.table_path = os.path.join(cache_dir, "sessions.npz")
+        self.results_path = os.path.join(cache_dir, "results.json")
+        os.makedirs(cache_dir, exist_ok=True)
+        self.table = SessionTable.load(self.table_path) if os.path.exists(self.table_path) else SessionTable()
+        self.results = self._load_results()
+        self.refresh()
+
+    def _load_results(self):
+        try:
+            with open(self.results_path) as f:
+                cached = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        return cached["results"] if cached.get("last_id") == self.table.last_id else {}
+
+    def _save_results(self):
+        tmp = self.results_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"last_id": self.table.last_id, "results": self.results}, f)
+        os.replace(tmp, self.results_path)
+
+    #reads new sessions; returns how many were appended
+    def refresh(self):
+        #a different database, or one with fewer rows than the cache (replaced), starts over
+        source = os.path.abspath(self.store.path)
+        if self.table.source != source or self.store.count() < len(self.table):
+            self.table = SessionTable(source=source)
+            self.results = {}
+        added = self.table.append(self.store.query(since_id=self.table.last_id))
+        if added:
+            self.table.save(self.table_path)
+            self.results = {}
+            self._save_results()
+        return added
+
+    def _cached(self, name, compute, **kwargs):
+        key = json.dumps([name, kwargs], sort_keys=True)
+        if key not in self.results:
+            self.results[key] = _jsonable(compute(self.table, **kwargs))
+            self._save_results()
+        return self.results[key]
+
+    def group_stats(self, metric="score", by=GROUP_KEYS, player=None, game=None):
+        return self._cached("group_stats", group_stats, metric=metric, by=list(by), player=player, game=game)
+
+    def trends(self, metric="score", by=GROUP_KEYS, window=5, player=None, game=None):
+        return self._cached("trends", trends, metric=metric, by=list(by), window=window, player=player, game=game)
+
+
+def _fmt(value):
+    return "-" if value is None else f"{value:.2f}" if isinstance(value, float) else str(value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-patient and per-game aggregates and trends over the score history")
+    parser.add_argument("--metric", default="score", choices=METRICS)
+    parser.add_argument("--by", nargs="+", default=list(GROUP_KEYS), choices=GROUP_KEYS)
+    parser.add_argument("--player")
+    parser.add_argument("--game")
+    parser.add_argument("--window", type=int, default=5, help="sessions in the rolling mean")
+    parser.add_argument("--db", help="score database, the default store if omitted")
+    parser.add_argument("--rebuild", action="store_true", help="drop the cached arrays and results first")
+    args = parser.parse_args(argv)
+
+    if args.rebuild:
+        for name in ("sessions.npz", "results.json"):
+            path = os.path.join(ANALYTICS_CACHE_DIR, name)
+            if os.path.exists(path):
+                os.remove(path)
+    store = ScoreStore(args.db, legacy_files=None) if args.db else None
+    analytics = SessionAnalytics(store)
+    stats = analytics.group_stats(args.metric, args.by, args.player, args.game)
+    trend = analytics.trends(args.metric, args.by, args.window, args.player, args.game)
+
+    print(f"{len(analytics.table)} sessions, {args.metric} by {' / '.join(args.by)}")
+    columns = ["count", "mean", "p50", "p90", "min", "max", "last"]
+    print(f"{'group':<32}" + "".join(f"{c:>9}" for c in columns) + f"{'rolling':>9}{'slope':>9}")
+    for i, key in enumerate(stats["keys"]):
+        row = "".join(f"{_fmt(stats[c][i]):>9}" for c in columns)
+        print(f"{' / '.join(k or '-' for k in key):<32}{row}{_fmt(trend['latest_rolling'][i]):>9}{_fmt(trend['slope'][i]):>9}")
+
+
+if __name__ == "__main__":
+    main()
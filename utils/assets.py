@@ -0,0 +1,130 @@
+import os
+
+import cv2
+import numpy as np
+
+from utils.settings import ASSETS_DIR
+
+
+#an image ready to blit: cropped to its visible pixels, colour premultiplied by alpha. sprites with
+#partial alpha keep 255 - alpha per channel and blend with a multiply and an add, sprites whose alpha
+#is only 0/255 keep a mask and go on with one masked copy; either way only the sprite's rectangle of
+#the frame is touched. (ax, ay) is the pixel that lands on the position passed to blit
+class Sprite:
+    __slots__ = ("rgb", "alpha", "soft", "w", "h", "ax", "ay")
+
+    def __init__(self, rgb, alpha, anchor=(0, 0)):
+        ys, xs = np.nonzero(alpha)
+        if len(xs):
+            x0, y0, x1, y1 = int(xs.min()), int(ys.min()), int(xs.max()) + 1, int(ys.max()) + 1
+        else:
+            x0 = y0 = x1 = y1 = 0
+        rgb, alpha = rgb[y0:y1, x0:x1], alpha[y0:y1, x0:x1]
+        self.soft = bool(((alpha > 0) & (alpha < 255)).any())
+        self.rgb = np.ascontiguousarray(rgb)
+        self.alpha = cv2.cvtColor(cv2.subtract(255, alpha), cv2.COLOR_GRAY2BGR) if self.soft \
+            else np.ascontiguousarray(alpha)
+        self.h, self.w = alpha.shape[:2]
+        self.ax, self.ay = int(round(anchor[0])) - x0, int(round(anchor[1])) - y0
+
+    #straight (not premultiplied) BGRA
+    @classmethod
+    def from_bgra(cls, bgra, anchor=(0, 0)):
+        rgb, alpha = _premultiply(bgra)
+        return cls(rgb, alpha, anchor)
+
+    def blit(self, img, x, y):
+        x0, y0 = x - self.ax, y - self.ay
+        x1, y1 = x0 + self.w, y0 + self.h
+        h, w = img.shape[:2]
+        rgb, alpha = self.rgb, self.alpha
+        if x0 < 0 or y0 < 0 or x1 > w or y1 > h:
+            sx0, sy0 = max(-x0, 0), max(-y0, 0)
+            sx1, sy1 = min(self.w, w - x0), min(self.h, h - y0)
+            if sx0 >= sx1 or sy0 >= sy1:
+                return img
+            rgb, alpha = rgb[sy0:sy1, sx0:sx1], alpha[sy0:sy1, sx0:sx1]
+            x0, y0, x1, y1 = x0 + sx0, y0 + sy0, x0 + sx1, y0 + sy1
+        roi = img[y0:y1, x0:x1]
+        if self.soft:
+            cv2.multiply(roi, alpha, dst=roi, scale=1 / 255)
+            cv2.add(roi, rgb, dst=roi)
+        else:
+            cv2.copyTo(rgb, alpha, roi)
+        return img
+
+
+#premultiplied colour and alpha as uint8, resized in premultiplied space so edges do not pick up
+#the colour of transparent pixels
+def _premultiply(bgra, size=None):
+    f = bgra.astype(np.float32)
+    f[..., :3] *= f[..., 3:] / 255
+    if size is not None and tuple(size) != (bgra.shape[1], bgra.shape[0]):
+        shrink = size[0] < bgra.shape[1] or size[1] < bgra.shape[0]
+        f = cv2.resize(f, tuple(size), interpolation=cv2.INTER_AREA if shrink else cv2.INTER_LINEAR)
+    f = np.clip(np.rint(f), 0, 255).astype(np.uint8)
+    return f[..., :3], f[..., 3]
+
+
+#images from ASSETS_DIR are read once, sprites are built once per (image, size, tint, anchor) and
+#procedural ones once per (render function, arguments)
+class AssetCache:
+    def __init__(self, directory=ASSETS_DIR):
+        self.directory = directory
+        self.images = {}
+        self.sprites = {}
+
+    def __len__(self):
+        return len(self.sprites)
+
+    #BGRA cropped to its visible pixels
+    def image(self, name):
+        image = self.images.get(name)
+        if image is None:
+            path = os.path.join(self.directory, name)
+            image = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+            if image is None:
+                raise FileNotFoundError(f"Asset not found: {path}")
+            if image.ndim == 2:
+                image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGRA)
+            elif image.shape[2] == 3:
+                image = cv2.cvtColor(image, cv2.COLOR_BGR2BGRA)
+            ys, xs = np.nonzero(image[..., 3])
+            if len(xs):
+                image = image[ys.min():ys.max() + 1, xs.min():xs.max() + 1]
+            self.images[name] = image = np.ascontiguousarray(image)
+        return image
+
+    #size is (w, h) of the visible part, tint recolours single-colour icons keeping their alpha,
+    #anchor is a fraction of the size
+    def sprite(self, name, size=None, tint=None, anchor=(0.5, 0.5)):
+        key = (name, None if size is None else tuple(size), tint, anchor)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            image = self.image(name)
+            if tint is not None:
+                image = image.copy()
+                image[..., :3] = tint
+            rgb, alpha = _premultiply(image, size)
+            h, w = alpha.shape
+            sprite = self.sprites[key] = Sprite(rgb, alpha, (anchor[0] * (w - 1), anchor[1] * (h - 1)))
+        return sprite
+
+    #render(*args) returns straight BGRA and the anchor pixel
+    def procedural(self, render, *args):
+        key = (render, args)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            bgra, anchor = render(*args)
+            sprite = self.sprites[key] = Sprite.from_bgra(bgra, anchor)
+        return sprite
+
+
+_default_assets = None
+
+
+def get_assets():
+    global _default_assets
+    if _default_assets is None:
+        _default_assets = AssetCache()
+    return _default_assets
@@ -0,0 +1,99 @@
+import cv2
+import numpy as np
+
+
+#struct-of-arrays store for round falling/rising objects (balloons, droplets)
+#rows [0, count) are live, removals compact the arrays so they stay contiguous
+class EntityPool:
+    def __init__(self, capacity=64):
+        self.count = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        old = self.count
+        x = np.zeros(capacity, np.float32)
+        y = np.zeros(capacity, np.float32)
+        speed = np.zeros(capacity, np.float32)
+        radius = np.zeros(capacity, np.int32)
+        color = np.zeros((capacity, 3), np.int32)
+        alive = np.zeros(capacity, bool)
+        if old:
+            x[:old], y[:old], speed[:old] = self.x[:old], self.y[:old], self.speed[:old]
+            radius[:old], color[:old], alive[:old] = self.radius[:old], self.color[:old], self.alive[:old]
+        self.x, self.y, self.speed, self.radius, self.color, self.alive = x, y, speed, radius, color, alive
+
+    def __len__(self):
+        return self.count
+
+    def spawn(self, x, y, speed, radius, color):
+        x = np.atleast_1d(x)
+        n = len(x)
+        if self.count + n > len(self.x):
+            self._allocate(max(2 * len(self.x), self.count + n))
+        s = slice(self.count, self.count + n)
+        self.x[s] = x
+        self.y[s] = y
+        self.speed[s] = speed
+        self.radius[s] = radius
+        self.color[s] = color
+        self.alive[s] = True
+        self.count += n
+
+    #direction -1 moves up (balloons), +1 moves down (droplets)
+    def move(self, direction=1, dt=1.0):
+        n = self.count
+        self.y[:n] += direction * self.speed[:n] * dt
+
+    def hit_point(self, px, py):
+        n = self.count
+        dx = self.x[:n] - px
+        dy = self.y[:n] - py
+        r = self.radius[:n]
+        return self.alive[:n] & (dx * dx + dy * dy < r * r)
+
+    def in_rect(self, rx, ry, rw, rh):
+        n = self.count
+        x, y = self.x[:n], self.y[:n]
+        return self.alive[:n] & (rx < x) & (x < rx + rw) & (ry < y) & (y < ry + rh)
+
+    def kill(self, mask):
+        self.alive[:self.count][mask] = False
+
+    #keep live entities for which `keep` holds, in their original order
+    def compact(self, keep=None):
+        n = self.count
+        keep = self.alive[:n] if keep is None else self.alive[:n] & keep
+        k = int(keep.sum())
+        if k == n:
+            return
+        for arr in (self.x, self.y, self.speed, self.radius, self.color, self.alive):
+            arr[:k] = arr[:n][keep]
+        self.count = k
+
+    def positions(self, mask=None):
+        n = self.count
+        xs, ys = self.x[:n], self.y[:n]
+        if mask is not None:
+            xs, ys = xs[mask], ys[mask]
+        return np.stack([xs, ys], axis=1).astype(np.int32)
+
+    def draw(self, img):
+        n = self.count
+        alive = self.alive[:n]
+        xs = self.x[:n][alive].astype(np.int32).tolist()
+        ys = self.y[:n][alive].astype(np.int32).tolist()
+        radii = self.radius[:n][alive].tolist()
+        colors = self.color[:n][alive].tolist()
+        for x, y, r, c in zip(xs, ys, radii, colors):
+            cv2.circle(img, (x, y), r, c, -1)
+
+    #sprite(color, radius) gives the Sprite drawn centred on each live entity
+    def draw_sprites(self, img, sprite):
+        n = self.count
+        alive = self.alive[:n]
+        xs = self.x[:n][alive].astype(np.int32).tolist()
+        ys = self.y[:n][alive].astype(np.int32).tolist()
+        radii = self.radius[:n][alive].tolist()
+        colors = self.color[:n][alive].tolist()
+        for x, y, r, c in zip(xs, ys, radii, colors):
+            sprite(tuple(c), r).blit(img, x, y)
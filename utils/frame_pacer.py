@@ -0,0 +1,73 @@
+import time
+
+import cv2
+
+from utils.settings import TARGET_FPS
+
+
+#waits out whatever is left of the frame budget while polling the keyboard, instead of a
+#fixed waitKey delay on top of capture and inference. a late frame starts a new schedule
+#from now rather than rushing the next frames to catch up
+class FramePacer:
+    def __init__(self, fps=TARGET_FPS, time_fn=time.perf_counter, wait_key=cv2.waitKey):
+        self.interval = 1.0 / fps if fps else 0.0
+        self.time_fn = time_fn
+        self.wait_key = wait_key
+        self.deadline = None
+        self.frames = 0
+        self.missed = 0
+        self.late_total = 0.0
+        self.last = None  #previous wait when unpaced
+        self.elapsed = 0.0
+
+    def reset(self):
+        self.deadline = None
+        self.last = None
+
+    #returns the key pressed (0-255, 255 for none) once the current frame's deadline is reached
+    def wait(self):
+        now = self.time_fn()
+        if not self.interval:
+            #unpaced (fps 0): no deadline to miss, only the frame rate is kept
+            if self.last is not None:
+                self.frames += 1
+                self.elapsed += now - self.last
+            self.last = now
+            return self.wait_key(1) & 0xFF
+        if self.deadline is None:
+            #nothing to pace against yet, the schedule starts with this frame
+            self.deadline = now + self.interval
+            return self.wait_key(1) & 0xFF
+        remaining = self.deadline - now
+        self.frames += 1
+
+        if remaining > 0:
+            #waitKey needs at least 1 ms to pump window events
+            key = self.wait_key(max(1, int(remaining * 1000)))
+            self.deadline += self.interval
+        else:
+            key = self.wait_key(1)
+            self.missed += 1
+            self.late_total -= remaining
+            self.deadline = self.time_fn() + self.interval
+        return key & 0xFF
+
+    def stats(self):
+        return {
+            "target_fps": round(1.0 / self.interval, 1) if self.interval else None,
+            "frames": self.frames,
+            "fps": round(self.frames / self.elapsed, 1) if self.elapsed else None,
+            "missed": self.missed,
+            "missed_pct": round(100.0 * self.missed / self.frames, 1) if self.frames else 0.0,
+            "mean_late_ms": round(1000 * self.late_total / self.missed, 2) if self.missed else 0.0,
+        }
+
+    def report(self, name):
+        s = self.stats()
+        if not s["frames"]:
+            return
+        if not self.interval:
+            print(f"⏱️ {name}: {s['frames']} frames unpaced at {s['fps']} FPS")
+        else:
+            print(f"⏱️ {name}: {s['missed']}/{s['frames']} frames missed the {s['target_fps']} FPS deadline "
+                  f"({s['missed_pct']}%, {s['mean_late_ms']} ms late on average)")
@@ -0,0 +1,200 @@
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.settings import WINDOW_WIDTH, WINDOW_HEIGHT
+
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+BLOCK = "block"
+DROP_POLICIES = (DROP_OLDEST, DROP_NEWEST, BLOCK)
+
+
+def synthetic_frames(width=WINDOW_WIDTH, height=WINDOW_HEIGHT, count=None, fps=None):
+    #moving blob on a grey background, for machines without a camera
+    base = np.full((height, width, 3), 60, np.uint8)
+    i = 0
+    while count is None or i < count:
+        frame = base.copy()
+        x = int(width / 2 + width / 3 * np.sin(i / 30))
+        y = int(height / 2 + height / 3 * np.cos(i / 45))
+        cv2.circle(frame, (x, y), 40, (180, 200, 230), -1)
+        if fps:
+            time.sleep(1 / fps)
+        yield frame
+        i += 1
+
+
+#background capture thread feeding a small ring buffer, read() mirrors cv2.VideoCapture.read()
+#source can be a camera index, a video file path or an iterable/callable producing BGR frames
+class FrameSource:
+    def __init__(self, source=0, width=WINDOW_WIDTH, height=WINDOW_HEIGHT, buffer_size=1,
+                 drop_policy=DROP_OLDEST, api=None, realtime=False):
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"Unknown drop policy: {drop_policy}")
+
+        self.source = source
+        self.drop_policy = drop_policy
+        self.realtime = realtime
+        self.buffer = deque(maxlen=max(1, buffer_size))
+        self.cond = threading.Condition()
+
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self.frames_read = 0
+        self.last_latency = 0.0
+        self.first_read_time = None
+        self.finished = False
+        self.running = True
+
+        self.cap = None
+        self.frames = None
+        if isinstance(source, int):
+            self.cap = cv2.VideoCapture(source) if api is None else cv2.VideoCapture(source, api)
+            self.cap.set(3, width)
+            self.cap.set(4, height)
+            self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30
+        elif isinstance(source, str):
+            self.cap = cv2.VideoCapture(source)
+            self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30
+        else:
+            self.frames = iter(source() if callable(source) else source)
+            self.fps = 30
+
+        self.thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self.thread.start()
+
+    def _grab(self):
+        if self.cap is not None:
+            return self.cap.read()
+        try:
+            return True, next(self.frames)
+        except StopIteration:
+            return False, None
+
+    def _capture_loop(self):
+        period = 1 / self.fps
+        next_time = time.perf_counter()
+        while self.running:
+            success, frame = self._grab()
+            if not success:
+                break
+            if self.realtime and self.cap is not None and not isinstance(self.source, int):
+                #play video files at their native rate instead of as fast as possible
+                next_time += period
+                delay = next_time - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            self._push(frame, time.perf_counter())
+
+        with self.cond:
+            self.finished = True
+            self.cond.notify_all()
+
+    def _push(self, frame, timestamp):
+        with self.cond:
+            self.frames_captured += 1
+            if len(self.buffer) == self.buffer.maxlen:
+                if self.drop_policy == BLOCK:
+                    while self.running and len(self.buffer) == self.buffer.maxlen:
+                        self.cond.wait()
+                elif self.drop_policy == DROP_NEWEST:
+                    self.frames_dropped += 1
+                    return
+                else:
+                    self.frames_dropped += 1
+            self.buffer.append((frame, timestamp))
+            self.cond.notify_all()
+
+    #cameras can take several seconds to deliver their first frame, only later frames are expected
+    #within `timeout`
+    def read(self, timeout=2.0, first_timeout=30.0):
+        #waits for a frame we have not handed out yet
+        with self.cond:
+            deadline = time.perf_counter() + (first_timeout if self.frames_read == 0 else timeout)
+            while not self.buffer and not self.finished and self.running:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    return False, None
+                self.cond.wait(remaining)
+            if not self.buffer:
+                return False, None
+            frame, timestamp = self.buffer.popleft()
+            self.cond.notify_all()
+
+        now = time.perf_counter()
+        self.frames_read += 1
+        self.last_latency = now - timestamp
+        if self.first_read_time is None:
+            self.first_read_time = now
+        return True, frame
+
+    #forget the first-read timestamp, used to time how long a game takes to pull its first frame
+    def mark(self):
+        self.first_read_time = None
+
+    def isOpened(self):
+        return self.running and not (self.finished and not self.buffer)
+
+    def stats(self):
+        return {
+            "captured": self.frames_captured,
+            "read": self.frames_read,
+            "dropped": self.frames_dropped,
+            "last_latency_ms": round(self.last_latency * 1000, 2),
+        }
+
+    def release(self):
+        with self.cond:
+            self.running = False
+            self.cond.notify_all()
+        self.thread.join(timeout=1.0)
+        if self.cap is not None:
+            self.cap.release()
+
+
+def source_from_args(argv=None):
+    #"synthetic", a camera index or a video file path
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        return 0
+    arg = argv[0]
+    if arg == "synthetic":
+        return synthetic_frames
+    if arg.isdigit():
+        return int(arg)
+    return arg
+
+
+def measure_throughput(source, frames=300, work_ms=0):
+    #reads frames while simulating `work_ms` of per-frame processing
+    src = FrameSource(source)
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(frames):
+        success, _frame = src.read()
+        if not success:
+            break
+        latencies.append(src.last_latency)
+        if work_ms:
+            time.sleep(work_ms / 1000)
+    elapsed = time.perf_counter() - start
+    src.release()
+
+    stats = src.stats()
+    stats["fps"] = round(len(latencies) / elapsed, 1) if elapsed else 0
+    if latencies:
+        stats["p50_latency_ms"] = round(float(np.percentile(latencies, 50)) * 1000, 2)
+        stats["p95_latency_ms"] = round(float(np.percentile(latencies, 95)) * 1000, 2)
+    return stats
+
+
+if __name__ == "__main__":
+    print(measure_throughput(source_from_args(), work_ms=20))
@@ -0,0 +1,75 @@
+import time
+
+#gameplay constants were tuned per frame, and the old loops ran at roughly this rate: waitKey(30)
+#plus ~20 ms of inference and drawing per frame. per-frame values are scaled by it so speeds match
+REFERENCE_FPS = 20
+#the simulation step is independent of REFERENCE_FPS, a finer step only smooths movement
+SIM_STEP = 1 / 30
+
+
+#fixed-timestep simulation clock: each rendered frame runs however many whole steps of
+#real (or injected) time have passed, so movement and spawning do not depend on frame rate
+class FixedStepClock:
+    def __init__(self, step=SIM_STEP, max_steps=8, time_fn=time.perf_counter):
+        self.step = step
+        self.max_steps = max_steps  #caps catch-up after a stall instead of fast-forwarding through it
+        self.time_fn = time_fn
+        self.reset()
+
+    def reset(self):
+        self.last = self.time_fn()
+        self.accumulator = 0.0
+        self.steps = 0
+
+    #simulated seconds since reset
+    @property
+    def time(self):
+        return self.steps * self.step
+
+    #number of steps due this frame, each one is then run with tick()
+    def advance(self):
+        now = self.time_fn()
+        self.accumulator += now - self.last
+        self.last = now
+        n = int(self.accumulator / self.step + 1e-9)
+        if n > self.max_steps:
+            n = self.max_steps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= n * self.step
+        return n
+
+    #moves simulated time forward by one step and returns its length
+    def tick(self):
+        self.steps += 1
+        return self.step
+
+
+#stand-in for time.perf_counter, auto_step moves time forward on every read so a
+#simulation can run a fixed amount of game time per frame, faster than real time
+class ManualTime:
+    def __init__(self, start=0.0, auto_step=0.0):
+        self.t = start
+        self.auto_step = auto_step
+
+    def __call__(self):
+        t = self.t
+        self.t += self.auto_step
+        return t
+
+    def advance(self, dt):
+        self.t += dt
+
+
+#fires every `interval` simulated seconds, due() returns how many times since the last call
+class SpawnTimer:
+    def __init__(self, interval, start=0.0):
+        self.interval = interval
+        self.next_time = start
+
+    def due(self, now):
+        if now < self.next_time:
+            return 0
+        n = int((now - self.next_time) / self.interval) + 1
+        self.next_time += n * self.interval
+        return n
@@ -0,0 +1,119 @@
+from collections import namedtuple
+
+import numpy as np
+
+from utils.path_scoring import PathScorer
+from utils.settings import WINDOW_WIDTH, WINDOW_HEIGHT
+
+
+def _edges(points, closed):
+    pts = np.asarray(points, np.float64).reshape(-1, 2)
+    ends = np.roll(pts, -1, axis=0) if closed else pts[1:]
+    return pts[:len(ends)], ends - pts[:len(ends)]
+
+
+#points every `step` pixels along each edge, each edge's end left to the next edge; an open path
+#ends on its last point
+def interpolate_polygon(points, step=5, closed=True):
+    starts, vecs = _edges(points, closed)
+    if len(starts) == 0:
+        return np.asarray(points, np.int64).reshape(-1, 2)
+    steps = np.maximum((np.hypot(vecs[:, 0], vecs[:, 1]) / step).astype(np.int64), 1)
+    edge = np.repeat(np.arange(len(starts)), steps)
+    j = np.arange(len(edge)) - np.repeat(np.cumsum(steps) - steps, steps)
+    dense = (starts[edge] + vecs[edge] * (j / steps[edge])[:, None]).astype(np.int64)
+    if not closed:
+        dense = np.concatenate([dense, (starts[-1:] + vecs[-1:]).astype(np.int64)])
+    return dense
+
+
+#steps_per_edge points on every edge, both ends included
+def interpolate_edges(points, steps_per_edge=20, closed=True):
+    starts, vecs = _edges(points, closed)
+    t = np.linspace(0, 1, steps_per_edge)
+    return (starts[:, None] + vecs[:, None] * t[None, :, None]).reshape(-1, 2).astype(np.int64)
+
+
+#n (or every `spacing` pixels) evenly spaced points by arc length along a polyline
+def resample_arc_length(points, spacing=None, n=None):
+    pts = np.asarray(points, np.float64).reshape(-1, 2)
+    if len(pts) < 2:
+        return pts.copy()
+    seg = np.hypot(*np.diff(pts, axis=0).T)
+    s = np.concatenate([[0.0], np.cumsum(seg)])
+    if n is None:
+        n = max(int(s[-1] / spacing), 1) + 1
+    targets = np.linspace(0, s[-1], n)
+    return np.column_stack([np.interp(targets, s, pts[:, 0]), np.interp(targets, s, pts[:, 1])])
+
+
+#keeps a point only once it is at least `step` away from the last kept one
+def resample_points(points, step=5):
+    pts = np.asarray(points)
+    if len(pts) == 0:
+        return pts.reshape(0, 2)
+    keep = [0]
+    lx, ly = pts[0].tolist()
+    step2 = step * step
+    for i, (x, y) in enumerate(pts[1:].tolist(), 1):
+        if (x - lx) ** 2 + (y - ly) ** 2 >= step2:
+            keep.append(i)
+            lx, ly = x, y
+    return pts[keep]
+
+
+#indices of the points Ramer-Douglas-Peucker keeps, endpoints included
+def rdp_indices(points, tolerance):
+    n = len(points)
+    if n < 3:
+        return np.arange(n)
+    pts = np.asarray(points, np.float64)
+    keep = np.zeros(n, bool)
+    keep[[0, n - 1]] = True
+    stack = [(0, n - 1)]
+    while stack:
+        a, b = stack.pop()
+        if b - a < 2:
+            continue
+        seg = pts[b] - pts[a]
+        rel = pts[a + 1:b] - pts[a]
+        length = np.hypot(*seg)
+        if length:
+            dist = np.abs(seg[0] * rel[:, 1] - seg[1] * rel[:, 0]) / length
+        else:
+            dist = np.hypot(rel[:, 0], rel[:, 1])
+        i = int(np.argmax(dist))
+        if dist[i] > tolerance:
+            mid = a + 1 + i
+            keep[mid] = True
+            stack.append((a, mid))
+            stack.append((mid, b))
+    return np.flatnonzero(keep)
+
+
+LevelPath = namedtuple("LevelPath", ["points", "ideal", "scorer"])
+
+
+#a level's target points, dense ideal path and distance-transform scorer, built once per
+#(level, frame size); levels above fixed_levels are random and always rebuilt
+class LevelPathCache:
+    def __init__(self, generate, densify, fixed_levels):
+        self.generate = generate
+        self.densify = densify
+        self.fixed_levels = fixed_levels
+        self.paths = {}
+
+    def _build(self, level, frame_size):
+        points = tuple(tuple(int(v) for v in p) for p in self.generate(level, frame_size))
+        ideal = self.densify(points)
+        ideal.flags.writeable = False  #shared by every game that plays this level
+        return LevelPath(points, ideal, PathScorer(ideal))
+
+    def get(self, level, frame_size=(WINDOW_WIDTH, WINDOW_HEIGHT)):
+        if level > self.fixed_levels:
+            return self._build(level, frame_size)
+        key = (level, tuple(frame_size))
+        path = self.paths.get(key)
+        if path is None:
+            path = self.paths[key] = self._build(level, frame_size)
+        return path
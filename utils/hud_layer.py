@@ -0,0 +1,346 @@
+import cv2
+import numpy as np
+
+from utils.settings import FONT, FONT_SCALE, THICKNESS, WHITE
+
+
+#one rendered HUD element; hard-edged sprites keep a 0/255 mask, soft ones keep 255 - alpha per
+#channel with premultiplied colour so they can be blended with a multiply and an add
+class _Sprite:
+    __slots__ = ("args", "rgb", "alpha", "x0", "y0", "x1", "y1", "soft")
+    live = False
+
+    def __init__(self, args, rgb, alpha, x, y, soft):
+        self.args = args
+        self.rgb = rgb
+        self.soft = soft
+        self.alpha = cv2.cvtColor(cv2.subtract(255, alpha), cv2.COLOR_GRAY2BGR) if soft else alpha
+        self.x0, self.y0 = x, y
+        self.x1, self.y1 = x + rgb.shape[1], y + rgb.shape[0]
+
+
+def _text_sprite(text, color, scale, thickness, antialias):
+    (tw, th), baseline = cv2.getTextSize(text, FONT, scale, thickness)
+    pad = thickness + 2
+    h, w = th + baseline + 2 * pad, tw + 2 * pad
+    alpha = np.zeros((h, w), np.uint8)
+    #the same line type putText uses when the element is drawn live, so it looks the same either way
+    line = cv2.LINE_AA if antialias else cv2.LINE_8
+    cv2.putText(alpha, text, (pad, th + pad), FONT, scale, 255, thickness, line)
+    if antialias:
+        #drawn on black, the antialiased edges come out premultiplied by their own coverage
+        rgb = np.zeros((h, w, 3), np.uint8)
+        cv2.putText(rgb, text, (pad, th + pad), FONT, scale, color, thickness, line)
+    else:
+        #hard edges keep the sprite on the masked-copy path, only masked pixels are ever copied
+        rgb = np.empty((h, w, 3), np.uint8)
+        rgb[:] = color
+    return rgb, alpha, (-pad, -th - pad)
+
+
+#an element drawn straight onto every frame, only its bounds are kept
+class _Live:
+    __slots__ = ("args", "x0", "y0", "x1", "y1")
+    live = True
+
+    def __init__(self, args, x0, y0, x1, y1):
+        self.args = args
+        self.x0, self.y0, self.x1, self.y1 = x0, y0, x1, y1
+
+
+def _rect_sprite(w, h, color, thickness, opacity):
+    rgb = np.zeros((h, w, 3), np.uint8)
+    alpha = np.zeros((h, w), np.uint8)
+    inset = (max(thickness, 0) + 1) // 2  #thick outlines grow outward by half their width
+    p1, p2 = (inset, inset), (w - 1 - inset, h - 1 - inset)
+    cv2.rectangle(alpha, p1, p2, int(255 * opacity), thickness)
+    cv2.rectangle(rgb, p1, p2, tuple(int(c * opacity) for c in color), thickness)
+    return rgb, alpha
+
+
+#the sprite for an element's arguments, None for a rect with nothing to show
+def _render(args):
+    if args[0] == "text":
+        _, text, pos, color, scale, thickness, antialias = args
+        rgb, alpha, (dx, dy) = _text_sprite(text, color, scale, thickness, antialias)
+        return _Sprite(args, rgb, alpha, pos[0] + dx, pos[1] + dy, antialias)
+    _, top_left, bottom_right, color, thickness, opacity = args
+    pad = (max(thickness, 0) + 1) // 2
+    w, h = bottom_right[0] - top_left[0] + 1 + 2 * pad, bottom_right[1] - top_left[1] + 1 + 2 * pad
+    if w <= 0 or h <= 0:
+        return None
+    rgb, alpha = _rect_sprite(w, h, color, thickness, opacity)
+    return _Sprite(args, rgb, alpha, top_left[0] - pad, top_left[1] - pad, opacity < 1)
+
+
+#the same element drawn with putText/rectangle, covering the same bounds as its sprite
+def _render_live(args):
+    if args[0] == "text":
+        _, text, pos, color, scale, thickness, antialias = args
+        (tw, th), baseline = cv2.getTextSize(text, FONT, scale, thickness)
+        pad = thickness + 2
+        return _Live(args, pos[0] - pad, pos[1] - th - pad, pos[0] + tw + pad, pos[1] + baseline + pad)
+    _, top_left, bottom_right, color, thickness, opacity = args
+    pad = (max(thickness, 0) + 1) // 2
+    if bottom_right[0] < top_left[0] or bottom_right[1] < top_left[1]:
+        return None
+    return _Live(args, top_left[0] - pad, top_left[1] - pad, bottom_right[0] + 1 + pad, bottom_right[1] + 1 + pad)
+
+
+def _draw_live(img, args):
+    if args[0] == "text":
+        _, text, pos, color, scale, thickness, antialias = args
+        cv2.putText(img, text, pos, FONT, scale, color, thickness, cv2.LINE_AA if antialias else cv2.LINE_8)
+    else:
+        _, top_left, bottom_right, color, thickness, _ = args
+        cv2.rectangle(img, top_left, bottom_right, color, thickness)
+
+
+#rows y0:y1 and columns x0:x1 of a sprite over the frame
+def _blit(img, s, x0, y0, x1, y1):
+    src = s.rgb[y0 - s.y0:y1 - s.y0, x0 - s.x0:x1 - s.x0]
+    alpha = s.alpha[y0 - s.y0:y1 - s.y0, x0 - s.x0:x1 - s.x0]
+    roi = img[y0:y1, x0:x1]
+    if s.soft:
+        cv2.multiply(roi, alpha, dst=roi, scale=1 / 255)
+        cv2.add(roi, src, dst=roi)
+    else:
+        cv2.copyTo(src, alpha, roi)
+
+
+def _translucent(args):
+    return args[0] == "rect" and args[5] < 1
+
+
+#opaque rects and antialiased text are drawn live all the time: rectangle is cheaper than a masked
+#copy of its box, and putText blends only the glyph pixels where a cached sprite blends its whole box
+def _always_live(args):
+    return args[0] == "rect" and args[5] >= 1 or args[0] == "text" and args[6]
+
+
+def _overlap(a, b):
+    return a.x0 < b.x1 and b.x0 < a.x1 and a.y0 < b.y1 and b.y0 < a.y1
+
+
+#elements whose arguments changed on LIVE_AFTER composites in a row (an accuracy readout while
+#drawing) would be re-rendered and re-flattened every frame, costing more than drawing them directly.
+#they are drawn straight onto the frame instead and go back into the layer once they hold still for
+#LIVE_SETTLE composites. translucent rects always stay in the layer, and so does anything under one
+LIVE_AFTER = 3
+LIVE_SETTLE = 30
+
+
+#overlapping boxes merged until none overlap, so no pixel is blended twice
+def _merge_boxes(boxes):
+    merged = []
+    for box in boxes:
+        while True:
+            for i, (x0, y0, x1, y1) in enumerate(merged):
+                if x0 < box[2] and box[0] < x1 and y0 < box[3] and box[1] < y1:
+                    box = (min(x0, box[0]), min(y0, box[1]), max(x1, box[2]), max(y1, box[3]))
+                    del merged[i]
+                    break
+            else:
+                break
+        merged.append(box)
+    return merged
+
+
+#HUD elements rendered once into sprites and flattened into one frame-sized layer. an element is
+#only re-rendered when its arguments change. per frame the opaque pixels go on with one masked
+#copy and only translucent elements are alpha blended on top. opaque rects, antialiased text and
+#elements that change every frame are drawn directly (see _always_live and LIVE_AFTER)
+class HudLayer:
+    def __init__(self):
+        self.elements = {}  #key -> _Sprite, drawn in insertion order
+        self.color = None
+        self.inv_alpha = None  #255 - alpha, 3 channels so it multiplies the frame directly
+        self.opaque = None  #255 where the layer fully covers the frame
+        self.soft_boxes = []  #disjoint boxes covering every element with partial alpha
+        self.bbox = None  #union of all elements, the masked copy is limited to it
+        self.dirty = []
+        self.frame = 0  #composites so far
+        self.changes = {}  #key -> (frame of its last change, changes in a row)
+        self.live = 0
+        self.live_plan = None  #live element args, each with the later layer sprites that cover it
+
+    #antialiased like draw_text, antialias=False gives hard glyph edges that cost one masked copy like rects
+    def text(self, key, text, pos=(50, 50), color=WHITE, scale=FONT_SCALE, thickness=THICKNESS, antialias=True):
+        self._update(key, ("text", text, pos, color, scale, thickness, antialias))
+
+    #thickness -1 fills, opacity < 1 gives translucent panels
+    def rect(self, key, top_left, bottom_right, color, thickness=1, opacity=1.0):
+        self._update(key, ("rect", top_left, bottom_right, color, thickness, opacity))
+
+    def _update(self, key, args):
+        element = self.elements.get(key)
+        if element is not None and element.args == args:
+            return
+        last, streak = self.changes.get(key, (None, 0))
+        streak = streak + 1 if last is not None and self.frame - last <= 1 else 1
+        self.changes[key] = (self.frame, streak)
+        element = None
+        if (streak >= LIVE_AFTER or _always_live(args)) and not _translucent(args):
+            element = _render_live(args)
+            if element is not None and self._covered_by_soft(key, element):
+                element = None
+        if element is None:
+            element = _render(args)
+        if element is None:
+            self.remove(key)
+        else:
+            self._set(key, element)
+
+    #a live element is drawn after the layer, a later translucent element would end up under it
+    def _covered_by_soft(self, key, bounds):
+        after = False
+        for k, s in self.elements.items():
+            if k == key:
+                after = True
+            elif after and not s.live and s.soft and _overlap(s, bounds):
+                return True
+        return False
+
+    def remove(self, key):
+        element = self.elements.pop(key, None)
+        self.changes.pop(key, None)
+        if element is None:
+            return
+        self.live_plan = None
+        if element.live:
+            self.live -= 1
+        else:
+            self.dirty.append((element.x0, element.y0, element.x1, element.y1))
+
+    def clear(self):
+        for key in list(self.elements):
+            self.remove(key)
+
+    def _set(self, key, sprite):
+        old = self.elements.get(key)
+        self.live += sprite.live - (old is not None and old.live)
+        self.live_plan = None
+        if old is not None and old.live and sprite.live:
+            pass  #nothing of either is in the layer
+        elif old is None:
+            self.dirty.append((sprite.x0, sprite.y0, sprite.x1, sprite.y1))
+        else:
+            #a changed value usually covers the same spot, repaint both in one pass
+            self.dirty.append((min(sprite.x0, old.x0), min(sprite.y0, old.y0),
+                               max(sprite.x1, old.x1), max(sprite.y1, old.y1)))
+        self.elements[key] = sprite
+        if not sprite.live and sprite.soft and self.live:
+            #earlier live elements under a translucent one go back into the layer to be blended in order
+            for k, e in list(self.elements.items()):
+                if k == key:
+                    break
+                if e.live and _overlap(e, sprite):
+                    self._set(k, _render(e.args))
+
+    def _ensure_size(self, shape):
+        h, w = shape[:2]
+        if self.color is None or self.color.shape[:2] != (h, w):
+            self.color = np.zeros((h, w, 3), np.uint8)
+            self.inv_alpha = np.full((h, w, 3), 255, np.uint8)
+            self.opaque = np.zeros((h, w), np.uint8)
+            self.dirty = [(0, 0, w, h)]
+            self.live_plan = None
+
+    #repaints the changed regions from every sprite that overlaps them
+    def _flatten(self):
+        h, w = self.color.shape[:2]
+        for rx0, ry0, rx1, ry1 in self.dirty:
+            rx0, ry0, rx1, ry1 = max(rx0, 0), max(ry0, 0), min(rx1, w), min(ry1, h)
+            if rx0 >= rx1 or ry0 >= ry1:
+                continue
+            self.color[ry0:ry1, rx0:rx1] = 0
+            self.inv_alpha[ry0:ry1, rx0:rx1] = 255
+            self.opaque[ry0:ry1, rx0:rx1] = 0
+            for s in self.elements.values():
+                x0, y0, x1, y1 = max(s.x0, rx0), max(s.y0, ry0), min(s.x1, rx1), min(s.y1, ry1)
+                if s.live or x0 >= x1 or y0 >= y1:
+                    continue
+                src = s.rgb[y0 - s.y0:y1 - s.y0, x0 - s.x0:x1 - s.x0]
+                alpha = s.alpha[y0 - s.y0:y1 - s.y0, x0 - s.x0:x1 - s.x0]
+                dst = self.color[y0:y1, x0:x1]
+                inv = self.inv_alpha[y0:y1, x0:x1]
+                opaque = self.opaque[y0:y1, x0:x1]
+                if s.soft:
+                    #sprite over what is already there, both premultiplied
+                    cv2.add(src, cv2.multiply(dst, alpha, scale=1 / 255), dst=dst)
+                    cv2.multiply(inv, alpha, dst=inv, scale=1 / 255)
+                    cv2.compare(inv[..., 0], 0, cv2.CMP_EQ, dst=opaque)
+                else:
+                    cv2.copyTo(src, alpha, dst)
+                    cv2.subtract(inv, (255, 255, 255), dst=inv, mask=alpha)
+                    cv2.bitwise_or(opaque, alpha, dst=opaque)
+        self.dirty = []
+
+        self.soft_boxes = []
+        bx0 = by0 = bx1 = by1 = None
+        for s in self.elements.values():
+            x0, y0, x1, y1 = max(s.x0, 0), max(s.y0, 0), min(s.x1, w), min(s.y1, h)
+            if s.live or x0 >= x1 or y0 >= y1:
+                continue
+            if s.soft:
+                self.soft_boxes.append((x0, y0, x1, y1))
+            if bx0 is None:
+                bx0, by0, bx1, by1 = x0, y0, x1, y1
+            else:
+                bx0, by0, bx1, by1 = min(bx0, x0), min(by0, y0), max(bx1, x1), max(by1, y1)
+        self.soft_boxes = _merge_boxes(self.soft_boxes)
+        self.bbox = None if bx0 is None else (bx0, by0, bx1, by1)
+
+    def composite(self, img):
+        self._ensure_size(img.shape)
+        self.frame += 1
+        if self.live:
+            self._settle()
+        if self.dirty:
+            self._flatten()
+        if self.bbox is not None:
+            x0, y0, x1, y1 = self.bbox
+            roi = img[y0:y1, x0:x1]
+            cv2.copyTo(self.color[y0:y1, x0:x1], self.opaque[y0:y1, x0:x1], roi)
+            for x0, y0, x1, y1 in self.soft_boxes:
+                roi = img[y0:y1, x0:x1]
+                cv2.multiply(roi, self.inv_alpha[y0:y1, x0:x1], dst=roi, scale=1 / 255)
+                cv2.add(roi, self.color[y0:y1, x0:x1], dst=roi)
+        if self.live:
+            self._draw_live(img)
+        return img
+
+    #live elements that held still go back into the layer
+    def _settle(self):
+        for key, element in list(self.elements.items()):
+            if not element.live or _always_live(element.args):
+                continue
+            if self.frame - self.changes[key][0] > LIVE_SETTLE:
+                self.changes.pop(key)
+                self._set(key, _render(element.args))
+
+    #live elements in order, each followed by the layer's later elements that cover it
+    def _draw_live(self, img):
+        if self.live_plan is None:
+            self.live_plan = self._plan_live(*img.shape[:2])
+        for args, covers in self.live_plan:
+            _draw_live(img, args)
+            for s, box in covers:
+                _blit(img, s, *box)
+
+    def _plan_live(self, h, w):
+        plan = []
+        later = []  #layer sprites after the current element
+        for element in reversed(list(self.elements.values())):
+            if not element.live:
+                later.append(element)
+                continue
+            covers = []
+            for s in reversed(later):
+                x0, y0 = max(s.x0, element.x0, 0), max(s.y0, element.y0, 0)
+                x1, y1 = min(s.x1, element.x1, w), min(s.y1, element.y1, h)
+                if x0 < x1 and y0 < y1:
+                    covers.append((s, (x0, y0, x1, y1)))
+            plan.append((element.args, covers))
+        plan.reverse()
+        return plan
@@ -0,0 +1,73 @@
+import cv2
+import numpy as np
+
+
+#distance-transform lookup of the nearest ideal point, built once per level
+class PathScorer:
+    def __init__(self, ideal_points, max_dist=50):
+        self.max_dist = max_dist
+        ideal = np.asarray(ideal_points, np.int32).reshape(-1, 2)
+
+        #only the bounding box of the ideal path plus max_dist matters,
+        #anything outside it is at least max_dist away and scores 0
+        pad = int(np.ceil(max_dist)) + 1
+        self.origin = ideal.min(axis=0) - pad
+        size = ideal.max(axis=0) - self.origin + pad + 1
+
+        grid = np.ones((size[1], size[0]), np.uint8)
+        local = ideal - self.origin
+        grid[local[:, 1], local[:, 0]] = 0
+        self.dist = cv2.distanceTransform(grid, cv2.DIST_L2, cv2.DIST_MASK_PRECISE)
+        self.size = size
+
+    def distances(self, points):
+        pts = np.asarray(points).reshape(-1, 2).astype(np.int64) - self.origin
+        inside = (pts[:, 0] >= 0) & (pts[:, 1] >= 0) & (pts[:, 0] < self.size[0]) & (pts[:, 1] < self.size[1])
+        out = np.full(len(pts), np.inf, np.float32)
+        out[inside] = self.dist[pts[inside, 1], pts[inside, 0]]
+        return out
+
+    def point_scores(self, points):
+        return np.clip(1 - self.distances(points) / self.max_dist, 0, 1)
+
+    def accuracy(self, drawn_points):
+        if len(drawn_points) == 0:
+            return 0
+        return round(float(self.point_scores(drawn_points).mean()) * 100, 2)
+
+
+def calculate_accuracy(drawn_points, ideal_points, max_dist=50):
+    return PathScorer(ideal_points, max_dist).accuracy(drawn_points)
+
+
+#running accuracy for the live meter, only newly appended points get scored
+class IncrementalAccuracy:
+    def __init__(self, scorer):
+        self.scorer = scorer
+        self.total = 0.0
+        self.count = 0
+
+    def add(self, points):
+        scores = self.scorer.point_scores(points)
+        self.total += float(scores.sum())
+        self.count += len(scores)
+        return self.value
+
+    @property
+    def value(self):
+        if self.count == 0:
+            return 0
+        return round(self.total / self.count * 100, 2)
+
+    def reset(self, scorer=None):
+        if scorer is not None:
+            self.scorer = scorer
+        self.total = 0.0
+        self.count = 0
+
+    #final score uses the resampled stroke, the meter jumps to it on SPACE
+    def reconcile(self, resampled_points):
+        final = self.scorer.accuracy(resampled_points)
+        self.total = final / 100 * len(resampled_points)
+        self.count = len(resampled_points)
+        return final
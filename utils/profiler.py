@@ -0,0 +1,112 @@
+import csv
+import os
+import time
+
+import cv2
+import numpy as np
+
+from utils.settings import FONT
+
+#upper bounds in ms, the last bucket catches everything slower
+BUCKETS_MS = (0.5, 1, 2, 5, 10, 20, 33, 50, 100, 250, float("inf"))
+
+
+#rolling per-stage frame timings, start()/stop() cost two cheap calls when disabled
+class StageProfiler:
+    def __init__(self, enabled=False, window=300):
+        self.enabled = enabled
+        self.window = window
+        self.show_overlay = False
+        self.stages = {}  #stage -> ring buffer of the last `window` durations in seconds
+        self.counts = {}
+        self.totals = {}
+        self.histograms = {}
+
+    def start(self):
+        if not self.enabled:
+            return 0.0
+        return time.perf_counter()
+
+    def stop(self, stage, start):
+        if not self.enabled:
+            return
+        self.record(stage, time.perf_counter() - start)
+
+    def record(self, stage, seconds):
+        ring = self.stages.get(stage)
+        if ring is None:
+            ring = self.stages[stage] = np.zeros(self.window, np.float64)
+            self.counts[stage] = 0
+            self.totals[stage] = 0.0
+            self.histograms[stage] = np.zeros(len(BUCKETS_MS), np.int64)
+        n = self.counts[stage]
+        ring[n % self.window] = seconds
+        self.counts[stage] = n + 1
+        self.totals[stage] += seconds
+        self.histograms[stage][np.searchsorted(BUCKETS_MS, seconds * 1000)] += 1
+
+    def summary(self):
+        rows = {}
+        for stage, ring in self.stages.items():
+            n = min(self.counts[stage], self.window)
+            ms = ring[:n] * 1000
+            rows[stage] = {
+                "count": self.counts[stage],
+                "mean_ms": float(ms.mean()),
+                "p50_ms": float(np.percentile(ms, 50)),
+                "p95_ms": float(np.percentile(ms, 95)),
+                "max_ms": float(ms.max()),
+            }
+        return rows
+
+    def toggle_overlay(self):
+        self.show_overlay = not self.show_overlay
+
+    def draw_overlay(self, img, pos=(20, 260)):
+        if not (self.enabled and self.show_overlay):
+            return
+        x, y = pos
+        rows = self.summary()
+        cv2.rectangle(img, (x - 10, y - 25), (x + 380, y + 22 * len(rows)), (30, 30, 30), -1)
+        cv2.putText(img, "stage        p50 ms   p95 ms", (x, y - 5), FONT, 0.5, (255, 255, 255), 1)
+        for i, (stage, r) in enumerate(rows.items()):
+            text = f"{stage:<12} {r['p50_ms']:7.2f}  {r['p95_ms']:7.2f}"
+            cv2.putText(img, text, (x, y + 18 + i * 22), FONT, 0.5, (0, 255, 255), 1)
+
+    def export_csv(self, path):
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["stage", "count", "total_s", "mean_ms", "p50_ms", "p95_ms", "max_ms"]
+                            + [f"le_{b}" for b in BUCKETS_MS])
+            for stage, r in self.summary().items():
+                writer.writerow([stage, r["count"], round(self.totals[stage], 6), round(r["mean_ms"], 4),
+                                 round(r["p50_ms"], 4), round(r["p95_ms"], 4), round(r["max_ms"], 4)]
+                                + self.histograms[stage].tolist())
+
+    def export_prometheus(self, path, labels=None):
+        label_text = ",".join(f'{k}="{v}"' for k, v in (labels or {}).items())
+        lines = ["# HELP frame_stage_seconds Per-stage frame time", "# TYPE frame_stage_seconds histogram"]
+        for stage, hist in self.histograms.items():
+            base = f'stage="{stage}"' + (f",{label_text}" if label_text else "")
+            cumulative = np.cumsum(hist)
+            for bound, count in zip(BUCKETS_MS, cumulative):
+                le = "+Inf" if bound == float("inf") else f"{bound / 1000:g}"
+                lines.append(f'frame_stage_seconds_bucket{{{base},le="{le}"}} {count}')
+            lines.append(f"frame_stage_seconds_sum{{{base}}} {self.totals[stage]:.6f}")
+            lines.append(f"frame_stage_seconds_count{{{base}}} {self.counts[stage]}")
+        with open(path, "w") as f:
+            f.write("\n".join(lines) + "\n")
+
+    #writes <name>_<timestamp>.csv and .prom next to each other
+    def export(self, directory, name):
+        if not (self.enabled and self.stages):
+            return None
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, f"{name}_{time.strftime('%Y%m%d_%H%M%S')}")
+        self.export_csv(base + ".csv")
+        self.export_prometheus(base + ".prom", {"game": name})
+        print(f"📊 Frame timings saved to {base}.csv / .prom")
+        return base
+
+
+DISABLED_PROFILER = StageProfiler(enabled=False)
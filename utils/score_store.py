@@ -0,0 +1,149 @@
+import json
+import os
+import sqlite3
+import time
+
+from utils.settings import BASE_DIR, SCORES_DB_PATH, LEGACY_SCORE_FILES
+
+COLUMNS = ("game", "player", "score", "level", "avg_reaction_time", "time_elapsed")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    game TEXT,
+    player TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    level INTEGER,
+    avg_reaction_time REAL,
+    time_elapsed REAL,
+    created_at REAL,
+    source TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_game_player ON sessions (game, player);
+CREATE TABLE IF NOT EXISTS migrations (path TEXT PRIMARY KEY, rows INTEGER, migrated_at REAL);
+"""
+
+
+#append-only session history shared by every game, each save is one insert in its own transaction
+class ScoreStore:
+    def __init__(self, path=SCORES_DB_PATH, legacy_files=LEGACY_SCORE_FILES):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        #WAL lets several stations append while others read
+        self.conn = sqlite3.connect(path, timeout=10)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        if legacy_files:
+            self.migrate_json(legacy_files)
+
+    def _insert(self, record, created_at, source):
+        cur = self.conn.execute(
+            f"INSERT INTO sessions ({', '.join(COLUMNS)}, created_at, source) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [record.get(c) for c in COLUMNS] + [created_at, source],
+        )
+        return cur.lastrowid
+
+    def append(self, record):
+        with self.conn:
+            return self._insert(record, time.time(), None)
+
+    def query(self, game=None, player=None, since_id=0):
+        sql = f"SELECT id, {', '.join(COLUMNS)}, created_at FROM sessions WHERE id > ?"
+        args = [since_id]
+        if game is not None:
+            sql += " AND game = ?"
+            args.append(game)
+        if player is not None:
+            sql += " AND player = ?"
+            args.append(player)
+        cur = self.conn.execute(sql + " ORDER BY id", args)
+        names = [d[0] for d in cur.description]
+        return [dict(zip(names, row)) for row in cur]
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def _pending_migrations(self, paths):
+        migrated = {row[0] for row in self.conn.execute("SELECT path FROM migrations")}
+        return [p for p in paths if os.path.abspath(p) not in migrated and os.path.exists(p)]
+
+    #one-time import of the old scores.json files, the first file wins on duplicates
+    def migrate_json(self, paths):
+        if not self._pending_migrations(paths):
+            return 0
+
+        total = 0
+        with self.conn:
+            #stations opening the store together would all see the files as pending, take the write
+            #lock first and look again so only one of them imports each file
+            self.conn.execute("BEGIN IMMEDIATE")
+            pending = self._pending_migrations(paths)
+
+            #games used to save every session to both files, match those up instead of importing twice
+            cur = self.conn.execute("SELECT id, game, player, score, level, avg_reaction_time, time_elapsed, "
+                                    "source FROM sessions "
+                                    "WHERE source IS NOT NULL AND time_elapsed IS NOT NULL")
+            names = [d[0] for d in cur.description]
+            existing = [dict(zip(names, row)) for row in cur]
+            for path in pending:
+                try:
+                    with open(path, "r") as f:
+                        data = json.load(f)
+                except (json.JSONDecodeError, OSError):
+                    data = []
+
+                rows = 0
+                source = os.path.relpath(os.path.abspath(path), BASE_DIR)
+                candidates = [c for c in existing if c["source"] != source]
+                for record in data:
+                    record = _normalize_legacy(record)
+                    duplicate = _find_duplicate(candidates, record)
+                    if duplicate is not None:
+                        candidates.remove(duplicate)
+                        #fill in fields only the other file recorded
+                        for field in ("game", "avg_reaction_time"):
+                            if duplicate.get(field) is None and record.get(field) is not None:
+                                self.conn.execute(f"UPDATE sessions SET {field} = ? WHERE id = ?",
+                                                  (record[field], duplicate["id"]))
+                        continue
+                    row_id = self._insert(record, None, source)
+                    if record.get("time_elapsed") is not None:
+                        existing.append(dict(record, id=row_id, source=source))
+                    rows += 1
+
+                self.conn.execute("INSERT INTO migrations VALUES (?, ?, ?)",
+                                  (os.path.abspath(path), rows, time.time()))
+                total += rows
+        return total
+
+    def close(self):
+        self.conn.close()
+
+
+def _normalize_legacy(record):
+    record = dict(record)
+    if "avg_reaction_time" not in record and "avg_reaction_time_sec" in record:
+        record["avg_reaction_time"] = record["avg_reaction_time_sec"]
+    record.setdefault("game", None)
+    record.setdefault("level", 1)
+    return record
+
+
+def _find_duplicate(candidates, record, tolerance=0.05):
+    for cand in candidates:
+        if (cand["player"] == record.get("player") and cand["score"] == record.get("score")
+                and cand["level"] == record.get("level")
+                and abs(cand["time_elapsed"] - (record.get("time_elapsed") or 0)) <= tolerance
+                and (cand["game"] is None or record["game"] is None or cand["game"] == record["game"])):
+            return cand
+    return None
+
+
+_default_store = None
+
+
+def get_store():
+    global _default_store
+    if _default_store is None:
+        _default_store = ScoreStore()
+    return _default_store
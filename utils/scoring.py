@@ -1,14 +1,14 @@
 import time
-import json
-import os
+
+from utils.score_store import get_store
 
 class ScoreTracker:
-    def __init__(self, player_name="Player1"):
+    def __init__(self, player_name="Player1", store=None):
         self.score = 0
         self.start_time = time.time()
         self.level = 1
         self.player_name = player_name
-        self.save_path = os.path.join("utils", "scores.json")
+        self.store = store
 
     def add_points(self, points):
         self.score += points
@@ -32,31 +32,10 @@ class ScoreTracker:
             "level": self.level
         }
 
-    def save_score(self, game_name,avg_time=None):
-
-        os.makedirs(os.path.dirname(self.save_path), exist_ok=True)
-
-    
-        if not os.path.exists(self.save_path):
-            data = []
-        else:
-            try:
-                with open(self.save_path, "r") as f:
-                    data = json.load(f)
-            except json.JSONDecodeError:
-                data = []
-
-        data.append({
-            "game": game_name,
-            "player": self.player_name,
-            "score": self.score,
-            "level": self.level,
-            "avg_reaction_time": avg_time,
-            "time_elapsed": self.get_time_elapsed()
-        })
-
-       
-        with open(self.save_path, "w") as f:
-            json.dump(data, f, indent=4)
+    def save_score(self, game_name, avg_time=None):
+        record = self.get_summary()
+        record["game"] = game_name
+        record["avg_reaction_time"] = avg_time
+        (self.store or get_store()).append(record)
 
         print("✅ Score saved successfully!")
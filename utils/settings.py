@@ -12,11 +12,59 @@ BLUE = (255, 0, 0)
 ORANGE = (0, 165, 255)
 YELLOW = (0, 255, 255)
 PURPLE = (255, 0, 255)
+#one colour per player in multi-player games, player 1 keeps the single-player score colour
+PLAYER_COLORS = [GREEN, ORANGE, PURPLE, YELLOW]
+
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 ASSETS_DIR = os.path.join(BASE_DIR, "assets")
 
 BUCKET_IMG_PATH = os.path.join(ASSETS_DIR, "bucket.png")
 
+SCORES_DB_PATH = os.path.join(BASE_DIR, "utils", "scores.db")
+#columnar copy of the score history and cached aggregates, see utils.analytics
+ANALYTICS_CACHE_DIR = os.path.join(BASE_DIR, "utils", "analytics_cache")
+#old whole-file JSON histories, imported into the database once
+LEGACY_SCORE_FILES = [
+    os.path.join(BASE_DIR, "utils", "scores.json"),
+    os.path.join(BASE_DIR, "games", "utils", "scores.json"),
+]
+
+#frame rate the game loops and menu are paced to, 0 runs as fast as possible
+TARGET_FPS = float(os.environ.get("AIR_CANVAS_FPS", "30"))
+
+#per-stage frame timings, toggle the overlay with P, dumped to PROFILE_DIR at the end of a game
+PROFILE_STAGES = os.environ.get("AIR_CANVAS_PROFILE", "0") == "1"
+PROFILE_DIR = os.path.join(BASE_DIR, "profiles")
+
+#hand inference at a lower resolution and/or cropped around the last hand, both off by default
+INFERENCE_WIDTH = int(os.environ.get("AIR_CANVAS_INFERENCE_WIDTH", "0")) or None
+USE_ROI_INFERENCE = os.environ.get("AIR_CANVAS_ROI", "0") == "1"
+
+#run mediapipe on every Nth frame or at most every N ms and predict landmarks in between,
+#smoothing runs the One-Euro filter over measured landmarks too
+INFER_EVERY = int(os.environ.get("AIR_CANVAS_INFER_EVERY", "1"))
+INFER_INTERVAL_MS = float(os.environ.get("AIR_CANVAS_INFER_INTERVAL_MS", "0")) or None
+LANDMARK_SMOOTHING = os.environ.get("AIR_CANVAS_SMOOTHING", "0") == "1"
+
+#per-frame landmark recordings of every game, replay them with handtracking.recording.ReplayHandTracker
+RECORD_SESSIONS = os.environ.get("AIR_CANVAS_RECORD", "0") == "1"
+RECORDINGS_DIR = os.path.join(BASE_DIR, "recordings")
+
+#per-frame fingertip, finger states and jitter plus game events as gzipped JSON lines, written in the
+#background, see utils.telemetry
+TELEMETRY = os.environ.get("AIR_CANVAS_TELEMETRY", "0") == "1"
+TELEMETRY_DIR = os.path.join(BASE_DIR, "telemetry")
+
+#frames a finger count or pinch must be seen in a row before gesture events fire
+GESTURE_DEBOUNCE_FRAMES = int(os.environ.get("AIR_CANVAS_GESTURE_DEBOUNCE", "3"))
+
+#players sharing one camera in games that support it, the menu tracker follows this many hands
+PLAYERS = int(os.environ.get("AIR_CANVAS_PLAYERS", "1"))
+
+#how the drawing games score a traced shape: "nearest" (distance to the closest ideal point),
+#or "dtw" / "frechet", which also require the shape to be traced in order
+PATH_METRIC = os.environ.get("AIR_CANVAS_PATH_METRIC", "nearest")
+
 FONT = cv2.FONT_HERSHEY_SIMPLEX
 FONT_SCALE = 0.8
 THICKNESS = 2
@@ -0,0 +1,211 @@
+import numpy as np
+
+from utils.geometry import resample_arc_length, resample_points
+from utils.path_scoring import PathScorer, IncrementalAccuracy
+
+NEAREST = "nearest"  #distance of every drawn point to the closest ideal point, order ignored
+DTW = "dtw"
+FRECHET = "frechet"
+METRICS = (NEAREST, DTW, FRECHET)
+
+
+#ideal values at columns lo..hi-1 of a band row that starts at column `start`, inf outside it
+def _band_slice(row, start, lo, hi):
+    out = np.full(hi - lo, np.inf)
+    a, b = max(lo, start), min(hi, start + len(row))
+    if b > a:
+        out[a - lo:b - lo] = row[a - start:b - start]
+    return out
+
+
+#alignment of a drawn path against the ideal path, one drawn point (one row) at a time
+#only columns within `width` of the row's diagonal are kept, so memory and time are O(rows * width)
+#costs are distances scaled to 0..1 by max_dist; dtw sums them with the symmetric step weights
+#(diagonal steps count twice) so the end cell divided by rows + columns is their mean along the path,
+#frechet keeps the largest cost on the best path
+#with follow=True the band is centred on the previous row's best column instead of the diagonal,
+#for live strokes whose length relative to the ideal path is not known yet
+#distances up to `tolerance` cost nothing, covering how far a point on the curve can be from a sample
+class BandedAlignment:
+    def __init__(self, ideal, metric=DTW, max_dist=50, width=20, slope=1.0, follow=False, tolerance=0.0):
+        if metric not in (DTW, FRECHET):
+            raise ValueError(f"unknown alignment metric {metric!r}")
+        self.ideal = np.asarray(ideal, np.float64).reshape(-1, 2)
+        self.metric = metric
+        self.max_dist = max_dist
+        self.width = width
+        self.slope = slope  #ideal columns per drawn row along the band's centre
+        self.follow = follow
+        self.tolerance = tolerance
+        self.reset()
+
+    def reset(self):
+        self.rows = 0
+        self.row = np.empty(0)
+        self.start = 0
+        self.centre = 0
+
+    def add(self, point):
+        m = len(self.ideal)
+        if self.follow and len(self.row):
+            best = self.start + int(np.argmin(self._normalised(np.arange(self.start, self.start + len(self.row)))))
+            self.centre = centre = max(self.centre, best)
+        else:
+            centre = int(round(self.rows * self.slope))
+        lo, hi = max(centre - self.width, 0), min(centre + self.width + 1, m)
+        if lo >= hi:
+            #the drawn path ran past the end of the band, nothing can be aligned any more
+            self.row, self.start = np.empty(0), lo
+            self.rows += 1
+            return
+
+        d = self.ideal[lo:hi] - point
+        cost = np.clip((np.hypot(d[:, 0], d[:, 1]) - self.tolerance) / self.max_dist, 0.0, 1.0)
+        if self.rows == 0:
+            up = np.full(hi - lo, np.inf)
+            diag = up.copy()
+            if lo == 0:
+                diag[0] = 0.0  #the path starts at (0, 0)
+        else:
+            up = _band_slice(self.row, self.start, lo, hi)
+            diag = _band_slice(self.row, self.start, lo - 1, hi - 1)
+
+        if self.metric == DTW:
+            #row[j] = min(a[j], row[j - 1] + cost[j]) unrolls to a prefix minimum over cumulative costs
+            a = np.minimum(diag + 2 * cost, up + cost)
+            csum = np.cumsum(cost)
+            row = csum + np.minimum.accumulate(a - csum)
+        else:
+            #row[j] = min(a[j], max(cost[j], row[j - 1])) is a chain of clamps, composed by doubling
+            a = np.maximum(cost, np.minimum(diag, up))
+            low, high = cost.copy(), a
+            step = 1
+            while step < len(low):
+                low[step:], high[step:] = (np.clip(low[:-step], low[step:], high[step:]),
+                                           np.clip(high[:-step], low[step:], high[step:]))
+                step *= 2
+            row = high
+        self.row, self.start = row, lo
+        self.rows += 1
+
+    def _normalised(self, columns):
+        values = self.row[columns - self.start]
+        if self.metric == DTW:
+            values = values / (self.rows + columns + 1)
+        return values
+
+    #cost of the whole drawn path against the whole ideal path, 1 when the band never reached the end
+    def end_cost(self):
+        last = len(self.ideal) - 1
+        if self.rows == 0 or not self.start <= last < self.start + len(self.row):
+            return 1.0
+        return min(float(self._normalised(np.array([last]))[0]), 1.0)
+
+    #cost of the drawn path so far against the best matching start of the ideal path
+    def open_end_cost(self):
+        if self.rows == 0 or len(self.row) == 0:
+            return 1.0
+        return min(float(self._normalised(np.arange(self.start, self.start + len(self.row))).min()), 1.0)
+
+
+#order-aware accuracy: the drawn path and the ideal path are resampled to the same number of points by
+#arc length and aligned with banded dtw or discrete frechet, so the shape has to be traced from its
+#first point in order; band is the share of the ideal path a drawn point may lead or lag by
+class SequenceScorer:
+    def __init__(self, ideal_points, metric=DTW, max_dist=50, spacing=5, band=0.15):
+        self.metric = metric
+        self.max_dist = max_dist
+        self.spacing = spacing
+        self.ideal = resample_arc_length(ideal_points, spacing=spacing)
+        self.width = max(int(band * len(self.ideal)), 2)
+
+    def alignment(self, follow=False):
+        return BandedAlignment(self.ideal, self.metric, self.max_dist, self.width, follow=follow,
+                               tolerance=self.spacing / 2)
+
+    def accuracy(self, drawn_points):
+        pts = np.asarray(drawn_points, np.float64).reshape(-1, 2)
+        if len(pts) == 0:
+            return 0
+        alignment = self.alignment()
+        for point in resample_arc_length(pts, n=len(self.ideal)):
+            alignment.add(point)
+        return round((1 - alignment.end_cost()) * 100, 2)
+
+    def incremental(self):
+        return IncrementalAlignment(self)
+
+
+#live order-aware meter: appended points are resampled every `spacing` pixels as they arrive and each
+#new sample adds one alignment row, so a frame costs O(width) however long the stroke is
+#the value is the open-ended cost, how well the stroke so far follows the start of the ideal path,
+#with the band following the best match since jitter makes the stroke longer than the ideal path
+class IncrementalAlignment:
+    def __init__(self, scorer):
+        self.reset(scorer)
+
+    def reset(self, scorer=None):
+        if scorer is not None:
+            self.scorer = scorer
+        self.alignment = self.scorer.alignment(follow=True)
+        self.last = None
+        self.carry = 0.0  #distance walked past the last sample
+        self.final = None
+
+    def _sample(self, point):
+        spacing = self.scorer.spacing
+        if self.last is None:
+            self.alignment.add(point)
+            self.last = point
+            return
+        seg = point - self.last
+        length = float(np.hypot(seg[0], seg[1]))
+        if length == 0:
+            return
+        offsets = np.arange(spacing - self.carry, length + 1e-9, spacing)
+        for t in offsets / length:
+            self.alignment.add(self.last + seg * t)
+        self.carry = length - offsets[-1] if len(offsets) else self.carry + length
+        self.last = point
+
+    def add(self, points):
+        for point in np.asarray(points, np.float64).reshape(-1, 2):
+            self._sample(point)
+        self.final = None
+        return self.value
+
+    @property
+    def value(self):
+        if self.final is not None:
+            return self.final
+        if self.alignment.rows == 0:
+            return 0
+        return round((1 - self.alignment.open_end_cost()) * 100, 2)
+
+    #final score aligns the whole stroke end to end, the meter jumps to it on SPACE
+    def reconcile(self, resampled_points):
+        self.final = self.scorer.accuracy(resampled_points)
+        return self.final
+
+
+def make_scorer(ideal_points, metric=NEAREST, max_dist=50, nearest=None):
+    if metric == NEAREST:
+        return nearest if nearest is not None else PathScorer(ideal_points, max_dist)
+    if metric in (DTW, FRECHET):
+        return SequenceScorer(ideal_points, metric, max_dist)
+    raise ValueError(f"unknown path metric {metric!r}, expected one of {', '.join(METRICS)}")
+
+
+#the points a final score is computed from: the nearest metric keeps the 5 px resampling it always
+#had, order-aware metrics resample by arc length themselves and need the stroke's true end
+def final_points(scorer, drawn_path):
+    if isinstance(scorer, SequenceScorer):
+        return np.asarray(drawn_path)
+    return resample_points(drawn_path, step=5)
+
+
+#the running meter that goes with a scorer from make_scorer
+def make_live_accuracy(scorer):
+    if isinstance(scorer, SequenceScorer):
+        return scorer.incremental()
+    return IncrementalAccuracy(scorer)
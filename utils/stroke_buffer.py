@@ -0,0 +1,97 @@
+import time
+
+import numpy as np
+
+from utils.geometry import rdp_indices
+
+DISTANCE = "distance"
+RDP = "rdp"
+
+
+#drawn points in preallocated arrays that double when full, with a timestamp per point and the
+#index where each pen-down stroke starts. np.asarray(buffer) and slices are views, not copies
+#simplify=DISTANCE drops points closer than tolerance to the last kept one; simplify=RDP runs
+#Ramer-Douglas-Peucker over the open stroke every rdp_window points, so long sessions stay small
+class StrokeBuffer:
+    def __init__(self, capacity=256, simplify=None, tolerance=2.0, rdp_window=64):
+        self.points = np.empty((capacity, 2), np.int32)
+        self.times = np.empty(capacity, np.float64)
+        self.simplify = simplify
+        self.tolerance = tolerance
+        self.rdp_window = rdp_window
+        self.starts = []  #first point index of each stroke
+        self.count = 0
+        self.pen_down = False
+        self.settled = 0  #points before this index have been through RDP already
+
+    def __len__(self):
+        return self.count
+
+    def __array__(self, dtype=None, copy=None):
+        view = self.points[:self.count]
+        if dtype is not None and dtype != view.dtype:
+            return view.astype(dtype)
+        return view.copy() if copy else view
+
+    def __getitem__(self, index):
+        return self.points[:self.count][index]
+
+    @property
+    def xy(self):
+        return self.points[:self.count]
+
+    @property
+    def timestamps(self):
+        return self.times[:self.count]
+
+    def clear(self):
+        self.count = 0
+        self.starts = []
+        self.pen_down = False
+        self.settled = 0
+
+    def _grow(self):
+        capacity = len(self.points) * 2
+        points = np.empty((capacity, 2), np.int32)
+        times = np.empty(capacity, np.float64)
+        points[:self.count] = self.points[:self.count]
+        times[:self.count] = self.times[:self.count]
+        self.points, self.times = points, times
+
+    def append(self, point, t=None):
+        if not self.pen_down:
+            self.pen_down = True
+            self.starts.append(self.count)
+            self.settled = self.count
+        elif self.simplify == DISTANCE:
+            lx, ly = self.points[self.count - 1]
+            if (point[0] - lx) ** 2 + (point[1] - ly) ** 2 < self.tolerance ** 2:
+                return False
+        if self.count == len(self.points):
+            self._grow()
+        self.points[self.count] = point
+        self.times[self.count] = time.perf_counter() if t is None else t
+        self.count += 1
+        if self.simplify == RDP and self.count - self.settled >= self.rdp_window:
+            self._simplify_tail()
+        return True
+
+    def pen_up(self):
+        if self.pen_down and self.simplify == RDP:
+            self._simplify_tail()
+        self.pen_down = False
+
+    #RDP over the points added since the last pass; the last point stays as the next pass's anchor
+    def _simplify_tail(self):
+        start = max(self.settled - 1, self.starts[-1])
+        keep = rdp_indices(self.points[start:self.count], self.tolerance) + start
+        n = len(keep)
+        self.points[start:start + n] = self.points[keep]
+        self.times[start:start + n] = self.times[keep]
+        self.count = start + n
+        self.settled = self.count
+
+    #one (n, 2) view per pen-down stroke
+    def strokes(self):
+        bounds = self.starts + [self.count]
+        return [self.points[a:b] for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
@@ -0,0 +1,44 @@
+import cv2
+import numpy as np
+
+from utils.settings import GREEN
+
+
+#off-screen stroke overlay, segments are rasterized once and composited with one masked copy
+class StrokeLayer:
+    def __init__(self, color=GREEN, thickness=2):
+        self.color = color
+        self.thickness = thickness
+        self.overlay = None
+        self.mask = None
+
+    def _ensure_size(self, shape):
+        h, w = shape[:2]
+        if self.overlay is None or self.overlay.shape[:2] != (h, w):
+            self.overlay = np.zeros((h, w, 3), np.uint8)
+            self.mask = np.zeros((h, w), np.uint8)
+
+    def add_segment(self, p1, p2, shape):
+        self._ensure_size(shape)
+        cv2.line(self.overlay, p1, p2, self.color, self.thickness)
+        cv2.line(self.mask, p1, p2, 255, self.thickness)
+
+    def clear(self):
+        if self.overlay is not None:
+            self.overlay[:] = 0
+            self.mask[:] = 0
+
+    #used after a resize or when the path was edited
+    def rebuild(self, path, shape):
+        self._ensure_size(shape)
+        self.clear()
+        for i in range(1, len(path)):
+            self.add_segment(tuple(path[i - 1]), tuple(path[i]), shape)
+
+    def composite(self, img):
+        if self.overlay is None:
+            return img
+        if self.overlay.shape[:2] != img.shape[:2]:
+            return img
+        cv2.copyTo(self.overlay, self.mask, img)
+        return img
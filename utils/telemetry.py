@@ -0,0 +1,204 @@
+import argparse
+import gzip
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.frame_source import DROP_OLDEST, DROP_NEWEST
+
+FRAME = "frame"
+EVENT = "event"
+#tuple layout of each record kind, turned into JSON objects by the writer thread
+FIELDS = {
+    FRAME: ("t", "frame", "hand", "tip", "fingers", "jitter", "predicted"),
+    EVENT: ("t", "frame", "name", "value"),
+}
+
+
+#per-frame metrics and game events written to rotating gzipped JSON-lines files by a background thread
+#the game loop only appends tuples to a bounded deque (atomic, no lock), when it is full the newest
+#record (DROP_NEWEST) or the oldest queued one (DROP_OLDEST) is dropped and counted, the loop never waits
+#files are telemetry_00000.jsonl.gz, ..., each opening with a header line that carries meta
+class TelemetryWriter:
+    def __init__(self, directory, meta=None, queue_size=8192, batch_size=128, flush_interval=0.5,
+                 max_file_records=100000, overflow=DROP_NEWEST):
+        if overflow not in (DROP_NEWEST, DROP_OLDEST):
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.meta = dict(meta or {})
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_file_records = max_file_records
+        self.overflow = overflow
+        self.start_time = time.perf_counter()
+
+        self.queue = deque()
+        self.dropped = 0
+        self.max_depth = 0
+        self.written = 0
+        self.files = 0
+        self.file = None
+        self.file_records = 0
+        self.frame_index = 0  #frame the next events belong to
+
+        self._wake = threading.Event()
+        self._stop = False
+        self._thread = threading.Thread(target=self._write_loop, name="telemetry-writer", daemon=True)
+        self._thread.start()
+
+    def _put(self, record):
+        depth = len(self.queue)
+        if depth >= self.queue_size:
+            if self.overflow == DROP_NEWEST:
+                self.dropped += 1
+                return False
+            try:
+                self.queue.popleft()
+                self.dropped += 1
+                depth -= 1
+            except IndexError:  #the writer emptied it in the meantime, nothing was dropped
+                pass
+        self.queue.append(record)
+        if depth >= self.max_depth:
+            self.max_depth = depth + 1
+        if depth + 1 >= self.batch_size:
+            self._wake.set()
+        return True
+
+    #one record per hand slot and frame; tip is the index fingertip (x, y) or None, fingers the five
+    #up/down flags
+    def frame(self, frame, hand, tip, fingers, jitter=0.0, predicted=False):
+        self.frame_index = frame
+        return self._put((FRAME, time.perf_counter() - self.start_time, frame, hand, tip, fingers, jitter,
+                          predicted))
+
+    def event(self, name, value=None):
+        return self._put((EVENT, time.perf_counter() - self.start_time, self.frame_index, name, value))
+
+    @property
+    def depth(self):
+        return len(self.queue)
+
+    def stats(self):
+        return {"queued": len(self.queue), "max_depth": self.max_depth, "dropped": self.dropped,
+                "written": self.written, "files": self.files}
+
+    def _open_file(self):
+        path = os.path.join(self.directory, f"telemetry_{self.files:05d}.jsonl.gz")
+        self.file = gzip.open(path, "wt", encoding="utf-8")
+        self.files += 1
+        self.file_records = 0
+        header = dict(self.meta, type="header", file=self.files - 1, created=time.time())
+        self.file.write(json.dumps(header) + "\n")
+
+    def _write_batch(self):
+        lines = []
+        queue = self.queue
+        for _ in range(min(len(queue), self.batch_size)):
+            record = queue.popleft()
+            kind = record[0]
+            row = dict(zip(FIELDS[kind], record[1:]))
+            row["type"] = kind
+            lines.append(json.dumps(row))
+        while lines:
+            if self.file is None:
+                self._open_file()
+            room = self.max_file_records - self.file_records
+            chunk, lines = lines[:room], lines[room:]
+            self.file.write("\n".join(chunk) + "\n")
+            self.file_records += len(chunk)
+            self.written += len(chunk)
+            if self.file_records >= self.max_file_records:
+                self.file.close()
+                self.file = None
+
+    def _write_loop(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            while self.queue:
+                self._write_batch()
+                #json encoding holds the GIL, hand it back between batches so the game loop never waits long
+                time.sleep(0)
+            if self._stop:
+                break
+
+    def close(self):
+        self._stop = True
+        self._wake.set()
+        self._thread.join()
+        while self.queue:
+            self._write_batch()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        return self.stats()
+
+
+#jitter as ShapeDrawing measures it: the mean fingertip step below threshold over the last `window` frames
+class JitterMeter:
+    def __init__(self, window=10, threshold=10):
+        self.steps = deque(maxlen=window)
+        self.threshold = threshold
+        self.last = None
+
+    def update(self, tip):
+        if tip is None:
+            self.last = None
+            return 0.0
+        if self.last is not None:
+            self.steps.append(((tip[0] - self.last[0]) ** 2 + (tip[1] - self.last[1]) ** 2) ** 0.5)
+        self.last = tip
+        small = [s for s in self.steps if s < self.threshold]
+        return round(sum(small) / len(small), 3) if small else 0.0
+
+
+#every record of a session directory in order, header lines included
+def read_telemetry(directory):
+    names = sorted(n for n in os.listdir(directory) if n.startswith("telemetry_") and n.endswith(".jsonl.gz"))
+    for name in names:
+        with gzip.open(os.path.join(directory, name), "rt", encoding="utf-8") as f:
+            try:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+            except (EOFError, json.JSONDecodeError):
+                pass  #file left open by a crash, keep what was flushed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize a telemetry session")
+    parser.add_argument("session")
+    args = parser.parse_args(argv)
+
+    frames = set()
+    hands = 0
+    jitter = []
+    events = {}
+    header = None
+    for record in read_telemetry(args.session):
+        if record["type"] == "header":
+            header = header or record
+        elif record["type"] == FRAME:
+            frames.add(record["frame"])
+            if record["tip"] is not None:
+                hands += 1
+                jitter.append(record["jitter"])
+        else:
+            events[record["name"]] = events.get(record["name"], 0) + 1
+    print(f"{header.get('game', '?') if header else '?'}: {len(frames)} frames, {hands} hand records")
+    if jitter:
+        print(f"  mean jitter {sum(jitter) / len(jitter):.2f}px")
+    for name, count in sorted(events.items()):
+        print(f"  {name}: {count}")
+
+
+if __name__ == "__main__":
+    main()